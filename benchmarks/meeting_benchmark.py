@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+会议基准测试 - 使用脚本化模型和进程内Redis运行完整会议，输出JSON结果
+
+每次会议结束后清理其命名空间，并检查没有残留的键（有残留时以状态码1退出）。
+
+示例:
+    python benchmarks/meeting_benchmark.py --agents 6 --turns 3 --latency 0.05 --output result.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tracemalloc
+import contextlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+# 添加项目根目录到系统路径
+ROOT_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(ROOT_DIR))
+
+# 基准测试始终使用进程内Redis（需在导入配置前设置）
+os.environ["REDIS_BACKEND"] = "memory"
+os.environ["ENABLE_REDIS"] = "true"
+
+from src.config.redis_config import RedisSettings, configure_redis, get_redis_client
+from src.config.settings import Settings
+from src.core.agent import Agent
+from src.core.conversation import ConversationManager
+from src.core.god_view import GodView
+from src.core.memory_adapter import MemoryAdapter
+from src.core.write_queue import flush_write_queue, get_write_queue_stats
+from src.models.scripted import ScriptedModel
+
+# 发言顺序与默认六人会议一致：手工艺人、消费者、制造商人、消费者、设计师、消费者
+AGENT_TYPE_CYCLE = ["craftsman", "consumer", "manufacturer", "consumer", "designer", "consumer"]
+
+# (阶段名称, ConversationManager方法名)
+STAGE_METHODS = [
+    ("introduction", "introduce_agents"),
+    ("image_story", "process_image"),
+    ("discussion", "start_discussion"),
+    ("keywords", "extract_keywords"),
+    ("voting", "vote_keywords"),
+    ("role_switch", "start_role_switch"),
+    ("discussion_after_switch", "start_discussion_after_switch"),
+    ("keywords_after_switch", "extract_keywords_after_switch"),
+]
+
+# 阶段内部直接嵌套调用的阶段（计算独占耗时时扣除）
+NESTED_STAGES = {
+    "role_switch": ["discussion_after_switch"],
+    "discussion_after_switch": ["keywords_after_switch"],
+}
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="圆桌会议基准测试")
+
+    parser.add_argument("--agents", type=int, default=6, help="智能体数量")
+    parser.add_argument("--turns", type=int, default=3, help="讨论轮数")
+    parser.add_argument("--repeat", type=int, default=1, help="重复运行次数")
+    parser.add_argument("--latency", type=float, default=0.05, help="模型首字延迟（秒）")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="模型生成速度（token/秒）")
+    parser.add_argument("--response-tokens", type=int, default=120, help="每次发言的token数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（脚本化模型和会议流程中的随机选择）")
+    parser.add_argument("--topic", type=str, default="剪纸文创产品设计", help="会议主题")
+    parser.add_argument("--image", type=str, default=None, help="参考图片路径（可选）")
+    parser.add_argument("--no-role-switch", action="store_true", help="跳过视角转换阶段")
+    parser.add_argument("--parallel-turns", action="store_true", help="启用并行发言模式")
+    parser.add_argument("--pipeline-stages", action="store_true", help="启用阶段流水线模式")
+    parser.add_argument("--no-prefetch", action="store_true", help="关闭发言上下文预取")
+    parser.add_argument("--batch-voting", action="store_true", help="一次请求完成所有智能体的投票")
+    parser.add_argument("--write-queue", action="store_true", help="记忆和发言写入后台队列，按批用管道写入")
+    parser.add_argument("--stream-results", action="store_true", help="各智能体并发执行关键词提取、投票和图像故事，按完成顺序处理")
+    parser.add_argument(
+        "--timeline-backend",
+        type=str,
+        default=os.getenv("TIMELINE_BACKEND", "zset"),
+        choices=["zset", "stream"],
+        help="会议时间线后端"
+    )
+    parser.add_argument("--no-tracemalloc", action="store_true", help="不统计内存分配")
+    parser.add_argument("--top-allocations", type=int, default=5, help="输出内存分配最多的代码位置数量")
+    parser.add_argument("--output", type=str, default=None, help="结果JSON文件路径（默认输出到标准输出）")
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="日志级别"
+    )
+
+    return parser.parse_args()
+
+
+def build_agent_counts(total: int) -> Dict[str, int]:
+    """按默认发言顺序循环分配智能体类型"""
+    counts = {"craftsman": 0, "consumer": 0, "manufacturer": 0, "designer": 0}
+    for i in range(total):
+        counts[AGENT_TYPE_CYCLE[i % len(AGENT_TYPE_CYCLE)]] += 1
+    return counts
+
+
+async def create_agents(manager: ConversationManager, settings: Settings, model: ScriptedModel) -> None:
+    """按设置中的数量创建智能体（与命令行界面的创建逻辑一致，不显示进度）"""
+    from src.agents.craftsman import Craftsman
+    from src.agents.consumer import Consumer
+    from src.agents.manufacturer import Manufacturer
+    from src.agents.designer import Designer
+
+    agent_classes = {
+        "craftsman": Craftsman,
+        "consumer": Consumer,
+        "manufacturer": Manufacturer,
+        "designer": Designer
+    }
+
+    for agent_type, count in settings.agent_counts.items():
+        for i in range(count):
+            agent_id = f"{agent_type}_{i+1}"
+            memory = MemoryAdapter(
+                agent_id=agent_id,
+                storage_type="redis",
+                max_tokens=settings.memory_max_tokens,
+                settings=settings
+            )
+            agent_class = agent_classes.get(agent_type)
+            if agent_class:
+                agent = agent_class(agent_id=agent_id, name=f"{agent_type}{i+1}", model=model, memory=memory)
+            else:
+                agent = Agent(agent_id=agent_id, agent_type=agent_type, name=f"{agent_type}{i+1}", model=model, memory=memory)
+            await manager.add_agent(agent)
+
+
+def instrument_stages(manager: ConversationManager, timings: Dict[str, float]) -> None:
+    """为会议各阶段方法加上计时（只作用于当前实例）"""
+    for stage, method_name in STAGE_METHODS:
+        original = getattr(manager, method_name)
+
+        async def timed(*args, _original=original, _stage=stage, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await _original(*args, **kwargs)
+            finally:
+                timings[_stage] += time.perf_counter() - start
+
+        setattr(manager, method_name, timed)
+
+
+def summarize_allocations(snapshot: tracemalloc.Snapshot, top: int) -> List[Dict[str, Any]]:
+    """统计内存分配最多的代码位置（只统计本项目代码）"""
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, f"{ROOT_DIR}{os.sep}*")])
+    result = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        result.append({
+            "location": f"{os.path.relpath(frame.filename, ROOT_DIR)}:{frame.lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count
+        })
+    return result
+
+
+async def run_meeting(args, settings: Settings, run_index: int) -> Dict[str, Any]:
+    """
+    运行一次完整会议
+
+    Returns:
+        本次运行的统计结果
+    """
+    # 发言顺序、角色分配等会议流程中的随机选择使用全局random，每次运行重新设定种子
+    random.seed(args.seed + run_index)
+    model = ScriptedModel(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        seed=args.seed + run_index
+    )
+
+    redis_client = await get_redis_client()
+    redis_client.reset_stats()
+
+    # 每次运行使用独立的键命名空间，结束后像 MeetingRuntime 一样立即清理
+    manager = ConversationManager(
+        GodView(settings),
+        settings,
+        clean_redis_on_start=False,
+        key_namespace=f"ns:bench{run_index}"
+    )
+    manager.stream_handler.set_delay(0)
+    manager.stream_handler.set_output_func(lambda *a, **k: None)
+
+    timings: Dict[str, float] = defaultdict(float)
+    instrument_stages(manager, timings)
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    await create_agents(manager, settings, model)
+    setup_seconds = time.perf_counter() - start
+
+    await manager.start_conversation(args.topic, args.image)
+    if not args.no_role_switch and len(manager.agents) >= 2:
+        await manager.start_role_switch(manager.voted_keywords or ["剪纸", "文创"])
+    # 会议结束后立即清理命名空间（清理前的写入屏障计入耗时）
+    await manager.cleanup_session()
+    wall_seconds = time.perf_counter() - start
+    redis_stats = redis_client.get_stats()
+    # 清理后不应残留键：清理时未等待写入队列的话，之后落地的写入会重新创建键
+    await flush_write_queue()
+    leftover_keys = len([key async for key in redis_client.scan_iter(match=f"{manager.key_namespace}:*")])
+
+    allocations: Dict[str, Any] = {}
+    if not args.no_tracemalloc:
+        current, peak = tracemalloc.get_traced_memory()
+        allocations = {
+            "current_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "top": summarize_allocations(tracemalloc.take_snapshot(), args.top_allocations)
+        }
+        tracemalloc.stop()
+
+    stage_seconds = {}
+    for stage, seconds in timings.items():
+        nested = sum(timings.get(child, 0.0) for child in NESTED_STAGES.get(stage, []))
+        stage_seconds[stage] = round(seconds - nested, 4)
+
+    model_stats = model.get_stats()
+    return {
+        "run": run_index,
+        "wall_seconds": round(wall_seconds, 4),
+        "setup_seconds": round(setup_seconds, 4),
+        "stage_seconds": stage_seconds,
+        "model": model_stats,
+        # 墙钟时间减去模型调用区间的并集（并发调用只计一次），即框架自身的耗时
+        "overhead_seconds": round(wall_seconds - model_stats["busy_seconds"], 4),
+        "redis": redis_stats,
+        "write_queue": get_write_queue_stats(),
+        "leftover_keys": leftover_keys,
+        "allocations": allocations,
+        "voted_keywords": manager.voted_keywords
+    }
+
+
+def aggregate(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """汇总多次运行的结果"""
+    walls = [run["wall_seconds"] for run in runs]
+    stages = defaultdict(list)
+    for run in runs:
+        for stage, seconds in run["stage_seconds"].items():
+            stages[stage].append(seconds)
+
+    return {
+        "wall_seconds": {
+            "mean": round(sum(walls) / len(walls), 4),
+            "min": min(walls),
+            "max": max(walls)
+        },
+        "stage_seconds_mean": {stage: round(sum(v) / len(v), 4) for stage, v in stages.items()},
+        "redis_commands_mean": round(sum(run["redis"]["commands"] for run in runs) / len(runs), 1),
+        "redis_round_trips_mean": round(sum(run["redis"]["round_trips"] for run in runs) / len(runs), 1),
+        "leftover_keys": sum(run["leftover_keys"] for run in runs)
+    }
+
+
+async def main():
+    """主函数"""
+    args = parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level), stream=sys.stderr)
+
+    os.environ["TIMELINE_BACKEND"] = args.timeline_backend
+    os.environ["MEMORY_WRITE_QUEUE"] = "true" if args.write_queue else "false"
+    configure_redis(RedisSettings())
+
+    settings = Settings()
+    settings.agent_counts = build_agent_counts(args.agents)
+    settings.max_turns = args.turns
+    settings.parallel_turns = args.parallel_turns
+    settings.pipeline_stages = args.pipeline_stages
+    settings.batch_voting = args.batch_voting
+    settings.stream_results = args.stream_results
+    settings.prefetch_context = not args.no_prefetch
+
+    runs = []
+    # 会议输出（含加载动画）写入空设备，只保留JSON结果
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for run_index in range(args.repeat):
+            runs.append(await run_meeting(args, settings, run_index))
+
+    result = {
+        "benchmark": "meeting",
+        "timestamp": time.time(),
+        "config": {
+            "agents": args.agents,
+            "agent_counts": settings.agent_counts,
+            "turns": args.turns,
+            "repeat": args.repeat,
+            "latency": args.latency,
+            "tokens_per_second": args.tokens_per_second,
+            "response_tokens": args.response_tokens,
+            "role_switch": not args.no_role_switch,
+            "image": args.image,
+            "parallel_turns": args.parallel_turns,
+            "pipeline_stages": args.pipeline_stages,
+            "batch_voting": args.batch_voting,
+            "stream_results": args.stream_results,
+            "write_queue": args.write_queue,
+            "prefetch_context": not args.no_prefetch,
+            "timeline_backend": args.timeline_backend
+        },
+        "summary": aggregate(runs),
+        "runs": runs
+    }
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if result["summary"]["leftover_keys"]:
+        print(f"会议清理后仍有 {result['summary']['leftover_keys']} 个键残留在会议命名空间下", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
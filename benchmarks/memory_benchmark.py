@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+记忆写入基准测试 - 测量 RedisMemory.add_memory 的持续写入吞吐（ops/sec）
+
+对比Lua脚本（一次往返写入并裁剪）与管道回退两种写入方式。
+
+示例:
+    python benchmarks/memory_benchmark.py --backend redis --writes 5000 --agents 6
+    python benchmarks/memory_benchmark.py --backend fakeredis --mode both
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any
+
+# 添加项目根目录到系统路径
+ROOT_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.config.redis_config import RedisSettings, RedisManager
+from src.core.redis_memory import RedisMemory
+from src.utils.codec import RecordCodec
+
+MEMORY_TYPES = ["discussion", "keywords", "introduction", "voting"]
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="记忆写入基准测试")
+
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="redis",
+        choices=["redis", "fakeredis", "memory"],
+        help="存储后端：redis（使用.env中的Redis连接）、fakeredis（需安装fakeredis[lua]）、memory（进程内替身，不支持Lua）"
+    )
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default="both",
+        choices=["script", "pipeline", "both"],
+        help="写入方式"
+    )
+    parser.add_argument("--codec", type=str, default="msgpack", choices=["msgpack", "json"], help="记录编码格式")
+    parser.add_argument("--compress-threshold", type=int, default=0, help="zstd压缩阈值（字节，0表示不压缩）")
+    parser.add_argument("--writes", type=int, default=2000, help="每种写入方式的总写入次数")
+    parser.add_argument("--agents", type=int, default=6, help="并发写入的智能体数量")
+    parser.add_argument("--max-memories", type=int, default=200, help="每个智能体的记忆上限（触发裁剪）")
+    parser.add_argument("--content-chars", type=int, default=300, help="每条记忆的内容长度")
+    parser.add_argument("--output", type=str, default=None, help="结果JSON文件路径（默认输出到标准输出）")
+
+    return parser.parse_args()
+
+
+async def create_client(backend: str):
+    """创建Redis客户端"""
+    if backend == "fakeredis":
+        import fakeredis
+        return fakeredis.FakeAsyncRedis()
+    if backend == "memory":
+        from src.utils.inmemory_redis import InMemoryRedis
+        return InMemoryRedis()
+    return await RedisManager(RedisSettings()).get_client()
+
+
+async def run_mode(args, client, use_script: bool) -> Dict[str, Any]:
+    """以指定写入方式运行一轮持续写入"""
+    codec = RecordCodec(args.codec, args.compress_threshold)
+    prefix = f"bench_{'script' if use_script else 'pipeline'}_{int(time.time() * 1000)}"
+    memories: List[RedisMemory] = [
+        RedisMemory(f"{prefix}_{i}", client, max_memories=args.max_memories, ttl=3600, use_script=use_script, codec=codec)
+        for i in range(args.agents)
+    ]
+    content = "剪" * args.content_chars
+    writes_per_agent = args.writes // args.agents
+
+    async def write(memory: RedisMemory) -> None:
+        for i in range(writes_per_agent):
+            await memory.add_memory(
+                MEMORY_TYPES[i % len(MEMORY_TYPES)],
+                {"role": "designer", "topic": "benchmark", "content": content}
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(write(memory) for memory in memories))
+    elapsed = time.perf_counter() - start
+    total = writes_per_agent * args.agents
+
+    # 校验裁剪结果：总索引和所有类型索引都不应超过上限
+    sample = memories[0]
+    type_sizes = {
+        memory_type: await client.zcard(f"{sample.memories_types_key}:{memory_type}")
+        for memory_type in MEMORY_TYPES
+    }
+    result = {
+        "mode": "script" if sample.use_script else "pipeline",
+        "writes": total,
+        "seconds": round(elapsed, 4),
+        "ops_per_sec": round(total / elapsed, 1) if elapsed > 0 else None,
+        "record_bytes": len(codec.encode({"c": {"role": "designer", "topic": "benchmark", "content": content}, "t": time.time()})),
+        "list_size": await client.zcard(sample.memories_list_key),
+        "type_index_sizes": type_sizes,
+        "type_index_total": sum(type_sizes.values())
+    }
+
+    for memory in memories:
+        await memory.clear_memories()
+    return result
+
+
+async def main():
+    """主函数"""
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+
+    client = await create_client(args.backend)
+
+    modes = {"script": [True], "pipeline": [False], "both": [True, False]}[args.mode]
+    results = [await run_mode(args, client, use_script) for use_script in modes]
+
+    output = json.dumps({
+        "benchmark": "memory_write",
+        "timestamp": time.time(),
+        "config": {
+            "backend": args.backend,
+            "writes": args.writes,
+            "agents": args.agents,
+            "max_memories": args.max_memories,
+            "content_chars": args.content_chars,
+            "codec": args.codec,
+            "compress_threshold": args.compress_threshold
+        },
+        "results": results
+    }, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if hasattr(client, "aclose"):
+        await client.aclose()
+    else:
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
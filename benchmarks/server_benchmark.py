@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Web服务压测 - 在进程内启动会议Web服务（脚本化模型+进程内Redis），模拟多个前端并发驱动会议
+
+每个客户端：创建会议 -> 订阅事件流（WebSocket或SSE）-> 开始讨论 -> 提交关键词 -> 结束会议。
+
+示例:
+    python benchmarks/server_benchmark.py --clients 8 --agents 4 --turns 2 --transport ws
+    python benchmarks/server_benchmark.py --clients 4 --slow-client-delay 0.01 --queue-size 16
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import aiohttp
+from aiohttp import web
+
+# 添加项目根目录到系统路径
+ROOT_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(ROOT_DIR))
+
+# 压测始终使用进程内Redis（需在导入配置前设置）
+os.environ["REDIS_BACKEND"] = "memory"
+os.environ["ENABLE_REDIS"] = "true"
+
+from src.config.redis_config import RedisSettings, configure_redis
+from src.config.settings import Settings
+from src.models.scripted import ScriptedModel
+from ui.web.server import MeetingServer
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="会议Web服务压测")
+    parser.add_argument("--clients", type=int, default=8, help="并发客户端（会议）数量")
+    parser.add_argument("--agents", type=int, default=4, help="每场会议的智能体数量")
+    parser.add_argument("--turns", type=int, default=2, help="讨论轮数")
+    parser.add_argument("--transport", choices=["ws", "sse"], default="ws", help="事件流传输方式")
+    parser.add_argument("--latency", type=float, default=0.05, help="模型首字延迟（秒）")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="模型生成速度（token/秒）")
+    parser.add_argument("--response-tokens", type=int, default=120, help="每次发言的token数")
+    parser.add_argument("--queue-size", type=int, default=256, help="会议输出队列和订阅者队列容量")
+    parser.add_argument("--client-timeout", type=float, default=10.0, help="订阅者写入超时（秒）")
+    parser.add_argument("--slow-client-delay", type=float, default=0.0, help="客户端处理每个事件的延迟（秒），用于观察背压")
+    parser.add_argument("--topic", type=str, default="剪纸文创产品设计", help="会议主题")
+    parser.add_argument("--output", type=str, default=None, help="结果JSON文件路径（默认输出到标准输出）")
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="日志级别"
+    )
+    return parser.parse_args()
+
+
+def build_agent_counts(total: int) -> Dict[str, int]:
+    """按手工艺人、消费者、制造商人、设计师的顺序分配智能体数量"""
+    types = ["craftsman", "consumer", "manufacturer", "designer"]
+    counts = {agent_type: 0 for agent_type in types}
+    for i in range(total):
+        counts[types[i % len(types)]] += 1
+    return {agent_type: count for agent_type, count in counts.items() if count}
+
+
+async def iter_events(session: aiohttp.ClientSession, base_url: str, meeting_id: str, transport: str):
+    """
+    订阅会议事件流
+
+    Yields:
+        事件字典
+    """
+    if transport == "ws":
+        async with session.ws_connect(f"{base_url}/meetings/{meeting_id}/ws") as ws:
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                yield json.loads(message.data)
+        return
+
+    async with session.get(f"{base_url}/meetings/{meeting_id}/events") as response:
+        async for line in response.content:
+            line = line.decode("utf-8").rstrip("\n")
+            if line.startswith("data: "):
+                yield json.loads(line[len("data: "):])
+
+
+async def run_client(
+    args,
+    session: aiohttp.ClientSession,
+    base_url: str,
+    client_index: int,
+    agent_counts: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    模拟一个前端驱动一场完整会议
+
+    Returns:
+        本场会议的统计结果
+    """
+    meeting_id = f"bench{client_index}"
+    start = time.perf_counter()
+    stats: Dict[str, Any] = {"meeting_id": meeting_id, "events": 0, "output_bytes": 0, "first_output_seconds": None}
+    stage_done: Dict[str, asyncio.Event] = {"discussion": asyncio.Event(), "role_switch": asyncio.Event()}
+    failures: List[str] = []
+
+    async with session.post(f"{base_url}/meetings", json={"id": meeting_id, "agent_counts": agent_counts}) as response:
+        if response.status != 201:
+            return {**stats, "success": False, "error": f"创建会议失败: HTTP {response.status}"}
+
+    async def consume() -> None:
+        try:
+            await read_events()
+        except aiohttp.ClientError:
+            # 过慢的客户端被服务端断开
+            pass
+
+    async def read_events() -> None:
+        async for event in iter_events(session, base_url, meeting_id, args.transport):
+            stats["events"] += 1
+            if event["type"] == "output":
+                stats["output_bytes"] += len(event["text"].encode("utf-8"))
+                if stats["first_output_seconds"] is None:
+                    stats["first_output_seconds"] = round(time.perf_counter() - start, 4)
+            elif event["type"] == "stage" and event["status"] in ("completed", "failed"):
+                if event["status"] == "failed":
+                    failures.append(f"{event['stage']}: {event.get('error')}")
+                if event["stage"] in stage_done:
+                    stage_done[event["stage"]].set()
+            elif event["type"] == "closed":
+                stats["closed_seen"] = True
+                break
+            if args.slow_client_delay:
+                await asyncio.sleep(args.slow_client_delay)
+
+    async def get_state() -> Dict[str, Any]:
+        async with session.get(f"{base_url}/meetings/{meeting_id}") as response:
+            return await response.json()
+
+    async def wait_stage(stage: str) -> None:
+        # 事件流被服务端断开（客户端过慢）后改为轮询会议状态
+        waiter = asyncio.create_task(stage_done[stage].wait())
+        await asyncio.wait({waiter, consumer}, return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        while not stage_done[stage].is_set():
+            state = await get_state()
+            if not state["busy"]:
+                break
+            await asyncio.sleep(0.05)
+
+    consumer = asyncio.create_task(consume())
+    try:
+        async with session.post(f"{base_url}/meetings/{meeting_id}/start", json={"topic": args.topic}) as response:
+            response.raise_for_status()
+        await wait_stage("discussion")
+        stats["discussion_seconds"] = round(time.perf_counter() - start, 4)
+
+        async with session.post(f"{base_url}/meetings/{meeting_id}/keywords", json={"keywords": []}) as response:
+            response.raise_for_status()
+        await wait_stage("role_switch")
+
+        state = await get_state()
+        async with session.delete(f"{base_url}/meetings/{meeting_id}") as response:
+            response.raise_for_status()
+        # 服务端推送完剩余事件（或断开过慢的客户端）后事件流结束
+        await consumer
+    finally:
+        consumer.cancel()
+
+    return {
+        **stats,
+        "dropped": stats.get("closed_seen") is None,
+        "success": not failures and "role_switch" in state.get("completed_stages", []),
+        "failures": failures,
+        "wall_seconds": round(time.perf_counter() - start, 4),
+        "voted_keywords": state.get("voted_keywords", [])
+    }
+
+
+async def main():
+    """主函数"""
+    args = parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level), stream=sys.stderr)
+    configure_redis(RedisSettings())
+
+    settings = Settings()
+    settings.max_turns = args.turns
+    settings.max_concurrent_meetings = max(args.clients, 1)
+    agent_counts = build_agent_counts(args.agents)
+
+    model = ScriptedModel(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens
+    )
+    server = MeetingServer(
+        settings,
+        model_factory=lambda _settings: model,
+        queue_size=args.queue_size,
+        client_timeout=args.client_timeout
+    )
+    runner = web.AppRunner(server.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    start = time.perf_counter()
+    try:
+        async with aiohttp.ClientSession() as session:
+            runs = await asyncio.gather(*(
+                run_client(args, session, base_url, i, agent_counts) for i in range(args.clients)
+            ))
+    finally:
+        await runner.cleanup()
+    wall_seconds = time.perf_counter() - start
+
+    walls = [run["wall_seconds"] for run in runs if run.get("wall_seconds") is not None]
+    first_outputs = [run["first_output_seconds"] for run in runs if run.get("first_output_seconds") is not None]
+    total_events = sum(run["events"] for run in runs)
+
+    result = {
+        "benchmark": "server",
+        "timestamp": time.time(),
+        "config": {
+            "clients": args.clients,
+            "agent_counts": agent_counts,
+            "turns": args.turns,
+            "transport": args.transport,
+            "latency": args.latency,
+            "tokens_per_second": args.tokens_per_second,
+            "response_tokens": args.response_tokens,
+            "queue_size": args.queue_size,
+            "client_timeout": args.client_timeout,
+            "slow_client_delay": args.slow_client_delay
+        },
+        "summary": {
+            "wall_seconds": round(wall_seconds, 4),
+            "succeeded": sum(1 for run in runs if run.get("success")),
+            "meeting_seconds": {
+                "mean": round(sum(walls) / len(walls), 4) if walls else None,
+                "max": max(walls) if walls else None
+            },
+            "first_output_seconds": {
+                "mean": round(sum(first_outputs) / len(first_outputs), 4) if first_outputs else None,
+                "max": max(first_outputs) if first_outputs else None
+            },
+            "events": total_events,
+            "events_per_second": round(total_events / wall_seconds, 1) if wall_seconds else None,
+            "model": model.get_stats()
+        },
+        "runs": runs
+    }
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -7,13 +7,19 @@
 
 import os
 import sys
-import asyncio
 from pathlib import Path
 
 # 添加项目根目录到系统路径
 ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, str(ROOT_DIR))
 
+# 启动耗时分析需在导入其他模块之前开始
+if "--profile-startup" in sys.argv:
+    from src.utils.startup_profile import start_import_profile
+    start_import_profile()
+
+import asyncio
+
 from src.main import main
 
 if __name__ == "__main__":
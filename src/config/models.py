@@ -11,12 +11,29 @@ from typing import Dict, List, Any, Optional
 class ModelConfig:
     """模型配置类"""
 
+    # 可单独路由模型的会议阶段
+    STAGES = {
+        "introduce": "自我介绍",
+        "discuss": "讨论发言",
+        "tell_story": "基于图片讲故事",
+        "extract_keywords": "关键词提取",
+        "intelligent_vote": "关键词投票",
+        "kj_categorize": "KJ法关键词分类",
+        "switch_role": "视角转换",
+        "design_card": "设计卡牌"
+    }
+
+    # 只需解析结构化输出、使用小模型即可的阶段（MODEL_FAST_STAGES开启时路由到提供商的fast_model）
+    FAST_STAGES = ("extract_keywords", "intelligent_vote", "kj_categorize")
+
     # 支持的模型提供商
     SUPPORTED_PROVIDERS = {
         "openai": {
             "default_model": "gpt-4o",
+            "fast_model": "gpt-4.1-nano",
             "models": [
-                "gpt-4", "gpt-4-turbo", "gpt-4o", "gpt-3.5-turbo"
+                "gpt-4", "gpt-4-turbo", "gpt-4o", "gpt-3.5-turbo",
+                "gpt-4.1", "gpt-4.1-mini", "gpt-4.1-nano"
             ],
             "vision_models": [
                 "gpt-4-turbo", "gpt-4o"
@@ -24,6 +41,7 @@ class ModelConfig:
         },
         "google": {
             "default_model": "gemini-2.5-flash",
+            "fast_model": "gemini-2.5-flash-lite-preview-06-17",
             "models": [
                 "gemini-2.5-flash", "gemini-2.5-flash-lite-preview-06-17", "gemini-pro"
             ],
@@ -33,6 +51,7 @@ class ModelConfig:
         },
         "anthropic": {
             "default_model": "claude-3-opus-20240229",
+            "fast_model": "claude-3-haiku-20240307",
             "models": [
                 "claude-3-opus-20240229", "claude-3-sonnet-20240229", "claude-3-haiku-20240307"
             ],
@@ -51,6 +70,7 @@ class ModelConfig:
         },
         "openrouter": {
             "default_model": "meta-llama/llama-4-maverick:free",
+            "fast_model": "meta-llama/llama-4-scout:free",
             "models": [
                 "meta-llama/llama-4-maverick:free",
                 "meta-llama/llama-4-scout:free",
@@ -69,6 +89,7 @@ class ModelConfig:
         },
         "github": {
             "default_model": "openai/gpt-4.1",
+            "fast_model": "openai/gpt-4.1-nano",
             "models": [
                 "openai/gpt-4.1",
                 "openai/gpt-4o",
@@ -102,6 +123,22 @@ class ModelConfig:
             return config.get("default_model", "gpt-4")
         return "gpt-4"
 
+    @staticmethod
+    def get_fast_model(provider: str) -> str:
+        """
+        获取用于简单阶段的小模型（未配置时返回默认模型）
+
+        Args:
+            provider: 提供商
+
+        Returns:
+            模型名称
+        """
+        config = ModelConfig._get_provider_config(provider)
+        if config and config.get("fast_model"):
+            return config["fast_model"]
+        return ModelConfig.get_default_model(provider)
+
     @staticmethod
     def get_models(provider: str) -> List[str]:
         """
@@ -22,7 +22,7 @@ from .function_prompts.scenario_prompts import ScenarioPrompts
 from .function_prompts.image_story_prompts import ImageStoryPrompts
 
 # 导入提示词管理器
-from .template_manager import PromptTemplateManager, PromptTemplates, prompt_manager
+from .template_manager import CompiledTemplate, PromptTemplateManager, PromptTemplates, get_prompt_manager
 
 # 定义公开的API
 __all__ = [
@@ -42,11 +42,21 @@ __all__ = [
     'ImageStoryPrompts',
 
     # 管理器
+    'CompiledTemplate',
     'PromptTemplateManager',
     'PromptTemplates',  # 向后兼容
-    'prompt_manager',   # 全局实例
+    'get_prompt_manager',
+    'prompt_manager',   # 全局实例（首次访问时创建）
 ]
 
+
+def __getattr__(name: str):
+    # 全局实例按需创建
+    if name == "prompt_manager":
+        return get_prompt_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # 版本信息
 __version__ = '2.0.0'
 __author__ = 'TableRound Team'
@@ -162,7 +162,7 @@ class KeywordExtractionPrompts:
 - 确保关键词对后续讨论有指导意义
 
 请以JSON格式返回关键词列表：
-["关键词1", "关键词2", "关键词3", ...]
+{{"keywords": ["关键词1", "关键词2", "关键词3", ...]}}
 
 注意：请根据内容的实际情况选择合适的提取策略，不要强制使用设计要素框架。
 """
@@ -6,8 +6,10 @@
 统一管理所有提示词模板，提供向后兼容的接口
 """
 
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+import string
 
 # 导入基础提示词
 from .base_prompts import BasePrompts
@@ -25,6 +27,100 @@ from .function_prompts.scenario_prompts import ScenarioPrompts
 from .function_prompts.image_story_prompts import ImageStoryPrompts
 
 
+# 预编译模板缓存容量（按模板名和静态参数区分）
+TEMPLATE_CACHE_SIZE = 512
+
+_formatter = string.Formatter()
+
+
+def _escape_braces(text: str) -> str:
+    """转义花括号，使文本可以安全地放入格式串"""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class CompiledTemplate:
+    """
+    预编译的提示词模板
+
+    编译时代入静态参数，拆分为静态前缀（第一个动态字段之前的文本，已完全展开）和
+    动态后缀（仍含动态字段的格式串）。同一模板和静态参数的静态前缀始终不变，
+    支持提示词缓存的模型可将其标记为可缓存。
+    """
+
+    __slots__ = ("name", "prefix", "suffix", "fields")
+
+    def __init__(self, name: str, template: str, /, **static: Any):
+        """
+        编译模板
+
+        Args:
+            name: 模板名称
+            template: str.format 风格的模板
+            **static: 编译时代入的静态参数（模板中其余字段在渲染时提供）
+        """
+        self.name = name
+        prefix_parts: List[str] = []
+        suffix_parts: List[str] = []
+        fields: List[str] = []
+
+        for literal, field, spec, conversion in _formatter.parse(template):
+            if fields:
+                suffix_parts.append(_escape_braces(literal))
+            else:
+                prefix_parts.append(literal)
+            if field is None:
+                continue
+
+            if field in static:
+                value = _formatter.format_field(_formatter.convert_field(static[field], conversion), spec or "")
+                if fields:
+                    suffix_parts.append(_escape_braces(value))
+                else:
+                    prefix_parts.append(value)
+            else:
+                fields.append(field)
+                suffix_parts.append(
+                    "{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+                )
+
+        self.prefix = "".join(prefix_parts)
+        self.suffix = "".join(suffix_parts)
+        self.fields = tuple(dict.fromkeys(fields))
+
+    @property
+    def is_static(self) -> bool:
+        """模板是否已完全展开（没有动态字段）"""
+        return not self.fields
+
+    def render(self, **kwargs: Any) -> str:
+        """
+        渲染模板
+
+        Args:
+            **kwargs: 动态字段的值
+
+        Returns:
+            完整提示词
+        """
+        if not self.fields:
+            return self.prefix
+        return self.prefix + self.suffix.format(**kwargs)
+
+
+# 内置模板：名称 -> 模板（静态参数为 role、role_description、keyword_extraction_sop）
+_BUILTIN_TEMPLATES = {
+    "system": BasePrompts.SYSTEM_PROMPT_TEMPLATE,
+    "introduction": BasePrompts.INTRODUCTION_TEMPLATE,
+    "discussion": BasePrompts.DISCUSSION_TEMPLATE,
+    "image_story": BasePrompts.IMAGE_STORY_TEMPLATE,
+    "keyword_basic": KeywordExtractionPrompts.BASIC_EXTRACTION_PROMPT,
+    "keyword_multilingual": KeywordExtractionPrompts.MULTILINGUAL_EXTRACTION_PROMPT,
+    "keyword_hierarchical": KeywordExtractionPrompts.HIERARCHICAL_EXTRACTION_PROMPT,
+    "keyword_sentiment": KeywordExtractionPrompts.SENTIMENT_BASED_EXTRACTION_PROMPT,
+    "keyword_design_elements": KeywordExtractionPrompts.DESIGN_ELEMENTS_EXTRACTION_PROMPT
+}
+
+
 class PromptTemplateManager:
     """提示词模板管理器"""
     
@@ -66,6 +162,68 @@ class PromptTemplateManager:
 
 在这个研讨会中，每位参与者都应该基于自己的专业背景和经验，为剪纸文创产品设计提供独特的见解和建议。最终，你们需要共同设计出一个既保留传统文化元素，又符合现代审美和使用需求的剪纸文创产品。
 """
+
+        # 预编译模板缓存（LRU）：(模板名, 静态参数) -> CompiledTemplate
+        self._compiled: "OrderedDict[Tuple[str, Tuple[Tuple[str, Any], ...]], CompiledTemplate]" = OrderedDict()
+
+    def compile_template(self, name: str, template: str, /, **static: Any) -> CompiledTemplate:
+        """
+        获取预编译模板（相同名称和静态参数只编译一次）
+
+        Args:
+            name: 模板名称（同一名称必须对应同一模板）
+            template: str.format 风格的模板
+            **static: 静态参数（需可哈希）
+
+        Returns:
+            预编译模板
+        """
+        key = (name, tuple(sorted(static.items())))
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self._compiled.move_to_end(key)
+            return compiled
+
+        compiled = CompiledTemplate(name, template, **static)
+        self._compiled[key] = compiled
+        if len(self._compiled) > TEMPLATE_CACHE_SIZE:
+            self._compiled.popitem(last=False)
+        return compiled
+
+    def get_template(self, name: str, role: str = "") -> CompiledTemplate:
+        """
+        获取内置模板的预编译对象（角色描述和关键词提取SOP已代入）
+
+        Args:
+            name: 模板名称（system, introduction, discussion, image_story, keyword_<提取类型>）
+            role: 角色名称
+
+        Returns:
+            预编译模板
+        """
+        template = _BUILTIN_TEMPLATES.get(name)
+        if template is None:
+            raise KeyError(f"未知的提示词模板: {name}")
+        return self.compile_template(
+            name,
+            template,
+            role=role,
+            role_description=self._role_descriptions.get(role, ""),
+            keyword_extraction_sop=BasePrompts.KEYWORD_EXTRACTION_SOP
+        )
+
+    def get_static_prefix(self, name: str, role: str = "") -> str:
+        """
+        获取内置模板的静态前缀（同一角色的每次调用都相同，可用于提示词缓存）
+
+        Args:
+            name: 模板名称
+            role: 角色名称
+
+        Returns:
+            静态前缀
+        """
+        return self.get_template(name, role).prefix
     
     def get_system_prompt(self, role: str) -> str:
         """
@@ -77,8 +235,7 @@ class PromptTemplateManager:
         Returns:
             系统提示词
         """
-        role_description = self._role_descriptions.get(role, "")
-        return BasePrompts.get_system_prompt(role, role_description)
+        return self.get_template("system", role).render()
     
     def get_introduction_prompt(self, role: str) -> str:
         """
@@ -90,8 +247,7 @@ class PromptTemplateManager:
         Returns:
             自我介绍提示词
         """
-        role_description = self._role_descriptions.get(role, "")
-        return BasePrompts.get_introduction_prompt(role, role_description)
+        return self.get_template("introduction", role).render()
     
     def get_discussion_prompt(self, role: str, topic: str) -> str:
         """
@@ -104,8 +260,7 @@ class PromptTemplateManager:
         Returns:
             讨论提示词
         """
-        role_description = self._role_descriptions.get(role, "")
-        return BasePrompts.get_discussion_prompt(role, role_description, topic)
+        return self.get_template("discussion", role).render(topic=topic)
     
     def get_keyword_extraction_prompt(self, content: str, topic: str,
                                     extraction_type: str = "design_elements",
@@ -122,22 +277,14 @@ class PromptTemplateManager:
         Returns:
             关键词提取提示词
         """
-        if extraction_type == "design_elements" and role:
-            return KeywordExtractionPrompts.get_design_elements_prompt(content, topic, role)
-        elif extraction_type == "basic":
-            return KeywordExtractionPrompts.get_basic_extraction_prompt(content, topic)
-        elif extraction_type == "multilingual":
-            return KeywordExtractionPrompts.get_multilingual_prompt(content, topic)
-        elif extraction_type == "hierarchical":
-            return KeywordExtractionPrompts.get_hierarchical_prompt(content, topic)
-        elif extraction_type == "sentiment":
-            return KeywordExtractionPrompts.get_sentiment_based_prompt(content, topic)
-        else:
+        if extraction_type in ("basic", "multilingual", "hierarchical", "sentiment"):
+            name = f"keyword_{extraction_type}"
+        elif role:
             # 默认使用设计要素提取（如果有角色信息）
-            if role:
-                return KeywordExtractionPrompts.get_design_elements_prompt(content, topic, role)
-            else:
-                return KeywordExtractionPrompts.get_basic_extraction_prompt(content, topic)
+            name = "keyword_design_elements"
+        else:
+            name = "keyword_basic"
+        return self.get_template(name, role or "").render(content=content, topic=topic)
     
     def get_image_story_prompt(self, role: str) -> str:
         """
@@ -149,8 +296,7 @@ class PromptTemplateManager:
         Returns:
             图片故事提示词
         """
-        role_description = self._role_descriptions.get(role, "")
-        return BasePrompts.get_image_story_prompt(role, role_description)
+        return self.get_template("image_story", role).render()
     
     def get_role_switch_prompt(self, original_role: str, new_role: str, topic: str) -> str:
         """
@@ -306,6 +452,7 @@ class PromptTemplateManager:
             description: 角色描述
         """
         self._role_descriptions[role] = description
+        self._compiled.clear()
         self.logger.info(f"添加新角色描述: {role}")
     
     def get_available_roles(self) -> List[str]:
@@ -318,8 +465,38 @@ class PromptTemplateManager:
         return list(self._role_descriptions.keys())
 
 
-# 创建全局实例，保持向后兼容
-prompt_manager = PromptTemplateManager()
+# 全局实例在首次使用时创建（导入本模块不构建模板）
+_prompt_manager: Optional[PromptTemplateManager] = None
+
+
+def get_prompt_manager() -> PromptTemplateManager:
+    """
+    获取全局提示词管理器（首次调用时创建）
+
+    Returns:
+        提示词管理器
+    """
+    global _prompt_manager
+    if _prompt_manager is None:
+        _prompt_manager = PromptTemplateManager()
+    return _prompt_manager
+
+
+def __getattr__(name: str):
+    # 保持向后兼容：模块属性 prompt_manager 按需创建
+    if name == "prompt_manager":
+        return get_prompt_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _ManagerAttribute:
+    """读取全局提示词管理器属性的类属性描述符（访问时才创建管理器）"""
+
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+
+    def __get__(self, instance, owner):
+        return getattr(get_prompt_manager(), self.attribute)
 
 
 # 向后兼容的PromptTemplates类
@@ -327,44 +504,44 @@ class PromptTemplates:
     """向后兼容的提示词模板类"""
     
     # 保持原有的角色描述字典，用于向后兼容
-    ROLE_DESCRIPTIONS = prompt_manager._role_descriptions
+    ROLE_DESCRIPTIONS = _ManagerAttribute("_role_descriptions")
     
     # 保持原有的角色转换提示词
-    ROLE_SWITCH_PROMPT = prompt_manager._role_switch_prompt
+    ROLE_SWITCH_PROMPT = _ManagerAttribute("_role_switch_prompt")
     
     @staticmethod
     def get_system_prompt(role: str) -> str:
         """向后兼容的系统提示词获取方法"""
-        return prompt_manager.get_system_prompt(role)
+        return get_prompt_manager().get_system_prompt(role)
     
     @staticmethod
     def get_introduction_prompt(role: str) -> str:
         """向后兼容的自我介绍提示词获取方法"""
-        return prompt_manager.get_introduction_prompt(role)
+        return get_prompt_manager().get_introduction_prompt(role)
     
     @staticmethod
     def get_discussion_prompt(role: str, topic: str) -> str:
         """向后兼容的讨论提示词获取方法"""
-        return prompt_manager.get_discussion_prompt(role, topic)
+        return get_prompt_manager().get_discussion_prompt(role, topic)
     
     @staticmethod
     def get_keyword_extraction_prompt(content: str, topic: str,
                                     extraction_type: str = "design_elements",
                                     role: str = None) -> str:
         """向后兼容的关键词提取提示词获取方法"""
-        return prompt_manager.get_keyword_extraction_prompt(content, topic, extraction_type, role)
+        return get_prompt_manager().get_keyword_extraction_prompt(content, topic, extraction_type, role)
     
     @staticmethod
     def get_image_story_prompt(role: str) -> str:
         """向后兼容的图片故事提示词获取方法"""
-        return prompt_manager.get_image_story_prompt(role)
+        return get_prompt_manager().get_image_story_prompt(role)
     
     @staticmethod
     def get_role_switch_prompt(original_role: str, new_role: str, topic: str) -> str:
         """向后兼容的角色转换提示词获取方法"""
-        return prompt_manager.get_role_switch_prompt(original_role, new_role, topic)
+        return get_prompt_manager().get_role_switch_prompt(original_role, new_role, topic)
     
     @staticmethod
     def get_paper_cutting_scenario() -> str:
         """向后兼容的剪纸研讨会场景获取方法"""
-        return prompt_manager.get_paper_cutting_scenario()
\ No newline at end of file
+        return get_prompt_manager().get_paper_cutting_scenario()
\ No newline at end of file
@@ -33,10 +33,23 @@ class RedisSettings(BaseSettings):
     # 记忆模块配置
     MEMORY_MAX_SIZE: int = 1000  # 每个agent最大记忆数量
     MEMORY_TTL: int = 86400 * 7  # 记忆过期时间（7天）
+    MEMORY_USE_LUA: bool = True  # 使用Lua脚本原子写入并裁剪记忆
+    MEMORY_CODEC: str = "msgpack"  # 记录编码：msgpack（未安装时回退json）或 json
+    MEMORY_COMPRESS_THRESHOLD: int = 1024  # 超过该字节数的记录使用zstd压缩（0关闭，需安装zstandard）
+    MEMORY_WRITE_QUEUE: bool = False  # 记忆和发言写入后台队列，由后台任务按批用管道写入
+    MEMORY_WRITE_BATCH_SIZE: int = 64  # 每个管道最多合并的写入数
+    MEMORY_WRITE_MAX_PENDING: int = 1024  # 写入队列积压上限（达到上限时写入方等待）
+
+    # 会议时间线配置
+    TIMELINE_BACKEND: str = "zset"  # zset（有序集合+发言哈希）或 stream（Redis Streams，需Redis 5.0+）
+    TIMELINE_STREAM_MAXLEN: int = 1000  # stream后端保留的最大发言条数（近似裁剪）
 
     # 启用/禁用Redis
     ENABLE_REDIS: bool = True
 
+    # 存储后端：redis（Redis服务）或 memory（进程内替身，用于基准测试和本地调试）
+    REDIS_BACKEND: str = "redis"
+
     class Config:
         env_file = ".env"
         env_prefix = ""
@@ -68,6 +81,11 @@ class RedisManager:
     
     async def _create_client(self) -> None:
         """创建Redis客户端"""
+        if self.settings.REDIS_BACKEND.lower() == "memory":
+            from src.utils.inmemory_redis import InMemoryRedis
+            self._client = InMemoryRedis()
+            return
+
         try:
             # 创建连接池
             self._connection_pool = redis.ConnectionPool(
@@ -174,6 +192,21 @@ def _get_redis_manager() -> RedisManager:
     return redis_manager
 
 
+def configure_redis(settings: RedisSettings) -> RedisManager:
+    """
+    使用指定设置替换全局Redis管理器（如基准测试切换到进程内后端）
+
+    Args:
+        settings: Redis配置
+
+    Returns:
+        新的Redis管理器
+    """
+    global redis_manager
+    redis_manager = RedisManager(settings)
+    return redis_manager
+
+
 async def get_redis_client() -> redis.Redis:
     """
     获取Redis客户端的便捷函数
@@ -196,6 +229,9 @@ async def init_redis() -> None:
 
 
 async def close_redis() -> None:
-    """关闭Redis连接"""
+    """关闭Redis连接（先写入写入队列中的积压）"""
+    from src.core.write_queue import close_write_queue
+
+    await close_write_queue()
     manager = _get_redis_manager()
     await manager.close()
@@ -55,6 +55,22 @@ class Settings:
         self.provider = os.getenv("AI_PROVIDER", "openai")
         self.model_config = ModelConfig()
         self.model = os.getenv("AI_MODEL", self.model_config.get_default_model(self.provider))
+        self.prompt_cache = self._parse_bool_env("PROMPT_CACHE", "true")
+
+        # 故障转移设置（备用提供商格式：provider[:model]，逗号分隔）
+        self.model_failover_providers = [
+            entry.strip() for entry in os.getenv("MODEL_FAILOVER_PROVIDERS", "").split("#")[0].split(",")
+            if entry.strip()
+        ]
+        self.model_hedge = self._parse_bool_env("MODEL_HEDGE", "false")
+        self.model_hedge_quantile = float(os.getenv("MODEL_HEDGE_QUANTILE", "0.95"))
+        self.model_hedge_delay = float(os.getenv("MODEL_HEDGE_DELAY", "3.0"))
+        self.model_request_timeout = float(os.getenv("MODEL_REQUEST_TIMEOUT", "120"))
+        self.model_failure_cooldown = float(os.getenv("MODEL_FAILURE_COOLDOWN", "30"))
+
+        # 阶段路由设置（格式：[角色.]阶段=[provider:]model，逗号分隔）
+        self.model_routes = self._parse_model_routes(os.getenv("MODEL_ROUTES", ""))
+        self.model_fast_stages = self._parse_bool_env("MODEL_FAST_STAGES", "false")
 
         # 记忆设置
         self.memory_storage_type = os.getenv("MEMORY_STORAGE_TYPE", "memory")
@@ -63,9 +79,17 @@ class Settings:
         # 会议设置
         self.clean_redis_on_start = self._parse_bool_env("CLEAN_REDIS_ON_START", "true")
         self.preserve_agent_memories = self._parse_bool_env("PRESERVE_AGENT_MEMORIES", "false")
+        self.session_scoped_keys = self._parse_bool_env("SESSION_SCOPED_KEYS", "false")
+        self.max_concurrent_meetings = int(os.getenv("MAX_CONCURRENT_MEETINGS", "8"))
+
+        # 连接池设置
+        self.http_pool_size = int(os.getenv("HTTP_POOL_SIZE", "100"))
 
         # 投票设置
         self.voting_threshold = float(os.getenv("VOTING_THRESHOLD", "0.6"))
+        self.batch_voting = self._parse_bool_env("BATCH_VOTING", "false")
+        self.voting_method = self._parse_voting_method(os.getenv("VOTING_METHOD", "consensus"))
+        self.voting_role_weights = self._parse_role_weights(os.getenv("VOTING_ROLE_WEIGHTS", ""))
 
         # 智能体设置
         self.agent_counts = {
@@ -78,6 +102,13 @@ class Settings:
         # 对话设置
         self.max_turns = int(os.getenv("MAX_TURNS", "10"))
         self.max_keywords = int(os.getenv("MAX_KEYWORDS", "10"))
+        self.keyword_merge_threshold = float(os.getenv("KEYWORD_MERGE_THRESHOLD", "0.8"))
+        self.summary_sentences_per_turn = int(os.getenv("SUMMARY_SENTENCES_PER_TURN", "6"))
+        self.parallel_turns = self._parse_bool_env("PARALLEL_TURNS", "false")
+        self.prefetch_context = self._parse_bool_env("PREFETCH_CONTEXT", "true")
+        self.pipeline_stages = self._parse_bool_env("PIPELINE_STAGES", "false")
+        self.stage_concurrency = int(os.getenv("STAGE_CONCURRENCY", "4"))
+        self.stream_results = self._parse_bool_env("STREAM_RESULTS", "false")
 
         # 日志设置
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
@@ -86,6 +117,8 @@ class Settings:
         # API设置
         self.api_host = os.getenv("API_HOST", "0.0.0.0")
         self.api_port = int(os.getenv("API_PORT", "8000"))
+        self.server_queue_size = int(os.getenv("SERVER_QUEUE_SIZE", "256"))
+        self.server_client_timeout = float(os.getenv("SERVER_CLIENT_TIMEOUT", "10.0"))
 
         # 其他设置
         self.debug = self._parse_bool_env("DEBUG", "false")
@@ -107,6 +140,69 @@ class Settings:
             value = value.split('#')[0].strip()
         return value.lower() == "true"
 
+    def _parse_model_routes(self, value: str) -> Dict[str, str]:
+        """
+        解析阶段路由配置
+
+        Args:
+            value: 环境变量值，如 "intelligent_vote=openai:gpt-4.1-nano,designer.discuss=gpt-4o"
+
+        Returns:
+            路由键 -> 模型（[provider:]model）
+        """
+        routes = {}
+        for entry in value.split("#")[0].split(","):
+            key, _, model = entry.partition("=")
+            key, model = key.strip(), model.strip()
+            if not key or not model:
+                continue
+            stage = key.rsplit(".", 1)[-1]
+            if stage not in ModelConfig.STAGES:
+                logging.getLogger("settings").warning(f"忽略未知阶段的模型路由: {key}")
+                continue
+            routes[key] = model
+        return routes
+
+    def _parse_voting_method(self, value: str) -> str:
+        """
+        解析计票方式
+
+        Args:
+            value: 环境变量值（consensus、weighted、borda 或 schulze）
+
+        Returns:
+            计票方式，无效时为 consensus
+        """
+        from src.utils.voting import VOTING_METHODS
+
+        method = value.split("#")[0].strip().lower() or "consensus"
+        if method not in VOTING_METHODS:
+            logging.getLogger("settings").warning(f"忽略未知的计票方式: {method}，使用 consensus")
+            return "consensus"
+        return method
+
+    def _parse_role_weights(self, value: str) -> Dict[str, float]:
+        """
+        解析角色投票权重
+
+        Args:
+            value: 环境变量值，如 "designer=1.5,craftsman=1.2"
+
+        Returns:
+            角色 -> 权重
+        """
+        weights = {}
+        for entry in value.split("#")[0].split(","):
+            role, _, weight = entry.partition("=")
+            role, weight = role.strip(), weight.strip()
+            if not role or not weight:
+                continue
+            try:
+                weights[role] = float(weight)
+            except ValueError:
+                logging.getLogger("settings").warning(f"忽略无效的角色投票权重: {entry.strip()}")
+        return weights
+
     def get_api_key(self, provider: str) -> Optional[str]:
         """
         获取API密钥
@@ -137,6 +233,8 @@ class Settings:
         """
         获取模型实例
 
+        未指定提供商且配置了备用提供商时，返回在主提供商和备用提供商之间故障转移的组合模型。
+
         Args:
             provider: 提供商，默认使用配置中的提供商
             model_name: 模型名称，默认使用配置中的模型名称
@@ -144,9 +242,161 @@ class Settings:
         Returns:
             模型实例
         """
-        provider = provider or self.provider
-        model_name = model_name or self.model
+        if provider is not None or model_name is not None:
+            return self._create_model(provider or self.provider, model_name or self.model)
+
+        model = self.get_failover_model() if self.model_failover_providers else self._create_model(self.provider, self.model)
+        routes = self.get_stage_models()
+        if not routes:
+            return model
+
+        from src.models.router import ModelRouter
+        return ModelRouter(model, routes, prompt_cache=self.prompt_cache)
+
+    def get_stage_routes(self) -> Dict[str, tuple]:
+        """
+        获取各阶段的路由目标（MODEL_ROUTES优先于MODEL_FAST_STAGES）
+
+        Returns:
+            路由键 -> (提供商, 模型名称)
+        """
+        targets = {}
+        if self.model_fast_stages:
+            fast_model = self.model_config.get_fast_model(self.provider)
+            for stage in ModelConfig.FAST_STAGES:
+                targets[stage] = (self.provider, fast_model)
+
+        for key, value in self.model_routes.items():
+            provider, _, model_name = value.partition(":")
+            if provider.lower() in ModelConfig.SUPPORTED_PROVIDERS and model_name:
+                targets[key] = (provider.lower(), model_name)
+            else:
+                # 只写模型名称时使用主提供商（OpenRouter模型名本身可能包含冒号）
+                targets[key] = (self.provider, value)
+
+        return {
+            key: target for key, target in targets.items()
+            if target != (self.provider, self.model)
+        }
+
+    def get_stage_models(self) -> Dict[str, Any]:
+        """
+        创建各阶段路由的模型实例（相同的提供商和模型共享一个实例，创建失败的路由回退到默认模型）
+
+        配置了备用提供商时，每个路由目标同样包装为故障转移模型（路由目标在前，备用提供商在后），
+        路由到的阶段不会失去故障转移和对冲请求。
+
+        Returns:
+            路由键 -> 模型实例
+        """
+        logger = logging.getLogger("settings")
+        fallback_entries: Optional[List[tuple]] = None
+        instances: Dict[tuple, Any] = {}
+        models = {}
+        for key, target in self.get_stage_routes().items():
+            if target not in instances:
+                try:
+                    primary = self._create_model(*target)
+                except ValueError as e:
+                    logger.warning(f"阶段 {key} 的模型路由无效，使用默认模型: {str(e)}")
+                    instances[target] = None
+                else:
+                    # 每个路由使用独立的备用后端实例（用量按路由分别统计，不重复汇总）；
+                    # 无法创建的备用后端只提示一次，之后的路由不再尝试
+                    entries = self._get_fallback_entries() if fallback_entries is None else fallback_entries
+                    backups = self._create_backends(entries)
+                    fallback_entries = list(backups)
+                    instances[target] = self._combine_backends(
+                        [primary] + [model for entry, model in backups.items() if entry != target]
+                    )
+            if instances[target] is not None:
+                models[key] = instances[target]
+        return models
+
+    def _get_fallback_entries(self) -> List[tuple]:
+        """
+        解析备用提供商配置（不受支持的提供商会被跳过）
+
+        Returns:
+            [(提供商, 模型名称), ...]
+        """
+        entries = []
+        for entry in self.model_failover_providers:
+            provider, _, model_name = entry.partition(":")
+            provider = provider.strip().lower()
+            if provider not in ModelConfig.SUPPORTED_PROVIDERS:
+                logging.getLogger("settings").warning(f"忽略不支持的备用提供商: {provider}")
+                continue
+            entries.append((provider, model_name.strip() or self.model_config.get_default_model(provider)))
+        return entries
+
+    def _create_backends(self, entries: List[tuple]) -> Dict[tuple, Any]:
+        """
+        创建模型后端（缺少API密钥等无法创建的后端会被跳过）
+
+        Args:
+            entries: [(提供商, 模型名称), ...]
+
+        Returns:
+            (提供商, 模型名称) -> 模型实例（保持配置顺序）
+        """
+        models = {}
+        for provider, model_name in entries:
+            try:
+                models[(provider, model_name)] = self._create_model(provider, model_name)
+            except ValueError as e:
+                logging.getLogger("settings").warning(f"跳过后端 {provider}/{model_name}: {str(e)}")
+        return models
+
+    def get_failover_model(self) -> Any:
+        """
+        获取故障转移模型：主提供商在前，备用提供商按配置顺序排列
+
+        缺少API密钥或不受支持的备用提供商会被跳过。
+
+        Returns:
+            故障转移模型（只有一个可用后端时直接返回该模型）
+        """
+        models = list(self._create_backends([(self.provider, self.model)] + self._get_fallback_entries()).values())
+        if not models:
+            raise ValueError("没有可用的模型后端，请检查API密钥配置")
+        return self._combine_backends(models)
+
+    def _combine_backends(self, models: List[Any]) -> Any:
+        """
+        把按优先级排列的模型后端组合为故障转移模型
 
+        Args:
+            models: 模型后端
+
+        Returns:
+            故障转移模型（只有一个后端时直接返回该模型）
+        """
+        if len(models) == 1:
+            return models[0]
+
+        from src.models import FailoverModel
+        return FailoverModel(
+            models,
+            hedge=self.model_hedge,
+            hedge_quantile=self.model_hedge_quantile,
+            hedge_delay=self.model_hedge_delay,
+            request_timeout=self.model_request_timeout or None,
+            cooldown=self.model_failure_cooldown,
+            prompt_cache=self.prompt_cache
+        )
+
+    def _create_model(self, provider: str, model_name: str) -> Any:
+        """
+        创建单个提供商的模型实例
+
+        Args:
+            provider: 提供商
+            model_name: 模型名称
+
+        Returns:
+            模型实例
+        """
         # 获取API密钥
         api_key = self.get_api_key(provider)
         if not api_key:
@@ -158,31 +408,31 @@ class Settings:
         # 根据提供商创建不同的模型实例
         if provider.lower() == "openai":
             from src.models import OpenAIModel
-            return OpenAIModel(model_name=model_name, api_key=api_key, base_url=base_url)
+            return OpenAIModel(model_name=model_name, api_key=api_key, base_url=base_url, prompt_cache=self.prompt_cache)
 
         elif provider.lower() == "google":
             from src.models import GoogleModel
-            return GoogleModel(model_name=model_name, api_key=api_key, base_url=base_url)
+            return GoogleModel(model_name=model_name, api_key=api_key, base_url=base_url, prompt_cache=self.prompt_cache)
 
         elif provider.lower() == "doubao":
             from src.models import DoubaoModel
-            return DoubaoModel(model_name=model_name, api_key=api_key, base_url=base_url)
+            return DoubaoModel(model_name=model_name, api_key=api_key, base_url=base_url, prompt_cache=self.prompt_cache)
 
         elif provider.lower() == "anthropic":
             from src.models import AnthropicModel
-            return AnthropicModel(model_name=model_name, api_key=api_key, base_url=base_url)
+            return AnthropicModel(model_name=model_name, api_key=api_key, base_url=base_url, prompt_cache=self.prompt_cache)
 
         elif provider.lower() == "deepseek":
             from src.models import DeepSeekModel
-            return DeepSeekModel(model_name=model_name, api_key=api_key, base_url=base_url)
+            return DeepSeekModel(model_name=model_name, api_key=api_key, base_url=base_url, prompt_cache=self.prompt_cache)
 
         elif provider.lower() == "openrouter":
             from src.models import OpenRouterModel
-            return OpenRouterModel(model_name=model_name, api_key=api_key, base_url=base_url)
+            return OpenRouterModel(model_name=model_name, api_key=api_key, base_url=base_url, prompt_cache=self.prompt_cache)
 
         elif provider.lower() == "github":
             from src.models import GithubModel
-            return GithubModel(model_name=model_name, api_key=api_key, base_url=base_url)
+            return GithubModel(model_name=model_name, api_key=api_key, base_url=base_url, prompt_cache=self.prompt_cache)
 
         else:
             raise ValueError(f"不支持的提供商: {provider}")
@@ -197,16 +447,40 @@ class Settings:
         return {
             "provider": self.provider,
             "model": self.model,
+            "prompt_cache": self.prompt_cache,
+            "model_failover_providers": self.model_failover_providers,
+            "model_hedge": self.model_hedge,
+            "model_hedge_quantile": self.model_hedge_quantile,
+            "model_hedge_delay": self.model_hedge_delay,
+            "model_request_timeout": self.model_request_timeout,
+            "model_failure_cooldown": self.model_failure_cooldown,
+            "model_routes": self.model_routes,
+            "model_fast_stages": self.model_fast_stages,
             "memory_storage_type": self.memory_storage_type,
             "memory_max_tokens": self.memory_max_tokens,
             "agent_counts": self.agent_counts,
             "max_turns": self.max_turns,
             "max_keywords": self.max_keywords,
+            "keyword_merge_threshold": self.keyword_merge_threshold,
+            "summary_sentences_per_turn": self.summary_sentences_per_turn,
+            "parallel_turns": self.parallel_turns,
+            "prefetch_context": self.prefetch_context,
+            "pipeline_stages": self.pipeline_stages,
+            "stage_concurrency": self.stage_concurrency,
+            "stream_results": self.stream_results,
+            "session_scoped_keys": self.session_scoped_keys,
+            "max_concurrent_meetings": self.max_concurrent_meetings,
+            "http_pool_size": self.http_pool_size,
             "voting_threshold": self.voting_threshold,
+            "batch_voting": self.batch_voting,
+            "voting_method": self.voting_method,
+            "voting_role_weights": self.voting_role_weights,
             "log_level": self.log_level,
             "log_to_file": self.log_to_file,
             "api_host": self.api_host,
             "api_port": self.api_port,
+            "server_queue_size": self.server_queue_size,
+            "server_client_timeout": self.server_client_timeout,
             "debug": self.debug
         }
 
@@ -6,11 +6,12 @@
 """
 
 import logging
-import json
-import re
 from typing import Dict, List, Any, Tuple, Optional, Union
 
 from src.models.base import BaseModel
+from src.models.errors import ModelOutputError
+from src.models.router import get_stage_model
+from src.utils.structured_output import KEYWORD_LIST_SCHEMA, generate_structured, keyword_list_object
 from src.core.memory_adapter import MemoryAdapter
 from src.core.global_memory import GlobalMemory
 
@@ -58,6 +59,18 @@ class Agent:
         self.background = kwargs.get("background", "")  # 人物介绍
         self.experience = kwargs.get("experience", "")  # 相关经历/经验
 
+    def _model_for(self, stage: str) -> BaseModel:
+        """
+        获取某阶段使用的模型（配置了阶段路由时按阶段和当前角色选择）
+
+        Args:
+            stage: 阶段名称（见 ModelConfig.STAGES）
+
+        Returns:
+            模型实例
+        """
+        return get_stage_model(self.model, stage, self.current_role)
+
     async def _call_memory_method(self, method_name: str, *args, **kwargs):
         """
         调用记忆方法的辅助函数，处理同步和异步兼容性
@@ -88,54 +101,33 @@ class Agent:
         """
         self.logger.info(f"智能体 {self.name} 正在进行自我介绍")
 
-        from src.config.prompts.template_manager import PromptTemplates
-        base_prompt = PromptTemplates.get_introduction_prompt(self.current_role)
-        base_system_prompt = PromptTemplates.get_system_prompt(self.current_role)
-
-        # 构建拟人化的自我介绍prompt
-        humanized_intro_prompt = f"""
-你是{self.name}，{self.background}
-年龄：{self.age}岁
-经验：{self.experience}
-当前角色：{self.current_role}
-
-你需要进行一个自然、亲切的自我介绍，就像在真实的会议中与大家初次见面一样。
-
-请遵循以下原则：
-1. **自然开场**：用轻松、友好的语气开始，如"大家好！""很高兴见到大家"
-2. **个人化表达**：分享一些个人经历和感受，让介绍更有温度
-3. **口语化风格**：使用自然的口语表达，避免过于正式或机械化
-4. **情感色彩**：表达你对工作的热情、对传统文化的感情等
-5. **互动意识**：表现出对与大家交流的期待
-
-在介绍中可以包含：
-- 思考停顿："嗯...怎么说呢...""让我想想..."
-- 情感表达："我特别喜欢...""让我印象深刻的是..."
-- 生活化细节：具体的工作场景、难忘的经历等
-- 谦逊表达："虽然我...""可能我的经验还不够..."
-
-{base_prompt}
-
-重要提示：
-1. 请以第一人称进行自我介绍，体现你的个性和特色
-2. 展现你的情感、态度和个人魅力
-3. 使用自然的口语化表达，让人感到亲切
-4. 字数控制在250-300字之间
-5. 让介绍既专业又有人情味
-"""
+        from src.config.prompts.base_prompts import BasePrompts
+        from src.config.prompts.template_manager import get_prompt_manager
+
+        prompt_manager = get_prompt_manager()
+        base_prompt = prompt_manager.get_introduction_prompt(self.current_role)
+        base_system_prompt = prompt_manager.get_system_prompt(self.current_role)
+
+        # 拟人化的自我介绍prompt（对同一智能体不变，只编译一次）
+        humanized_intro_prompt = prompt_manager.compile_template(
+            "agent_introduction",
+            BasePrompts.HUMANIZED_INTRODUCTION_TEMPLATE,
+            name=self.name,
+            background=self.background,
+            age=self.age,
+            experience=self.experience,
+            role=self.current_role,
+            base_prompt=base_prompt
+        ).render()
 
         # 增强系统prompt
-        enhanced_system_prompt = f"""{base_system_prompt}
-
-你现在需要进行一个自然、真实的自我介绍，就像在现实生活中与新朋友见面一样。请：
-1. 保持角色的专业性，但要展现人性化的一面
-2. 使用自然的口语化表达，避免机械化的自我介绍
-3. 展现真实的情感和个性特征
-4. 让听众感到你是一个有血有肉的真实人物
-5. 表达出对即将开始的讨论的期待和兴趣
-"""
+        enhanced_system_prompt = prompt_manager.compile_template(
+            "agent_introduction_system",
+            BasePrompts.INTRODUCTION_SYSTEM_TEMPLATE,
+            base_system_prompt=base_system_prompt
+        ).render()
 
-        response = await self.model.generate(humanized_intro_prompt, enhanced_system_prompt)
+        response = await self._model_for("introduce").generate(humanized_intro_prompt, enhanced_system_prompt)
 
         # 确保字数限制
         if len(response) > 600:  # 假设中文平均一个字符2个字节
@@ -181,19 +173,14 @@ class Agent:
         Returns:
             (prompt, system_prompt) 元组
         """
-        from src.config.prompts.template_manager import PromptTemplates
+        from src.config.prompts.base_prompts import BasePrompts
+        from src.config.prompts.template_manager import get_prompt_manager
 
-        # 获取基础prompt和系统prompt
-        base_prompt = PromptTemplates.get_discussion_prompt(self.current_role, topic)
-        base_system_prompt = PromptTemplates.get_system_prompt(self.current_role)
+        prompt_manager = get_prompt_manager()
 
-        # 构建个人背景信息
-        background_info = f"""
-你是{self.name}，{self.background}
-年龄：{self.age}岁
-经验：{self.experience}
-当前角色：{self.current_role}
-"""
+        # 获取基础prompt和系统prompt
+        base_prompt = prompt_manager.get_discussion_prompt(self.current_role, topic)
+        base_system_prompt = prompt_manager.get_system_prompt(self.current_role)
 
         # 构建记忆部分
         memory_section = ""
@@ -211,66 +198,36 @@ class Agent:
 {global_context}
 """
 
-        # 获取角色特有的说话风格
-        role_style = self._get_agent_speaking_style()
-
-        # 构建拟人化对话指导
-        humanized_guidelines = f"""
-你需要扮演一个能自然聊天的对话伙伴，对话需满足以下原则：
-
-1. **记忆连贯性**：记住当前话题及历史对话内容，对之前提到的信息进行关联回应。
-
-2. **自然对话逻辑**：避免机械问答，用"接话-延展-反问"的节奏互动：
-   - 先针对别人说的话进行回应（避免使用"我觉得这个话题真的很有意思"这样的套话）
-   - 然后结合自己的经验延展
-   - 最后可以抛出问题或建议
-
-3. **话题质感塑造**：加入口语化思考过程和情绪反馈，但要符合你的角色特点。
-
-4. **个性化表达**：每个人都有不同的说话方式，避免使用相同的开场白和表达方式。
-
-{role_style}
-
-5. **信息缺口补充**：当话题信息不足时，主动追问细节，推动对话深入。
-
-重要：避免使用以下同质化表达：
-- "我觉得这个话题真的很有意思！"
-- "嗯，我觉得..."（每个人都这样开头）
-- 完全相同的思考停顿词
-- 千篇一律的回应模式
-"""
-
-        # 构建完整的prompt
-        full_prompt = f"""{background_info}
-
-当前讨论主题：{topic}
-
-{memory_section}
-
-{context_section}
-
-{humanized_guidelines}
-
-{base_prompt}
-
-重要提示：
-1. 请以第一人称回答，体现你的个人经历和专业背景
-2. 如果有其他人的发言，请先针对他们的话进行回应，然后再发表自己的观点
-3. 展现你的情感、态度和个人观点，使用自然的口语化表达
-4. 使用你熟悉的专业术语和表达方式，但要自然融入对话
-5. 加入思考过程、情绪反馈和场景化联想
-6. 字数控制在150-300字之间，保持对话的自然流畅"""
+        # 拟人化对话指导（包含角色特有的说话风格，对同一角色不变）
+        humanized_guidelines = prompt_manager.compile_template(
+            "agent_discussion_guidelines",
+            BasePrompts.HUMANIZED_GUIDELINES_TEMPLATE,
+            role_style=self._get_agent_speaking_style()
+        ).render()
+
+        # 个人背景作为静态前缀在编译时代入，本轮的主题、记忆和上下文在渲染时填入
+        full_prompt = prompt_manager.compile_template(
+            "agent_discussion",
+            BasePrompts.HUMANIZED_DISCUSSION_TEMPLATE,
+            name=self.name,
+            background=self.background,
+            age=self.age,
+            experience=self.experience,
+            role=self.current_role,
+            humanized_guidelines=humanized_guidelines
+        ).render(
+            topic=topic,
+            memory_section=memory_section,
+            context_section=context_section,
+            base_prompt=base_prompt
+        )
 
         # 增强系统prompt
-        enhanced_system_prompt = f"""{base_system_prompt}
-
-你现在需要进行自然的人类对话，请遵循以下原则：
-1. 保持角色的一致性和个性特征
-2. 使用自然的口语化表达，避免机械化回答
-3. 展现真实的思考过程和情感反应
-4. 对其他人的发言进行有意义的回应和互动
-5. 结合个人经历和专业背景提供独特见解
-"""
+        enhanced_system_prompt = prompt_manager.compile_template(
+            "agent_discussion_system",
+            BasePrompts.DISCUSSION_SYSTEM_TEMPLATE,
+            base_system_prompt=base_system_prompt
+        ).render()
 
         return full_prompt, enhanced_system_prompt
 
@@ -442,21 +399,44 @@ class Agent:
             topic: 讨论主题
             context: 上下文信息
 
+        Returns:
+            讨论内容
+        """
+        response = await self.compose_discussion(topic, context)
+        await self.record_discussion(topic, response)
+        return response
+
+    async def compose_discussion(
+        self,
+        topic: str,
+        context: str = "",
+        global_context: Optional[str] = None,
+        memories: Optional[List[str]] = None
+    ) -> str:
+        """
+        生成讨论发言（不写入记忆）
+
+        Args:
+            topic: 讨论主题
+            context: 上下文信息
+            global_context: 预先准备的全局上下文，None时从全局记忆读取
+            memories: 预先准备的个人记忆，None时从记忆模块读取
+
         Returns:
             讨论内容
         """
         self.logger.info(f"智能体 {self.name} 正在参与讨论，主题: {topic}")
 
         # 获取全局记忆上下文（会议中其他人的发言）
-        global_context = None
-        if self.global_memory:
+        if global_context is None and self.global_memory:
             global_context = await self.global_memory.get_current_context(
                 requesting_agent_id=self.id,
                 max_context=8
             )
 
         # 获取个人记忆信息
-        memories = await self._call_memory_method("get_relevant_memories", topic)
+        if memories is None:
+            memories = await self.get_relevant_memories(topic)
 
         # 构建拟人化的讨论prompt
         prompt, system_prompt = self._build_humanized_discussion_prompt(
@@ -466,8 +446,31 @@ class Agent:
             memories=memories
         )
 
-        response = await self.model.generate(prompt, system_prompt)
+        return await self._model_for("discuss").generate(prompt, system_prompt)
+
+    async def get_relevant_memories(self, topic: str) -> List[str]:
+        """
+        获取与主题相关的个人记忆（可在发言前预取）
+
+        Args:
+            topic: 讨论主题
+
+        Returns:
+            个人记忆列表
+        """
+        return await self._call_memory_method("get_relevant_memories", topic)
+
+    async def record_discussion(self, topic: str, response: str) -> Optional[str]:
+        """
+        将讨论发言写入个人记忆和全局记忆
 
+        Args:
+            topic: 讨论主题
+            response: 讨论内容
+
+        Returns:
+            全局记忆中的发言ID（未启用全局记忆时为None）
+        """
         # 将讨论内容存入个人记忆
         await self._call_memory_method(
             "add_memory",
@@ -481,7 +484,7 @@ class Agent:
 
         # 将讨论内容记录到全局记忆
         if self.global_memory:
-            await self.global_memory.record_speech(
+            return await self.global_memory.record_speech(
                 agent_id=self.id,
                 agent_name=self.name,
                 speech_type="discussion",
@@ -492,8 +495,7 @@ class Agent:
                     "topic": topic
                 }
             )
-
-        return response
+        return None
 
     async def extract_keywords(self, content: str, topic: str) -> List[str]:
         """
@@ -518,37 +520,20 @@ class Agent:
         )
         system_prompt = PromptTemplates.get_system_prompt(self.current_role)
 
-        response = await self.model.generate(prompt, system_prompt)
-
-        # 解析关键词
+        # 结构化输出：支持的提供商使用JSON模式，格式无效时只发送短修复提示
         try:
-            # 尝试直接解析JSON
-            keywords = json.loads(response)
-        except:
-            # 尝试提取<key_words>标签内的内容
-            key_words_match = re.search(r'<key_words>(.*?)</key_words>', response, re.DOTALL)
-            if key_words_match:
-                keywords_str = key_words_match.group(1)
-                keywords = [k.strip().strip('"\'') for k in keywords_str.split(',')]
-            else:
-                # 如果解析失败，尝试提取方括号内的内容
-                match = re.search(r'\[(.*?)\]', response, re.DOTALL)
-                if match:
-                    # 分割并清理关键词
-                    keywords_str = match.group(1)
-                    keywords = [k.strip().strip('"\'') for k in keywords_str.split(',')]
-                else:
-                    # 如果仍然失败，使用简单的分行提取
-                    keywords = [line.strip().strip('"-,') for line in response.split('\n')
-                               if line.strip() and not line.strip().startswith(('[', ']'))]
-
-        # 确保关键词是列表类型
-        if not isinstance(keywords, list):
+            result = await generate_structured(
+                self._model_for("extract_keywords"),
+                prompt,
+                system_prompt,
+                KEYWORD_LIST_SCHEMA,
+                coerce=keyword_list_object
+            )
+            keywords = [kw.strip() for kw in result["keywords"]]
+        except ModelOutputError as e:
+            self.logger.error(f"智能体 {self.name} 的关键词输出格式无效: {str(e)}")
             keywords = []
 
-        # 清理空关键词
-        keywords = [kw.strip() for kw in keywords if kw.strip()]
-
         # 记录实际提取的关键词数量
         if len(keywords) == 0:
             self.logger.warning(f"智能体 {self.name} 未能提取到任何关键词")
@@ -632,8 +617,9 @@ class Agent:
             return default_story, default_keywords
         
         # 检查模型是否支持图像
-        if not self.model.supports_vision():
-            return f"当前模型 {self.model.model_name} 不支持图像处理，无法基于图片讲故事。", ["无法处理图像"]
+        story_model = self._model_for("tell_story")
+        if not story_model.supports_vision():
+            return f"当前模型 {story_model.model_name} 不支持图像处理，无法基于图片讲故事。", ["无法处理图像"]
         
         from src.config.prompts.template_manager import PromptTemplates
         prompt = PromptTemplates.get_image_story_prompt(self.current_role)
@@ -644,7 +630,7 @@ class Agent:
         
         # 生成故事
         try:
-            story = await self.model.generate_with_image(prompt, system_prompt, image_path)
+            story = await story_model.generate_with_image(prompt, system_prompt, image_path)
         except Exception as e:
             self.logger.error(f"基于图像生成故事失败: {str(e)}")
             
@@ -657,10 +643,9 @@ class Agent:
                 
                 请创作一个关于设计灵感的故事，可以包括传统工艺、文化元素、色彩搭配、材质运用等方面。
                 """
-                story = await self.model.generate(fallback_prompt, system_prompt)
+                story = await story_model.generate(fallback_prompt, system_prompt)
             except Exception as nested_e:
                 self.logger.error(f"备用故事生成也失败: {str(nested_e)}")
-                story = f"生成失败: {str(e)}"
                 
                 # 使用预设的默认故事和关键词
                 default_story = f"作为{self.name}，即使无法看到图像，我也能感受到设计的灵感。在传统与现代的交融中，我看到了匠心独具的可能性，看到了文化传承与创新表达的美丽碰撞。"
@@ -689,8 +674,14 @@ class Agent:
                 role=self.current_role
             )
             
-            response = await self.model.generate(extraction_prompt, "")
-            keywords = self._parse_keywords_from_response(response)
+            result = await generate_structured(
+                self._model_for("extract_keywords"),
+                extraction_prompt,
+                "",
+                KEYWORD_LIST_SCHEMA,
+                coerce=keyword_list_object
+            )
+            keywords = list(dict.fromkeys(kw.strip() for kw in result["keywords"]))
             
             if not keywords:  # 如果提取失败，使用预设关键词
                 keywords = ["设计灵感", "文化元素", "创新表达", "传统工艺", "艺术形态"]
@@ -711,44 +702,6 @@ class Agent:
             
         return story, keywords
         
-    def _parse_keywords_from_response(self, response: str) -> List[str]:
-        """
-        从模型响应中解析关键词
-        
-        Args:
-            response: 模型返回的文本
-            
-        Returns:
-            关键词列表
-        """
-        # 如果响应为空，返回空列表
-        if not response:
-            return []
-            
-        # 尝试多种关键词提取方式
-        keywords = []
-        
-        # 尝试方式1: 查找"关键词:"后面的内容
-        keyword_match = re.search(r"关键词[:：](.*?)(?:\n|$)", response)
-        if keyword_match:
-            keywords_text = keyword_match.group(1).strip()
-            keywords = [k.strip() for k in re.split(r"[,，、]", keywords_text) if k.strip()]
-            
-        # 尝试方式2: 查找整个文本中的列表项(数字或符号开头)
-        if not keywords:
-            list_items = re.findall(r"(?:^|\n)[\d\.\-\*]+(.*?)(?:\n|$)", response)
-            keywords = [k.strip() for k in list_items if k.strip()]
-            
-        # 尝试方式3: 直接按逗号分割
-        if not keywords:
-            keywords = [k.strip() for k in re.split(r"[,，、]", response) if k.strip()]
-            
-        # 如果还是没有关键词，返回预设值
-        if not keywords:
-            keywords = ["设计元素", "创意表达", "文化传承", "艺术灵感", "传统工艺"]
-            
-        return keywords
-
     async def switch_role(self, new_role: str, topic: str) -> str:
         """
         转换角色 - 反思式角色转换
@@ -789,7 +742,7 @@ class Agent:
         )
 
         # 生成角色转换后的反思和新视角发言
-        response = await self.model.generate(prompt, system_prompt)
+        response = await self._model_for("switch_role").generate(prompt, system_prompt)
 
         # 将角色转换记录存入记忆
         await self._call_memory_method(
@@ -843,7 +796,7 @@ class Agent:
         system_prompt = PromptTemplates.get_system_prompt(self.current_role)
 
         # 生成设计卡牌
-        design_card = await self.model.generate(prompt, system_prompt)
+        design_card = await self._model_for("design_card").generate(prompt, system_prompt)
 
         # 将设计卡牌存入记忆
         await self._call_memory_method(
@@ -876,33 +829,27 @@ class Agent:
         if len(candidate_keywords) <= max_votes:
             return candidate_keywords
 
-        from src.config.prompts.template_manager import PromptTemplates
-
-        # 构建投票提示词
-        prompt = f"""
-        作为一名{self.current_role}，请根据以下讨论内容和你的专业判断，从候选关键词中选择最重要的{max_votes}个关键词进行投票。
-
-        讨论内容：
-        {discussion_content}
-
-        候选关键词：
-        {', '.join(candidate_keywords)}
+        from src.config.prompts.base_prompts import BasePrompts
+        from src.config.prompts.template_manager import get_prompt_manager
 
-        请根据以下标准进行选择：
-        1. 与你的专业领域（{self.current_role}）最相关的关键词
-        2. 在讨论中被重点提及或强调的关键词
-        3. 对剪纸文创产品设计最有价值的关键词
-        4. 能体现传统文化与现代设计结合的关键词
+        prompt_manager = get_prompt_manager()
 
-        请只返回选择的关键词，用逗号分隔，不要包含其他内容。
-        例如：关键词1, 关键词2, 关键词3
-        """
+        # 构建投票提示词（评选标准在前作为静态前缀，讨论内容和候选关键词在后）
+        prompt = prompt_manager.compile_template(
+            "agent_vote",
+            BasePrompts.VOTING_TEMPLATE,
+            role=self.current_role,
+            max_votes=max_votes
+        ).render(
+            discussion_content=discussion_content,
+            candidates=", ".join(candidate_keywords)
+        )
 
-        system_prompt = PromptTemplates.get_system_prompt(self.current_role)
+        system_prompt = prompt_manager.get_system_prompt(self.current_role)
 
         try:
             # 调用AI模型进行智能选择
-            response = await self.model.generate(prompt, system_prompt)
+            response = await self._model_for("intelligent_vote").generate(prompt, system_prompt)
 
             # 解析选择的关键词
             selected_keywords = [kw.strip() for kw in response.split(',') if kw.strip()]
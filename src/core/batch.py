@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量运行模块 - 从JSONL任务文件非交互地运行多场会议，每场会议结束后立即写出JSON结果
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.runtime import MeetingRuntime
+
+logger = logging.getLogger("batch")
+
+# 任务文件字段 -> MeetingRuntime.run_meeting参数
+JOB_FIELDS = {
+    "id": "meeting_id",
+    "topic": "topic",
+    "image": "image_path",
+    "image_path": "image_path",
+    "agent_counts": "agent_counts",
+    "final_keywords": "final_keywords",
+    "design_prompt": "design_prompt",
+    "role_switch": "role_switch"
+}
+
+
+def load_jobs(jobs_path: str) -> List[Dict[str, Any]]:
+    """
+    读取JSONL任务文件（每行一个会议，空行和#开头的行被忽略）
+
+    Args:
+        jobs_path: 任务文件路径
+
+    Returns:
+        run_meeting的参数列表
+
+    Raises:
+        ValueError: 任务格式错误
+    """
+    jobs = []
+    with open(jobs_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            try:
+                spec = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"第 {line_number} 行不是合法的JSON: {e}")
+
+            if not isinstance(spec, dict) or not str(spec.get("topic", "")).strip():
+                raise ValueError(f"第 {line_number} 行缺少会议主题(topic)")
+
+            unknown = set(spec) - set(JOB_FIELDS)
+            if unknown:
+                logger.warning(f"第 {line_number} 行包含未知字段，已忽略: {', '.join(sorted(unknown))}")
+
+            job = {JOB_FIELDS[key]: value for key, value in spec.items() if key in JOB_FIELDS}
+            job.setdefault("meeting_id", f"job{line_number}")
+            jobs.append(job)
+
+    return jobs
+
+
+async def run_batch(
+    settings,
+    jobs: List[Dict[str, Any]],
+    output_path: str,
+    concurrency: Optional[int] = None,
+    model_factory: Optional[Callable[[Any], Any]] = None,
+    include_output: bool = False
+) -> Dict[str, Any]:
+    """
+    并发运行批量会议，按完成顺序逐行写出结果
+
+    Args:
+        settings: 全局设置
+        jobs: 会议参数列表（load_jobs的返回值）
+        output_path: 结果文件路径（JSONL，每场会议一行）
+        concurrency: 同时进行的最大会议数，None时使用设置中的值
+        model_factory: 模型工厂函数，None时使用settings.get_model_instance
+        include_output: 结果中是否包含会议的完整文本输出
+
+    Returns:
+        批量运行汇总
+    """
+    start_time = time.time()
+    succeeded = 0
+
+    async with MeetingRuntime(settings, concurrency, model_factory) as runtime:
+        with open(output_path, "w", encoding="utf-8") as output_file:
+            tasks = [asyncio.ensure_future(runtime.run_meeting(**job)) for job in jobs]
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    result = await next_result
+                    if not include_output:
+                        result.pop("output", None)
+                    if result.get("success"):
+                        succeeded += 1
+
+                    output_file.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                    output_file.flush()
+                    logger.info(
+                        f"会议 {result['meeting_id']} 完成 "
+                        f"({'成功' if result.get('success') else '失败'}，{result.get('duration', 0)} 秒)"
+                    )
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        summary = {
+            "jobs": len(jobs),
+            "succeeded": succeeded,
+            "failed": len(jobs) - succeeded,
+            "concurrency": runtime.max_concurrent_meetings,
+            "duration": round(time.time() - start_time, 3),
+            "output_path": output_path,
+            "model_usage": runtime.get_stats()["model_usage"]
+        }
+
+    logger.info(f"批量运行完成: {summary}")
+    return summary
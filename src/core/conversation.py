@@ -5,23 +5,53 @@
 对话管理模块
 """
 
+import asyncio
+import functools
 import logging
 import random
 import re
 import json
 import uuid
-from typing import Dict, List, Any, Tuple, Optional
+from collections import Counter
+from typing import Callable, Dict, List, Any, Tuple, Optional
 
 from src.core.agent import Agent
 from src.core.global_memory import GlobalMemory
-from src.core.meeting_cleaner import clean_redis_for_new_meeting, get_redis_status
+from src.core.scheduler import iter_completed
+from src.core.meeting_cleaner import clean_redis_for_new_meeting, clean_redis_namespace, get_redis_status
+from src.models.errors import ModelError
+from src.utils.keywords import KeywordClusterer
 from src.utils.stream import StreamHandler
+from src.utils.summarizer import DiscussionDigest, ExtractiveSummarizer
+
+# 预取的会议时间线条数（与Agent.compose_discussion默认读取的条数一致）
+PREFETCH_TIMELINE_LIMIT = 8
+
+# 模型调用失败时代替发言的占位内容
+FAILED_RESPONSE = "(由于技术原因无法提供有效回应，将继续讨论)"
+
+
+class _NullSpinner:
+    """不输出任何内容的加载动画（会议输出不是终端时使用）"""
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
 
 
 class ConversationManager:
     """对话管理器"""
 
-    def __init__(self, god_view, settings, clean_redis_on_start: Optional[bool] = None):
+    def __init__(
+        self,
+        god_view,
+        settings,
+        clean_redis_on_start: Optional[bool] = None,
+        output_func: Optional[Callable[..., None]] = None,
+        key_namespace: Optional[str] = None
+    ):
         """
         初始化对话管理器
 
@@ -29,6 +59,8 @@ class ConversationManager:
             god_view: 上帝视角
             settings: 全局设置
             clean_redis_on_start: 是否在启动时清理Redis数据（None时使用配置文件设置）
+            output_func: 会议输出函数（与print签名兼容），None时输出到终端
+            key_namespace: Redis键命名空间，None时按配置决定是否按会话隔离
         """
         self.god_view = god_view
         self.settings = settings
@@ -37,10 +69,20 @@ class ConversationManager:
         self.stage = "init"
         self.discussion_history = []
         self.voted_keywords = []
+        self.keyword_clusters: List[Dict[str, Any]] = []  # 投票候选关键词及其写法和提出者
+        self.keyword_frequency: Counter = Counter()  # 关键词 -> 提出该关键词的智能体数（随提取结果实时更新）
+        self.vote_tally = None  # 当前投票的计票器（随选票到达实时更新）
         self.final_keywords = []
-        self.stream_handler = StreamHandler(enable_ui_enhancement=True)
+        self.stream_handler = StreamHandler(output_func=output_func, enable_ui_enhancement=True)
+        # 输出不是终端时（如多场会议共用一个进程）不显示加载动画
+        self.show_spinners = output_func is None
         self.logger = logging.getLogger("conversation")
 
+        # 滚动讨论摘要（本地抽取式，不额外调用模型）
+        self.discussion_digest = DiscussionDigest(
+            ExtractiveSummarizer(max_sentences=getattr(settings, 'summary_sentences_per_turn', 6))
+        )
+
         # 使用配置文件设置或传入参数
         self.clean_redis_on_start = (
             clean_redis_on_start if clean_redis_on_start is not None
@@ -49,9 +91,25 @@ class ConversationManager:
 
         # 创建全局记忆实例
         self.session_id = str(uuid.uuid4())
-        self.global_memory = GlobalMemory(self.session_id, storage_type="auto")
+        if key_namespace is None and getattr(settings, 'session_scoped_keys', False):
+            key_namespace = f"ns:{self.session_id}"
+        self.key_namespace = key_namespace
+        self.global_memory = GlobalMemory(self.session_id, storage_type="auto", namespace=key_namespace)
         self.logger.info(f"创建会议会话: {self.session_id}")
 
+        # 并行发言模式：同一轮内智能体同时发言
+        self.parallel_turns = getattr(settings, 'parallel_turns', False)
+
+        # 预取模式：当前发言人生成期间预取下一位发言人的记忆和上下文
+        self.prefetch_context = getattr(settings, 'prefetch_context', True)
+
+        # 流水线模式：按依赖关系并发执行独立的阶段任务
+        self.pipeline_stages = getattr(settings, 'pipeline_stages', False)
+        self.stage_concurrency = getattr(settings, 'stage_concurrency', 4)
+
+        # 流式结果模式：各智能体的关键词提取、投票和图像故事并发执行，按完成顺序处理结果
+        self.stream_results = getattr(settings, 'stream_results', False)
+
         # 标记是否已清理Redis
         self._redis_cleaned = False
 
@@ -68,6 +126,10 @@ class ConversationManager:
         if not self.clean_redis_on_start or self._redis_cleaned:
             return {"skipped": True, "reason": "清理已禁用或已执行"}
 
+        if self.key_namespace:
+            # 按会话隔离时不能全局清理（会删除同一Redis上其他会议的数据）
+            return {"skipped": True, "reason": "会议使用独立命名空间，无需全局清理"}
+
         try:
             self.logger.info("🧹 为新会议清理Redis数据...")
             await self.stream_handler.stream_output("🧹 正在为新会议清理数据...\n")
@@ -106,6 +168,33 @@ class ConversationManager:
             await self.stream_handler.stream_output("❌ 数据清理异常，但不影响会议进行\n\n")
             return {"success": False, "error": str(e)}
 
+    async def cleanup_session(self) -> Dict[str, Any]:
+        """
+        清理本场会议命名空间下的全部数据（会议结束后调用）
+
+        Returns:
+            清理结果
+        """
+        if not self.key_namespace:
+            return {"skipped": True, "reason": "会议未使用独立命名空间"}
+        return await clean_redis_namespace(self.key_namespace)
+
+    def _create_spinner(self, message: str, style: str = "spinner"):
+        """
+        创建加载动画
+
+        Args:
+            message: 提示信息
+            style: 动画样式
+
+        Returns:
+            加载动画对象（支持start/stop）
+        """
+        if not self.show_spinners:
+            return _NullSpinner()
+        from src.ui_enhanced.animations import LoadingSpinner
+        return LoadingSpinner(message, style)
+
     async def add_agent(self, agent: Agent) -> None:
         """
         添加智能体
@@ -116,6 +205,10 @@ class ConversationManager:
         # 设置agent的全局记忆
         agent.global_memory = self.global_memory
 
+        # 按会话隔离时，智能体的个人记忆也使用本场会议的命名空间
+        if self.key_namespace and hasattr(agent.memory, "set_namespace"):
+            agent.memory.set_namespace(self.key_namespace)
+
         # 添加到agents字典
         self.agents[agent.id] = agent
 
@@ -179,49 +272,48 @@ class ConversationManager:
         self.topic = topic
         self.stage = "introduction"
         self.discussion_history = []
+        self.discussion_digest.clear()
+        self.keyword_frequency.clear()
+        self.vote_tally = None
 
         # 设置图像路径（如果提供）
         self.reference_image = image_path
         self.image_keywords = []
 
-        # 智能体自我介绍（先进行自我介绍）
-        await self.global_memory.update_stage("introduction")
-        await self.introduce_agents()
+        if self.pipeline_stages:
+            # 流水线模式：按依赖关系并发执行各阶段任务
+            await self._run_pipelined_stages(image_path)
+        else:
+            # 智能体自我介绍（先进行自我介绍）
+            await self.global_memory.update_stage("introduction")
+            await self.introduce_agents()
 
-        # 如果提供了图片，在自我介绍后处理图片
-        if image_path:
-            self.logger.info(f"使用参考图片: {image_path}")
-            await self.stream_handler.stream_output(f"\n===== 使用参考图片 =====\n")
-            await self.stream_handler.stream_output(f"图片路径: {image_path}\n\n")
+            # 如果提供了图片，在自我介绍后处理图片
+            if image_path:
+                await self._show_reference_image_header(image_path)
 
-            try:
-                # 提取图片关键词
-                self.image_keywords = await self.process_image(image_path)
-
-                # 将图片关键词添加到讨论历史
-                self.discussion_history.append({
-                    "stage": "image_reference",
-                    "image_path": image_path,
-                    "keywords": self.image_keywords
-                })
-            except Exception as e:
-                self.logger.error(f"图像处理失败: {str(e)}")
-                await self.stream_handler.stream_output(f"\n图像处理失败: {str(e)}\n但仍将继续讨论\n\n")
+                try:
+                    # 提取图片关键词
+                    self.image_keywords = await self.process_image(image_path)
+                    self._record_image_reference(image_path)
+                except Exception as e:
+                    self.logger.error(f"图像处理失败: {str(e)}")
+                    await self.stream_handler.stream_output(f"\n图像处理失败: {str(e)}\n但仍将继续讨论\n\n")
 
-        # 开始讨论
-        self.stage = "discussion"
-        await self.global_memory.update_stage("discussion")
-        await self.start_discussion()
+            # 开始讨论
+            self.stage = "discussion"
+            await self.global_memory.update_stage("discussion")
+            await self.start_discussion()
 
-        # 提取关键词
-        self.stage = "keywords"
-        await self.global_memory.update_stage("keywords")
-        await self.extract_keywords()
+            # 提取关键词
+            self.stage = "keywords"
+            await self.global_memory.update_stage("keywords")
+            await self.extract_keywords()
 
-        # 投票
-        self.stage = "voting"
-        await self.global_memory.update_stage("voting")
-        await self.vote_keywords()
+            # 投票
+            self.stage = "voting"
+            await self.global_memory.update_stage("voting")
+            await self.vote_keywords()
 
         # 等待上帝输入关键词
         self.stage = "waiting"
@@ -229,6 +321,131 @@ class ConversationManager:
             "\n请输入最终关键词（用逗号分隔），或直接按回车使用投票结果:\n"
         )
 
+    async def _run_pipelined_stages(self, image_path: Optional[str] = None) -> None:
+        """
+        以流水线方式执行自我介绍、图像故事、讨论、关键词提取和投票
+
+        图像故事不依赖自我介绍，各智能体的关键词提取互不依赖，
+        这些任务在并发上限内同时执行；输出仍按串行模式的顺序展示。
+
+        Args:
+            image_path: 可选的图片路径
+        """
+        from src.core.scheduler import StageScheduler
+
+        scheduler = StageScheduler(max_concurrency=self.stage_concurrency)
+        agents = list(self.agents.values())
+        shown_groups = set()
+
+        await self.global_memory.update_stage("introduction")
+
+        # 自我介绍（互不依赖）
+        introduction_tasks = []
+        for agent in agents:
+            name = f"introduction:{agent.id}"
+            scheduler.add_task(name, functools.partial(self._introduce_safely, agent), group="introduction")
+            introduction_tasks.append(name)
+
+        # 图像故事（不依赖自我介绍）
+        story_tasks = []
+        if image_path:
+            self.reference_image = image_path
+            for agent in agents:
+                name = f"image_story:{agent.id}"
+                scheduler.add_task(
+                    name,
+                    functools.partial(self._tell_image_story_safely, agent, image_path),
+                    group="image_story"
+                )
+                story_tasks.append(name)
+
+            async def select_image_keywords() -> List[str]:
+                all_keywords = []
+                for name in story_tasks:
+                    result = scheduler.get_task(name).result
+                    if result:
+                        all_keywords.extend(result[1])
+                self.image_keywords = self._pick_image_keywords(all_keywords)
+                return self.image_keywords
+
+            scheduler.add_task("image_keywords", select_image_keywords, story_tasks, group="image_keywords")
+
+        # 讨论（依赖全部自我介绍和图像关键词）
+        async def run_discussion() -> None:
+            self.stage = "discussion"
+            await self.global_memory.update_stage("discussion")
+            await self.start_discussion()
+
+        discussion_dependencies = introduction_tasks + (["image_keywords"] if image_path else [])
+        scheduler.add_task("discussion", run_discussion, discussion_dependencies, group="discussion")
+
+        # 关键词提取（各智能体互不依赖）
+        async def enter_keywords_stage() -> str:
+            self.stage = "keywords"
+            await self.global_memory.update_stage("keywords")
+            self.logger.info("提取关键词")
+            return "\n===== 提取关键词 =====\n"
+
+        scheduler.add_task("keywords_stage", enter_keywords_stage, ["discussion"], group="stage_header")
+
+        keyword_tasks = []
+        for agent in agents:
+            name = f"keywords:{agent.id}"
+
+            async def extract(agent: Agent = agent) -> List[str]:
+                return await self._extract_agent_keywords(agent, self._build_keyword_extraction_content())
+
+            scheduler.add_task(name, extract, ["keywords_stage"], group="keywords")
+            keyword_tasks.append(name)
+
+        # 投票（依赖全部关键词）
+        async def run_voting() -> None:
+            self.stage = "voting"
+            await self.global_memory.update_stage("voting")
+            await self.vote_keywords()
+
+        scheduler.add_task("voting", run_voting, keyword_tasks, group="voting")
+
+        async def show_result(task) -> None:
+            agent = self.agents.get(task.name.split(":", 1)[1]) if ":" in task.name else None
+
+            if task.group == "introduction" and "introduction" not in shown_groups:
+                shown_groups.add("introduction")
+                self.logger.info("智能体自我介绍")
+                await self.stream_handler.stream_enhanced_output("", "introduction_header")
+            elif task.group == "image_story" and "image_story" not in shown_groups:
+                shown_groups.add("image_story")
+                await self._show_reference_image_header(image_path)
+                await self._show_image_stage_header(image_path)
+
+            if not task.succeeded:
+                if task.group == "image_story":
+                    await self.stream_handler.stream_output(f"\n【{agent.name}】图像处理失败: {str(task.error)}\n\n")
+                return
+
+            if task.group == "introduction":
+                await self._show_introduction(agent, task.result)
+            elif task.group == "image_story" and task.result:
+                story, keywords = task.result
+                await self._show_image_story(agent, story, keywords)
+            elif task.group == "image_keywords":
+                await self._show_image_keywords(task.result)
+                self._record_image_reference(image_path)
+            elif task.group == "stage_header":
+                await self.stream_handler.stream_output(task.result)
+            elif task.group == "keywords":
+                await self._show_agent_keywords(agent, task.result)
+
+        tasks = await scheduler.run(
+            on_result=show_result,
+            stream_groups=("keywords",) if self.stream_results else ()
+        )
+
+        # 与串行模式一致：关键阶段失败时向上抛出
+        for task in tasks.values():
+            if task.error is not None and task.group != "image_story":
+                raise task.error
+
     async def introduce_agents(self) -> None:
         """智能体自我介绍"""
         self.logger.info("智能体自我介绍")
@@ -241,24 +458,52 @@ class ConversationManager:
             self.stream_handler.set_current_agent(agent.name, agent.type)
 
             # 启动加载动画
-            from src.ui_enhanced.animations import LoadingSpinner
-            spinner = LoadingSpinner(f"{agent.name} 正在准备自我介绍", "spinner")
+            spinner = self._create_spinner(f"{agent.name} 正在准备自我介绍", "spinner")
             spinner.start()
 
             try:
-                introduction = await agent.introduce()
+                introduction = await self._introduce_safely(agent)
             finally:
                 spinner.stop()
 
-            # 使用美化的智能体介绍输出
-            await self.stream_handler.stream_enhanced_output(introduction, "agent_introduction")
+            await self._show_introduction(agent, introduction)
 
-            # 添加到讨论历史
-            self.discussion_history.append({
-                "stage": "introduction",
-                "agent": agent.name,
-                "content": introduction
-            })
+    async def _introduce_safely(self, agent: Agent) -> str:
+        """
+        智能体自我介绍，模型调用失败时返回占位内容（不中断会议）
+
+        Args:
+            agent: 智能体
+
+        Returns:
+            自我介绍内容
+        """
+        try:
+            return await agent.introduce()
+        except ModelError as e:
+            self.logger.error(f"智能体 {agent.name} 自我介绍失败: {str(e)}")
+            return FAILED_RESPONSE
+
+    async def _show_introduction(self, agent: Agent, introduction: str) -> None:
+        """
+        输出自我介绍并加入讨论历史
+
+        Args:
+            agent: 智能体
+            introduction: 自我介绍内容
+        """
+        # 设置当前智能体信息
+        self.stream_handler.set_current_agent(agent.name, agent.type)
+
+        # 使用美化的智能体介绍输出
+        await self.stream_handler.stream_enhanced_output(introduction, "agent_introduction")
+
+        # 添加到讨论历史
+        self.discussion_history.append({
+            "stage": "introduction",
+            "agent": agent.name,
+            "content": introduction
+        })
 
     async def start_discussion(self) -> None:
         """开始讨论（增强图像关联）"""
@@ -313,127 +558,392 @@ class ConversationManager:
                     context += f"\n\n参考图像关键词: {', '.join(self.image_keywords)}\n\n"
                     context += "请在讨论中自然地融入图像中的元素和灵感。"
             else:
-                # 获取上一轮的讨论内容
-                prev_turn_discussions = [
-                    f"{item['agent']}: {item['content']}"
-                    for item in self.discussion_history
-                    if item['stage'] == f"discussion_turn_{turn}"
-                ]
-                context = "\n".join(prev_turn_discussions)
+                # 使用已完成轮次的滚动摘要，避免上下文随轮次膨胀
+                context = f"讨论主题: {self.topic}\n\n之前讨论要点:\n{self.discussion_digest.get_digest()}"
             
-            # 每个智能体发言
-            for agent in agents:
+            if self.parallel_turns:
+                # 并行模式：本轮所有智能体基于同一时间线快照同时发言
+                await self._run_parallel_turn(agents, turn, context)
+            elif self.prefetch_context:
+                # 预取模式：当前发言人生成期间预取下一位发言人的记忆和上下文
+                await self._run_prefetched_turn(agents, turn, context)
+            else:
+                # 每个智能体依次发言
+                for agent in agents:
+                    # 设置当前智能体信息
+                    self.stream_handler.set_current_agent(agent.name, agent.type)
+
+                    # 启动加载动画
+                    spinner = self._create_spinner(f"{agent.name} 正在思考", "spinner")
+                    spinner.start()
+
+                    try:
+                        discussion_prompt = await self._build_turn_prompt(agent, turn, context)
+                        response = await agent.discuss(self.topic, discussion_prompt)
+                    except Exception as e:
+                        self.logger.error(f"智能体 {agent.name} 讨论失败: {str(e)}")
+                        response = FAILED_RESPONSE
+                    finally:
+                        spinner.stop()
+
+                    await self._show_turn_speech(agent, turn, response)
+
+            # 本轮结束后压缩一次，供后续轮次和后续阶段复用
+            self._digest_turn(f"discussion_turn_{turn + 1}", f"第{turn + 1}轮")
+
+    async def _build_turn_prompt(self, agent: Agent, turn: int, context: str) -> str:
+        """
+        构建智能体在某一轮的讨论提示（首轮增强图像关联）
+
+        Args:
+            agent: 智能体
+            turn: 轮次（从0开始）
+            context: 本轮共享上下文
+
+        Returns:
+            讨论提示
+        """
+        discussion_prompt = context
+
+        if turn == 0 and hasattr(self, 'reference_image') and self.reference_image:
+            # 为首轮讨论添加图像关联提示
+            try:
+                # 使用异步方法获取记忆
+                # 只取最新的一条记录，也只渲染这一条
+                image_stories = await agent.memory.get_records_by_type("image_story", limit=1)
+                if image_stories and len(image_stories) > 0:
+                    # 从最新的故事中提取内容
+                    story_text = image_stories[0].text
+                    if story_text:
+                        # 提取前200个字符作为提示
+                        story_preview = story_text[:200]
+                        discussion_prompt += f"\n\n你之前基于图像创作的故事:\n{story_preview}...\n\n请在讨论中自然地融入你从图像获得的灵感和想法。"
+            except Exception as e:
+                self.logger.warning(f"获取图像故事记忆失败: {str(e)}")
+                # 继续执行，即使没有图像故事
+
+        return discussion_prompt
+
+    async def _show_turn_speech(self, agent: Agent, turn: int, response: str) -> None:
+        """
+        输出一条讨论发言并加入讨论历史
+
+        Args:
+            agent: 智能体
+            turn: 轮次（从0开始）
+            response: 发言内容
+        """
+        # 设置当前智能体信息
+        self.stream_handler.set_current_agent(agent.name, agent.type)
+
+        # 使用美化的讨论输出
+        await self.stream_handler.stream_enhanced_output(response, "agent_discussion")
+
+        # 添加到讨论历史
+        self.discussion_history.append({
+            "stage": f"discussion_turn_{turn + 1}",
+            "agent": agent.name,
+            "content": response
+        })
+
+    async def _prefetch_speaker_context(self, agent: Agent, turn: int, context: str) -> Dict[str, Any]:
+        """
+        预取发言人的讨论提示、会议时间线快照和个人记忆
+
+        Args:
+            agent: 智能体
+            turn: 轮次（从0开始）
+            context: 本轮共享上下文
+
+        Returns:
+            {"prompt": 讨论提示, "timeline": 时间线快照, "memories": 个人记忆}
+        """
+        prompt, timeline, memories = await asyncio.gather(
+            self._build_turn_prompt(agent, turn, context),
+            self.global_memory.get_meeting_timeline(limit=PREFETCH_TIMELINE_LIMIT),
+            agent.get_relevant_memories(self.topic)
+        )
+        return {"prompt": prompt, "timeline": timeline, "memories": memories}
+
+    async def _run_prefetched_turn(self, agents: List[Agent], turn: int, context: str) -> None:
+        """
+        按顺序执行一轮讨论，同时预取下一位发言人的上下文
+
+        当前发言人的模型调用进行时，下一位发言人的记忆和时间线已在后台读取；
+        当前发言结束后只需把这条发言增量合并进预取的快照，Redis读取不再位于关键路径上。
+
+        Args:
+            agents: 按发言顺序排列的智能体
+            turn: 轮次（从0开始）
+            context: 本轮共享上下文
+        """
+        if not agents:
+            return
+
+        pending = asyncio.ensure_future(self._prefetch_speaker_context(agents[0], turn, context))
+        # 预取之后完成的发言，需要合并进下一位发言人的快照
+        unseen_speeches: List[Dict[str, Any]] = []
+
+        try:
+            for index, agent in enumerate(agents):
                 # 设置当前智能体信息
                 self.stream_handler.set_current_agent(agent.name, agent.type)
-                
+
                 # 启动加载动画
-                from src.ui_enhanced.animations import LoadingSpinner
-                spinner = LoadingSpinner(f"{agent.name} 正在思考", "spinner")
+                spinner = self._create_spinner(f"{agent.name} 正在思考", "spinner")
                 spinner.start()
-                
+
                 try:
-                    # 增强的讨论提示，确保图像关联
-                    discussion_prompt = context
-                    
-                    if turn == 0 and hasattr(self, 'reference_image') and self.reference_image:
-                        # 为首轮讨论添加图像关联提示
-                        try:
-                            # 使用异步方法获取记忆
-                            image_stories = await agent.memory.get_memories_by_type("image_story")
-                            if image_stories and len(image_stories) > 0:
-                                # 从最新的故事中提取内容
-                                story_text = image_stories[0]
-                                if story_text:
-                                    # 提取前200个字符作为提示
-                                    story_preview = story_text[:200]
-                                    discussion_prompt += f"\n\n你之前基于图像创作的故事:\n{story_preview}...\n\n请在讨论中自然地融入你从图像获得的灵感和想法。"
-                        except Exception as e:
-                            self.logger.warning(f"获取图像故事记忆失败: {str(e)}")
-                            # 继续执行，即使没有图像故事
-                    
-                    response = await agent.discuss(self.topic, discussion_prompt)
-                except Exception as e:
-                    self.logger.error(f"智能体 {agent.name} 讨论失败: {str(e)}")
-                    response = f"(由于技术原因无法提供有效回应，将继续讨论)"
+                    try:
+                        prefetched = await pending
+                    except Exception as e:
+                        self.logger.warning(f"预取智能体 {agent.name} 上下文失败，改为直接读取: {str(e)}")
+                        prefetched = None
+
+                    # 立即开始预取下一位发言人（与当前模型调用并发）
+                    if index + 1 < len(agents):
+                        pending = asyncio.ensure_future(
+                            self._prefetch_speaker_context(agents[index + 1], turn, context)
+                        )
+                    else:
+                        pending = None
+
+                    try:
+                        if prefetched is None:
+                            discussion_prompt = await self._build_turn_prompt(agent, turn, context)
+                            response = await agent.compose_discussion(self.topic, discussion_prompt)
+                        else:
+                            timeline = prefetched["timeline"]
+                            for speech in unseen_speeches:
+                                timeline = GlobalMemory.fold_speech(
+                                    timeline, limit=PREFETCH_TIMELINE_LIMIT, **speech
+                                )
+                            response = await agent.compose_discussion(
+                                self.topic,
+                                prefetched["prompt"],
+                                global_context=self.global_memory.format_context(timeline, agent.id),
+                                memories=prefetched["memories"]
+                            )
+                        speech_id = await agent.record_discussion(self.topic, response)
+
+                        # 下一位发言人的快照在本次发言完成前读取，记下这条发言用于增量合并
+                        unseen_speeches = [{
+                            "speech_id": speech_id,
+                            "agent_id": agent.id,
+                            "agent_name": agent.name,
+                            "speech_type": "discussion",
+                            "content": response,
+                            "stage": "discussion"
+                        }]
+                    except Exception as e:
+                        self.logger.error(f"智能体 {agent.name} 讨论失败: {str(e)}")
+                        response = FAILED_RESPONSE
+                        unseen_speeches = []
                 finally:
                     spinner.stop()
-                
-                # 使用美化的讨论输出
-                await self.stream_handler.stream_enhanced_output(response, "agent_discussion")
-                
-                # 添加到讨论历史
-                self.discussion_history.append({
-                    "stage": f"discussion_turn_{turn + 1}",
-                    "agent": agent.name,
-                    "content": response
-                })
 
-    async def extract_keywords(self) -> None:
-        """提取关键词（增强图像关联）"""
-        self.logger.info("提取关键词")
-        await self.stream_handler.stream_output("\n===== 提取关键词 =====\n")
-        
-        # 获取讨论内容
-        discussion_content = "\n".join([
+                await self._show_turn_speech(agent, turn, response)
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    async def _run_parallel_turn(self, agents: List[Agent], turn: int, context: str) -> None:
+        """
+        并行执行一轮讨论
+
+        所有智能体基于本轮开始时冻结的时间线快照同时生成发言，
+        之后按发言顺序依次输出、写入讨论历史和Redis。
+
+        Args:
+            agents: 按发言顺序排列的智能体
+            turn: 轮次（从0开始）
+            context: 本轮共享上下文
+        """
+        # 冻结本轮开始时的会议时间线
+        snapshot = await self.global_memory.get_meeting_timeline(limit=PREFETCH_TIMELINE_LIMIT)
+
+        async def speak(agent: Agent) -> str:
+            # 每位智能体一行加载动画，生成完成即消失
+            spinner = self._create_spinner(f"{agent.name} 正在思考", "spinner")
+            spinner.start()
+            try:
+                discussion_prompt = await self._build_turn_prompt(agent, turn, context)
+                global_context = self.global_memory.format_context(snapshot, agent.id)
+                return await agent.compose_discussion(
+                    self.topic,
+                    discussion_prompt,
+                    global_context=global_context
+                )
+            finally:
+                spinner.stop()
+
+        results = await asyncio.gather(*(speak(agent) for agent in agents), return_exceptions=True)
+
+        # 按发言顺序记录，保证时间线与串行模式一致
+        for agent, result in zip(agents, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"智能体 {agent.name} 讨论失败: {str(result)}")
+                response = FAILED_RESPONSE
+            else:
+                response = result
+                try:
+                    await agent.record_discussion(self.topic, response)
+                except Exception as e:
+                    self.logger.error(f"记录智能体 {agent.name} 发言失败: {str(e)}")
+
+            await self._show_turn_speech(agent, turn, response)
+
+    def _digest_turn(self, stage: str, label: str, with_role: bool = False) -> str:
+        """
+        将讨论历史中某一阶段的发言压缩进滚动摘要
+
+        Args:
+            stage: 讨论历史中的阶段名
+            label: 摘要中的轮次标签
+            with_role: 发言人是否附带当前角色
+
+        Returns:
+            本轮摘要文本
+        """
+        entries = [
+            (f"{item['agent']} ({item['role']})" if with_role else item['agent'], item['content'])
+            for item in self.discussion_history
+            if item['stage'] == stage
+        ]
+        return self.discussion_digest.add_turn(label, entries)
+
+    def get_discussion_summary(self, labels: Optional[List[str]] = None) -> str:
+        """
+        获取讨论摘要（没有摘要时回退为完整讨论内容）
+
+        Args:
+            labels: 只包含指定的轮次标签
+
+        Returns:
+            讨论摘要文本
+        """
+        digest = self.discussion_digest.get_digest(labels=labels)
+        if digest:
+            return digest
+
+        return "\n".join([
             f"{item['agent']}: {item['content']}"
             for item in self.discussion_history
             if item['stage'].startswith("discussion_turn_")
         ])
+
+    async def extract_keywords(self) -> None:
+        """提取关键词（增强图像关联）"""
+        self.logger.info("提取关键词")
+        await self.stream_handler.stream_output("\n===== 提取关键词 =====\n")
         
-        # 导入颜色支持
-        from src.utils.colors import Colors
-        
-        # 准备图像相关上下文
-        image_context = ""
-        if hasattr(self, 'image_keywords') and self.image_keywords:
-            image_context = f"参考图像关键词: {', '.join(self.image_keywords)}\n\n"
+        # 所有智能体共用同一份提取内容
+        extraction_content = self._build_keyword_extraction_content()
+
+        if self.stream_results:
+            # 并发提取，先完成的智能体先输出
+            async for agent, keywords, _ in iter_completed(
+                self.agents.values(),
+                lambda agent: self._extract_agent_keywords(agent, extraction_content),
+                self.stage_concurrency
+            ):
+                await self._show_agent_keywords(agent, keywords)
+            return
         
         # 每个智能体提取关键词
         for agent in self.agents.values():
+            keywords = await self._extract_agent_keywords(agent, extraction_content)
+            await self._show_agent_keywords(agent, keywords)
+
+    def _build_keyword_extraction_content(self) -> str:
+        """
+        构建关键词提取内容（讨论摘要 + 图像关键词）
+
+        Returns:
+            关键词提取内容
+        """
+        # 获取讨论摘要（每个智能体共用同一份压缩内容）
+        discussion_content = self.get_discussion_summary()
+
+        # 准备图像相关上下文
+        image_keywords = getattr(self, 'image_keywords', None)
+        if image_keywords:
+            image_context = f"参考图像关键词: {', '.join(image_keywords)}\n\n"
+            return f"{self.topic}\n\n{image_context}讨论内容:\n{discussion_content}"
+
+        return discussion_content
+
+    async def _extract_agent_keywords(self, agent: Agent, content: str, show_spinner: bool = True) -> List[str]:
+        """
+        单个智能体提取关键词
+
+        Args:
+            agent: 智能体
+            content: 关键词提取内容
+            show_spinner: 是否显示加载动画
+
+        Returns:
+            关键词列表
+        """
+        spinner = None
+        if show_spinner:
             # 启动加载动画
-            from src.ui_enhanced.animations import LoadingSpinner
-            spinner = LoadingSpinner(f"{agent.name} 正在提取关键词", "dots")
+            spinner = self._create_spinner(f"{agent.name} 正在提取关键词", "dots")
             spinner.start()
-            
-            try:
-                # 构建增强的关键词提取上下文
-                enhanced_context = discussion_content
-                if image_context:
-                    enhanced_prompt = f"{self.topic}\n\n{image_context}讨论内容:\n{discussion_content}"
-                    keywords = await agent.extract_keywords(enhanced_prompt, self.topic)
-                else:
-                    keywords = await agent.extract_keywords(discussion_content, self.topic)
-            except Exception as e:
-                self.logger.error(f"关键词提取失败: {str(e)}")
-                keywords = ["提取失败"]
-            finally:
+
+        try:
+            return await agent.extract_keywords(content, self.topic)
+        except Exception as e:
+            self.logger.error(f"关键词提取失败: {str(e)}")
+            return ["提取失败"]
+        finally:
+            if spinner:
                 spinner.stop()
-            
-            # 使用绿色显示关键词
-            colored_keywords = [Colors.green(kw) for kw in keywords]
-            keywords_str = ", ".join(colored_keywords)
-            
-            await self.stream_handler.stream_output(f"【{agent.name}】提取的关键词:\n{keywords_str}\n\n")
-            
-            # 添加到讨论历史
-            self.discussion_history.append({
-                "stage": "keywords",
-                "agent": agent.name,
-                "keywords": keywords
-            })
+
+    async def _show_agent_keywords(self, agent: Agent, keywords: List[str]) -> None:
+        """
+        输出智能体提取的关键词，加入讨论历史并更新关键词频次
+
+        Args:
+            agent: 智能体
+            keywords: 关键词列表
+        """
+        from src.utils.colors import Colors
+
+        # 使用绿色显示关键词
+        colored_keywords = [Colors.green(kw) for kw in keywords]
+        keywords_str = ", ".join(colored_keywords)
+        
+        await self.stream_handler.stream_output(f"【{agent.name}】提取的关键词:\n{keywords_str}\n\n")
+        
+        # 添加到讨论历史
+        self.discussion_history.append({
+            "stage": "keywords",
+            "agent": agent.name,
+            "keywords": keywords
+        })
+        self.keyword_frequency.update(dict.fromkeys(keywords, 1))
+
+    def _keyword_clusterer(self) -> KeywordClusterer:
+        """创建关键词聚类器（阈值见 KEYWORD_MERGE_THRESHOLD）"""
+        return KeywordClusterer(threshold=getattr(self.settings, 'keyword_merge_threshold', 0.8))
 
     async def vote_keywords(self) -> None:
         """投票关键词"""
         self.logger.info("投票关键词")
         await self.stream_handler.stream_output("\n===== 关键词投票 =====\n")
 
-        # 收集所有关键词
-        all_keywords = []
-        for agent in self.agents.values():
-            all_keywords.extend(agent.keywords)
+        # 合并近似重复的关键词，并记录每个关键词的提出者
+        clusters = self._keyword_clusterer().cluster({agent.id: agent.keywords for agent in self.agents.values()})
+        unique_keywords = [cluster.keyword for cluster in clusters]
+        self.keyword_clusters = [cluster.to_dict() for cluster in clusters]
 
-        # 去重
-        unique_keywords = list(set(all_keywords))
+        merged = [cluster for cluster in clusters if len(cluster.variants) > 1]
+        if merged:
+            merged_str = "\n".join(
+                f"{' / '.join(cluster.variants)} → {cluster.keyword}" for cluster in merged
+            )
+            await self.stream_handler.stream_output(f"合并相近关键词:\n{merged_str}\n\n")
 
         # 如果关键词太少，直接使用
         if len(unique_keywords) <= self.settings.max_keywords:
@@ -441,49 +951,66 @@ class ConversationManager:
             await self.stream_handler.stream_output(f"关键词数量较少，直接使用所有关键词:\n{', '.join(unique_keywords)}\n\n")
             return
 
-        # 使用黑箱投票机制
+        # 按配置的计票方式统计（见 VOTING_METHOD、VOTING_ROLE_WEIGHTS）
         from src.utils.voting import VotingSystem
-        voting_system = VotingSystem(threshold=self.settings.voting_threshold)
+        voting_system = VotingSystem(
+            threshold=self.settings.voting_threshold,
+            method=getattr(self.settings, 'voting_method', 'consensus'),
+            role_weights=getattr(self.settings, 'voting_role_weights', {})
+        )
 
-        # 获取讨论内容作为投票上下文
-        discussion_content = "\n".join([
-            f"{item['agent']}: {item['content']}"
-            for item in self.discussion_history
-            if item['stage'] == "discussion"
-        ])
+        # 获取讨论摘要作为投票上下文
+        discussion_content = self.get_discussion_summary()
 
-        # 每个智能体进行智能投票
-        agent_keywords = {}
-        for agent in self.agents.values():
-            # 启动加载动画
-            from src.ui_enhanced.animations import LoadingSpinner
-            spinner = LoadingSpinner(f"{agent.name} 正在投票", "dots")
-            spinner.start()
+        vote_count = min(len(unique_keywords), 5)
+        agents = list(self.agents.values())
 
+        # 每张选票到达时即计入，最后一票到达后直接取前k名
+        self.vote_tally = tally = voting_system.create_tally(
+            ballot_size=vote_count,
+            support={cluster.keyword: cluster.support for cluster in clusters}
+        )
+
+        # 批量投票：一次请求得到所有智能体的投票，缺失的智能体再单独投票
+        batch_votes: Dict[str, List[str]] = {}
+        if getattr(self.settings, 'batch_voting', False) and len(agents) > 1:
+            spinner = self._create_spinner("全体智能体正在投票", "dots")
+            spinner.start()
             try:
-                # 使用智能投票而不是随机投票
-                vote_count = min(len(unique_keywords), 5)
-                voted = await agent.intelligent_vote(unique_keywords, discussion_content, vote_count)
+                batch_votes = await voting_system.batch_vote(
+                    agents[0].model, agents, unique_keywords, discussion_content, vote_count
+                )
             finally:
                 spinner.stop()
 
-            agent_keywords[agent.id] = voted
+        async def cast_vote(agent: Agent) -> List[str]:
+            voted = batch_votes.get(agent.id)
+            if voted is not None:
+                return voted
 
-            voted_str = ", ".join(voted)
-            await self.stream_handler.stream_output(f"【{agent.name}】投票给:\n{voted_str}\n\n")
+            # 启动加载动画
+            spinner = self._create_spinner(f"{agent.name} 正在投票", "dots")
+            spinner.start()
+            try:
+                # 使用智能投票而不是随机投票
+                return await agent.intelligent_vote(unique_keywords, discussion_content, vote_count)
+            finally:
+                spinner.stop()
 
-            # 添加到讨论历史
-            self.discussion_history.append({
-                "stage": "voting",
-                "agent": agent.name,
-                "voted_keywords": voted
-            })
+        if self.stream_results:
+            # 并发投票，每张选票到达即计入、输出
+            async for agent, voted, error in iter_completed(agents, cast_vote, self.stage_concurrency):
+                if error is not None:
+                    self.logger.error(f"智能体 {agent.name} 投票失败: {str(error)}")
+                    voted = []
+                await self._record_vote(agent, voted, voting_system.voter_weight(agent.current_role))
+        else:
+            # 每个智能体进行智能投票
+            for agent in agents:
+                voted = await cast_vote(agent)
+                await self._record_vote(agent, voted, voting_system.voter_weight(agent.current_role))
 
-        # 使用共识投票
-        voting_results = voting_system.consensus_voting(
-            agent_keywords,
-            max_keywords=self.settings.max_keywords
-        )
+        voting_results = tally.top_k(self.settings.max_keywords)
 
         # 获取最终关键词
         self.voted_keywords = voting_system.get_final_keywords(
@@ -492,10 +1019,40 @@ class ConversationManager:
         )
 
         # 显示投票结果
-        result_str = "\n".join([f"{kw}: {votes} 票" for kw, votes in voting_results])
+        result_str = "\n".join([f"{kw}: {score:g} {tally.unit}" for kw, score in voting_results])
         await self.stream_handler.stream_output(f"投票结果:\n{result_str}\n\n")
         await self.stream_handler.stream_output(f"选出的关键词:\n{', '.join(self.voted_keywords)}\n\n")
 
+    async def _record_vote(self, agent: Agent, voted: List[str], weight: float) -> None:
+        """
+        计入一张选票，输出并写入讨论历史和全局记忆
+
+        Args:
+            agent: 投票的智能体
+            voted: 按重要性排列的投票关键词
+            weight: 选票权重
+        """
+        self.vote_tally.add_ballot(voted, weight)
+
+        voted_str = ", ".join(voted)
+        await self.stream_handler.stream_output(f"【{agent.name}】投票给:\n{voted_str}\n\n")
+
+        # 添加到讨论历史
+        self.discussion_history.append({
+            "stage": "voting",
+            "agent": agent.name,
+            "voted_keywords": voted
+        })
+
+        await self.global_memory.record_speech(
+            agent_id=agent.id,
+            agent_name=agent.name,
+            speech_type="voting",
+            content=voted_str,
+            stage="voting",
+            additional_data={"role": agent.current_role, "voted_keywords": voted}
+        )
+
     async def start_role_switch(self, final_keywords: List[str]) -> None:
         """
         开始角色转换阶段
@@ -538,7 +1095,11 @@ class ConversationManager:
             keywords_str = ", ".join(final_keywords)
 
             # 执行角色转换
-            response = await agent.switch_role(new_role, keywords_str)
+            try:
+                response = await agent.switch_role(new_role, keywords_str)
+            except ModelError as e:
+                self.logger.error(f"智能体 {agent.name} 角色转换发言失败: {str(e)}")
+                response = FAILED_RESPONSE
             await self.stream_handler.stream_output(f"【{agent.name}】({agent.type} → {new_role}):\n{response}\n\n")
 
             # 添加到讨论历史
@@ -604,12 +1165,17 @@ class ConversationManager:
             "content": paper_cutting_scenario
         })
 
+        # 之前讨论的摘要，帮助智能体在新视角下衔接
+        previous_summary = self.discussion_digest.get_digest()
+        summary_section = f"之前讨论要点：\n{previous_summary}\n" if previous_summary else ""
+
         # 每个智能体发言
         for agent in agents:
             # 构建讨论提示词，包含剪纸研讨会场景
             discussion_prompt = f"""
             {paper_cutting_scenario}
 
+            {summary_section}
             请基于以下关键词，从你当前的角色（{agent.current_role}）视角参与剪纸文创产品设计讨论：
             {keywords_str}
 
@@ -623,7 +1189,11 @@ class ConversationManager:
             请确保你的发言体现你作为{agent.current_role}的专业视角和关注点。
             """
 
-            response = await agent.discuss(keywords_str, discussion_prompt)
+            try:
+                response = await agent.discuss(keywords_str, discussion_prompt)
+            except ModelError as e:
+                self.logger.error(f"智能体 {agent.name} 讨论失败: {str(e)}")
+                response = FAILED_RESPONSE
             await self.stream_handler.stream_output(f"【{agent.name}】({agent.current_role}):\n{response}\n\n")
 
             # 添加到讨论历史
@@ -634,6 +1204,8 @@ class ConversationManager:
                 "content": response
             })
 
+        self._digest_turn("discussion_after_switch", "视角转换后讨论", with_role=True)
+
         # 提取关键词
         await self.extract_keywords_after_switch()
 
@@ -642,20 +1214,28 @@ class ConversationManager:
         self.logger.info("角色转换后提取关键词")
         await self.stream_handler.stream_output("\n===== 角色转换后提取关键词 =====\n")
 
-        # 获取讨论内容
-        discussion_content = "\n".join([
-            f"{item['agent']} ({item['role']}): {item['content']}"
-            for item in self.discussion_history
-            if item['stage'] == "discussion_after_switch"
-        ])
+        # 获取视角转换后讨论的摘要
+        discussion_content = self.discussion_digest.get_digest(labels=["视角转换后讨论"])
+        if not discussion_content:
+            discussion_content = "\n".join([
+                f"{item['agent']} ({item['role']}): {item['content']}"
+                for item in self.discussion_history
+                if item['stage'] == "discussion_after_switch"
+            ])
 
         # 导入颜色支持
         from src.utils.colors import Colors
 
-        # 每个智能体提取关键词
+        async def extract(agent: Agent) -> List[str]:
+            try:
+                return await agent.extract_keywords(discussion_content, ", ".join(self.final_keywords))
+            except ModelError as e:
+                self.logger.error(f"智能体 {agent.name} 提取关键词失败: {str(e)}")
+                return []
+
         all_keywords = []
-        for agent in self.agents.values():
-            keywords = await agent.extract_keywords(discussion_content, ", ".join(self.final_keywords))
+
+        async def show(agent: Agent, keywords: List[str]) -> None:
             all_keywords.extend(keywords)
 
             # 使用绿色显示关键词
@@ -672,8 +1252,20 @@ class ConversationManager:
                 "keywords": keywords
             })
 
-        # 去重
-        unique_keywords = list(set(all_keywords))
+        if self.stream_results:
+            # 并发提取，先完成的智能体先输出
+            async for agent, keywords, error in iter_completed(self.agents.values(), extract, self.stage_concurrency):
+                if error is not None:
+                    self.logger.error(f"智能体 {agent.name} 提取关键词失败: {str(error)}")
+                    keywords = []
+                await show(agent, keywords)
+        else:
+            # 每个智能体提取关键词
+            for agent in self.agents.values():
+                await show(agent, await extract(agent))
+
+        # 去重（合并近似重复的关键词）
+        unique_keywords = self._keyword_clusterer().deduplicate(all_keywords)
 
         # 更新阶段
         self.stage = "waiting_for_user_input"
@@ -744,56 +1336,131 @@ class ConversationManager:
         Returns:
             提取的关键词列表
         """
-        self.logger.info(f"处理图片: {image_path}")
-        await self.stream_handler.stream_output("\n===== 处理图片 =====\n")
-        
-        # 存储图像路径供智能体使用
-        self.reference_image = image_path
-        await self.stream_handler.stream_output(f"参考图像路径: {image_path}\n\n")
-        
-        # 导入颜色支持
-        from src.utils.colors import Colors
+        await self._show_image_stage_header(image_path)
         
         # 所有关键词
         all_keywords = []
         
         # 每个智能体基于图像创建故事并提取关键词
         # (在自我介绍之后进行图像故事创作)
+        if self.stream_results:
+            # 并发创作，先完成的故事先输出；失败的智能体不阻塞其他智能体
+            async for agent, result, error in iter_completed(
+                self.agents.values(),
+                lambda agent: self._tell_image_story(agent, image_path),
+                self.stage_concurrency
+            ):
+                if error is not None:
+                    self.logger.error(f"智能体 {agent.name} 图像故事创作失败: {str(error)}")
+                    await self.stream_handler.stream_output(f"\n【{agent.name}】图像处理失败: {str(error)}\n\n")
+                    continue
+                story, keywords = result
+                await self._show_image_story(agent, story, keywords)
+                all_keywords.extend(keywords)
+        else:
+            for agent in self.agents.values():
+                story, keywords = await self._tell_image_story(agent, image_path)
+                await self._show_image_story(agent, story, keywords)
+                all_keywords.extend(keywords)
+            
+        selected_keywords = self._pick_image_keywords(all_keywords)
+        await self._show_image_keywords(selected_keywords)
+        return selected_keywords
+
+    async def _show_reference_image_header(self, image_path: str) -> None:
+        """输出参考图片信息"""
+        self.logger.info(f"使用参考图片: {image_path}")
+        await self.stream_handler.stream_output(f"\n===== 使用参考图片 =====\n")
+        await self.stream_handler.stream_output(f"图片路径: {image_path}\n\n")
+
+    def _record_image_reference(self, image_path: str) -> None:
+        """将图片关键词添加到讨论历史"""
+        self.discussion_history.append({
+            "stage": "image_reference",
+            "image_path": image_path,
+            "keywords": self.image_keywords
+        })
+
+    async def _show_image_stage_header(self, image_path: str) -> None:
+        """输出图片处理阶段标题"""
+        self.logger.info(f"处理图片: {image_path}")
+        await self.stream_handler.stream_output("\n===== 处理图片 =====\n")
+        
+        # 存储图像路径供智能体使用
+        self.reference_image = image_path
+        await self.stream_handler.stream_output(f"参考图像路径: {image_path}\n\n")
         await self.stream_handler.stream_output("===== 基于图像的故事创作 =====\n")
-        for agent in self.agents.values():
+
+    async def _tell_image_story(self, agent: Agent, image_path: str, show_spinner: bool = True) -> Tuple[str, List[str]]:
+        """
+        单个智能体基于图像创作故事
+
+        Args:
+            agent: 智能体
+            image_path: 图片路径
+            show_spinner: 是否显示加载动画
+
+        Returns:
+            故事内容和关键词列表
+        """
+        spinner = None
+        if show_spinner:
             # 启动加载动画
-            from src.ui_enhanced.animations import LoadingSpinner
-            spinner = LoadingSpinner(f"{agent.name} 正在创作故事", "blocks")
+            spinner = self._create_spinner(f"{agent.name} 正在创作故事", "blocks")
             spinner.start()
-            
-            try:
-                # 直接使用tell_story_from_image方法
-                story, keywords = await agent.tell_story_from_image(image_path)
-            finally:
+        
+        try:
+            # 直接使用tell_story_from_image方法
+            return await agent.tell_story_from_image(image_path)
+        finally:
+            if spinner:
                 spinner.stop()
-                
-            # 使用绿色显示关键词
-            colored_keywords = [Colors.green(kw) for kw in keywords]
-            keywords_str = ", ".join(colored_keywords)
-            
-            await self.stream_handler.stream_output(f"【{agent.name}】的故事:\n{story}\n\n关键词: {keywords_str}\n\n")
-            all_keywords.extend(keywords)
-            
-        # 去重
-        unique_keywords = list(set(all_keywords))
+
+    async def _tell_image_story_safely(self, agent: Agent, image_path: str) -> Optional[Tuple[str, List[str]]]:
+        """流水线模式下的图像故事任务：失败时记录日志并返回None，不阻塞后续阶段"""
+        try:
+            return await self._tell_image_story(agent, image_path)
+        except Exception as e:
+            self.logger.error(f"智能体 {agent.name} 图像故事创作失败: {str(e)}")
+            return None
+
+    async def _show_image_story(self, agent: Agent, story: str, keywords: List[str]) -> None:
+        """输出智能体的图像故事和关键词"""
+        from src.utils.colors import Colors
+
+        # 使用绿色显示关键词
+        colored_keywords = [Colors.green(kw) for kw in keywords]
+        keywords_str = ", ".join(colored_keywords)
+        
+        await self.stream_handler.stream_output(f"【{agent.name}】的故事:\n{story}\n\n关键词: {keywords_str}\n\n")
+
+    def _pick_image_keywords(self, all_keywords: List[str]) -> List[str]:
+        """
+        从所有图像故事关键词中选出参考关键词
+
+        Args:
+            all_keywords: 所有智能体的图像关键词
+
+        Returns:
+            选出的关键词
+        """
+        # 去重（合并近似重复的关键词）
+        unique_keywords = self._keyword_clusterer().deduplicate(all_keywords)
         
         # 如果关键词太多，随机选择一部分
         if len(unique_keywords) > self.settings.max_keywords:
-            selected_keywords = random.sample(unique_keywords, self.settings.max_keywords)
-        else:
-            selected_keywords = unique_keywords
-            
+            return random.sample(unique_keywords, self.settings.max_keywords)
+        return unique_keywords
+
+    async def _show_image_keywords(self, selected_keywords: List[str]) -> None:
+        """输出最终选择的图像关键词"""
+        from src.utils.colors import Colors
+
         # 使用绿色显示最终选择的关键词
         colored_selected_keywords = [Colors.green(kw) for kw in selected_keywords]
         selected_keywords_str = ", ".join(colored_selected_keywords)
         
         await self.stream_handler.stream_output(f"\n提取的关键词: {selected_keywords_str}\n")
-        return selected_keywords
 
     async def design_paper_cutting(self, keywords: List[str]) -> Dict[str, str]:
         """
@@ -813,7 +1480,11 @@ class ConversationManager:
 
         # 每个智能体生成设计卡牌
         for agent in self.agents.values():
-            design_card = await agent.generate_design_card(keywords)
+            try:
+                design_card = await agent.generate_design_card(keywords)
+            except ModelError as e:
+                self.logger.error(f"智能体 {agent.name} 生成设计卡牌失败: {str(e)}")
+                continue
             await self.stream_handler.stream_output(f"【{agent.name}】的设计卡牌:\n{design_card}\n\n")
             designs[agent.id] = design_card
 
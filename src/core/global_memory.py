@@ -5,15 +5,22 @@
 全局记忆模块 - 实现AI会议的全局记忆机制
 """
 
+import functools
 import json
 import logging
 import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncIterator, Deque, Dict, List, Any, Optional, Union
 from src.core.memory_adapter import MemoryAdapter
 from src.config.redis_config import get_redis_client, RedisSettings
+from src.core.write_queue import get_write_queue
+from src.utils.codec import get_record_codec
 import redis.asyncio as redis
 
+# stream后端每个智能体本地上下文窗口保留的最大条数
+CONTEXT_WINDOW_SIZE = 50
+
 
 class GlobalMemory:
     """
@@ -26,15 +33,17 @@ class GlobalMemory:
     4. 维护会议的完整时间线
     """
     
-    def __init__(self, session_id: str, storage_type: str = "redis"):
+    def __init__(self, session_id: str, storage_type: str = "redis", namespace: Optional[str] = None):
         """
         初始化全局记忆
 
         Args:
             session_id: 会议会话ID
             storage_type: 存储类型 (只支持redis，保持兼容性)
+            namespace: 键命名空间（同一进程运行多场会议时按会话隔离），None表示不隔离
         """
         self.session_id = session_id
+        self.namespace = namespace
         self.storage_type = storage_type
         self.logger = logging.getLogger(f"global_memory.{session_id}")
         
@@ -46,13 +55,24 @@ class GlobalMemory:
         # Redis配置
         self._redis_settings = RedisSettings()
         self._redis_client: Optional[redis.Redis] = None
+        self._codec = get_record_codec(self._redis_settings)
+        # 写入队列：启用时发言入队后立即返回，由后台任务按批写入
+        self._write_queue = get_write_queue(self._redis_settings)
         
         # 全局记忆Key设计
-        self.global_key_prefix = f"meeting:{session_id}"
+        self.global_key_prefix = f"{namespace}:meeting:{session_id}" if namespace else f"meeting:{session_id}"
         self.timeline_key = f"{self.global_key_prefix}:timeline"
         self.participants_key = f"{self.global_key_prefix}:participants"
         self.stage_key = f"{self.global_key_prefix}:stage"
         self.context_key = f"{self.global_key_prefix}:context"
+        self.stream_key = f"{self.global_key_prefix}:stream"
+        self.cursors_key = f"{self.global_key_prefix}:cursors"
+        
+        # 时间线后端：zset（有序集合+发言哈希）或 stream（Redis Streams）
+        self.use_stream = self._redis_settings.TIMELINE_BACKEND == "stream"
+        # 每个读取者的流游标（最后读取的条目ID）及其本地上下文窗口
+        self._cursors: Dict[str, str] = {}
+        self._context_windows: Dict[str, Deque[Dict[str, Any]]] = {}
     
     async def _get_redis_client(self) -> Optional[redis.Redis]:
         """获取Redis客户端"""
@@ -65,6 +85,16 @@ class GlobalMemory:
                 return None
         return self._redis_client
     
+    async def _wait_for_writes(self, all_writers: bool = False) -> None:
+        """
+        等待写入队列中已入队的写入完成（读取时间线、切换阶段和清空前调用）
+
+        Args:
+            all_writers: 是否等待所有写入方（阶段边界使用）；否则只等待本场会议的发言写入
+        """
+        if self._write_queue is not None:
+            await self._write_queue.flush(None if all_writers else self.global_key_prefix)
+    
     async def add_participant(self, agent_id: str, agent_name: str, agent_role: str) -> None:
         """
         添加会议参与者
@@ -136,7 +166,32 @@ class GlobalMemory:
         
         # 存储到Redis时间线
         redis_client = await self._get_redis_client()
-        if redis_client:
+        if redis_client and self._write_queue is not None:
+            await self._write_queue.submit(
+                redis_client,
+                functools.partial(self._stage_speech, speech_id, speech_record),
+                description=f"发言 {self.global_key_prefix}:{speech_id}",
+                writer=self.global_key_prefix
+            )
+            self.logger.debug(f"发言加入写入队列: {agent_name} - {speech_type}")
+        elif redis_client and self.use_stream:
+            try:
+                # 一次往返：追加到流（按MAXLEN近似裁剪）并刷新过期时间
+                pipe = redis_client.pipeline()
+                pipe.xadd(
+                    self.stream_key,
+                    {"v": self._codec.encode(speech_record)},
+                    maxlen=self._redis_settings.TIMELINE_STREAM_MAXLEN,
+                    approximate=True
+                )
+                pipe.expire(self.stream_key, self._redis_settings.MEMORY_TTL)
+                await pipe.execute()
+                
+                self.logger.debug(f"记录发言: {agent_name} - {speech_type}")
+                
+            except Exception as e:
+                self.logger.error(f"记录发言到Redis失败: {str(e)}")
+        elif redis_client:
             try:
                 # 使用有序集合存储时间线，按时间戳排序
                 await redis_client.zadd(
@@ -144,14 +199,11 @@ class GlobalMemory:
                     {speech_id: timestamp}
                 )
                 
-                # 存储发言详情
+                # 存储发言详情（整条记录编码为单个字段，读取时一次解码）
                 speech_key = f"{self.global_key_prefix}:speech:{speech_id}"
                 await redis_client.hset(
                     speech_key,
-                    mapping={
-                        k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else str(v)
-                        for k, v in speech_record.items()
-                    }
+                    mapping={"v": self._codec.encode(speech_record)}
                 )
                 
                 # 设置过期时间
@@ -164,6 +216,35 @@ class GlobalMemory:
         
         return speech_id
     
+    async def _stage_speech(self, speech_id: str, speech_record: Dict[str, Any], pipe: Any) -> int:
+        """
+        把一条发言的写入命令加入写入队列的管道
+
+        Args:
+            speech_id: 发言记录ID
+            speech_record: 发言记录
+            pipe: 管道
+
+        Returns:
+            加入的命令数
+        """
+        encoded = self._codec.encode(speech_record)
+        if self.use_stream:
+            pipe.xadd(
+                self.stream_key,
+                {"v": encoded},
+                maxlen=self._redis_settings.TIMELINE_STREAM_MAXLEN,
+                approximate=True
+            )
+            pipe.expire(self.stream_key, self._redis_settings.MEMORY_TTL)
+            return 2
+
+        speech_key = f"{self.global_key_prefix}:speech:{speech_id}"
+        pipe.zadd(self.timeline_key, {speech_id: speech_record["timestamp"]})
+        pipe.hset(speech_key, mapping={"v": encoded})
+        pipe.expire(speech_key, self._redis_settings.MEMORY_TTL)
+        return 3
+    
     async def get_meeting_timeline(
         self,
         limit: int = 50,
@@ -186,6 +267,18 @@ class GlobalMemory:
             return []
         
         try:
+            await self._wait_for_writes()
+            
+            if self.use_stream:
+                # 一条命令读取最近的条目（按时间倒序）
+                entries = await redis_client.xrevrange(self.stream_key, count=limit)
+                timeline = [self._decode_entry(entry_id, fields) for entry_id, fields in entries]
+                return [
+                    record for record in timeline
+                    if (not stage_filter or record.get('stage') == stage_filter)
+                    and (not agent_filter or record.get('agent_id') == agent_filter)
+                ]
+            
             # 获取最近的发言ID（按时间戳倒序）
             speech_ids = await redis_client.zrevrange(
                 self.timeline_key, 0, limit - 1
@@ -202,19 +295,7 @@ class GlobalMemory:
                 
                 if speech_data:
                     # 解码数据
-                    decoded_speech = {}
-                    for key, value in speech_data.items():
-                        key_str = key.decode() if isinstance(key, bytes) else key
-                        value_str = value.decode() if isinstance(value, bytes) else value
-                        
-                        # 尝试解析JSON
-                        if key_str in ['additional_data']:
-                            try:
-                                decoded_speech[key_str] = json.loads(value_str)
-                            except:
-                                decoded_speech[key_str] = value_str
-                        else:
-                            decoded_speech[key_str] = value_str
+                    decoded_speech = self._decode_speech(speech_data)
                     
                     # 应用过滤器
                     if stage_filter and decoded_speech.get('stage') != stage_filter:
@@ -230,6 +311,165 @@ class GlobalMemory:
             self.logger.error(f"获取会议时间线失败: {str(e)}")
             return []
     
+    def _decode_speech(self, speech_data: Dict) -> Dict[str, Any]:
+        """
+        解码发言哈希（兼容旧版逐字段存储格式）
+        
+        Args:
+            speech_data: Redis中的发言哈希
+            
+        Returns:
+            发言记录
+        """
+        encoded = speech_data.get(b"v", speech_data.get("v"))
+        if encoded is not None:
+            return self._codec.decode(encoded)
+        
+        decoded_speech = {}
+        for key, value in speech_data.items():
+            key_str = key.decode() if isinstance(key, bytes) else key
+            value_str = value.decode() if isinstance(value, bytes) else value
+            
+            # 尝试解析JSON
+            if key_str in ['additional_data']:
+                try:
+                    decoded_speech[key_str] = json.loads(value_str)
+                except:
+                    decoded_speech[key_str] = value_str
+            else:
+                decoded_speech[key_str] = value_str
+        
+        return decoded_speech
+    
+    def _decode_entry(self, entry_id: Any, fields: Dict) -> Dict[str, Any]:
+        """
+        解码流条目
+        
+        Args:
+            entry_id: 流条目ID
+            fields: 条目字段
+            
+        Returns:
+            发言记录（附带entry_id）
+        """
+        record = self._decode_speech(fields)
+        record["entry_id"] = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+        return record
+    
+    async def read_new_speeches(
+        self,
+        consumer_id: str,
+        count: int = 100,
+        block_ms: Optional[int] = None,
+        persist_cursor: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        读取某个读取者上次读取之后的新发言（按游标增量读取）
+        
+        stream后端使用一条XREAD命令，可阻塞等待新发言；zset后端退化为读取最近的
+        count条后按时间戳过滤，不支持阻塞。
+        
+        Args:
+            consumer_id: 读取者ID（智能体ID，或GodView、Web界面等观察者）
+            count: 单次最多读取的条数
+            block_ms: 没有新发言时阻塞等待的毫秒数（None表示不等待，0表示一直等待）
+            persist_cursor: 是否把游标保存到Redis（跨进程的观察者可据此续读）
+            
+        Returns:
+            按时间正序的新发言记录
+        """
+        redis_client = await self._get_redis_client()
+        if not redis_client:
+            return []
+        
+        try:
+            cursor = self._cursors.get(consumer_id)
+            if cursor is None and persist_cursor:
+                saved = await redis_client.hget(self.cursors_key, consumer_id)
+                cursor = saved.decode() if isinstance(saved, bytes) else saved
+            
+            if self.use_stream:
+                await self._wait_for_writes()
+                response = await redis_client.xread(
+                    {self.stream_key: cursor or "0-0"}, count=count, block=block_ms
+                )
+                records = [
+                    self._decode_entry(entry_id, fields)
+                    for _, entries in (response or [])
+                    for entry_id, fields in entries
+                ]
+                new_cursor = records[-1]["entry_id"] if records else cursor
+            else:
+                after = float(cursor or 0)
+                timeline = await self.get_meeting_timeline(limit=count)
+                records = [record for record in reversed(timeline) if float(record.get('timestamp', 0)) > after]
+                new_cursor = str(records[-1].get('timestamp')) if records else cursor
+            
+            if new_cursor is not None and new_cursor != cursor:
+                self._cursors[consumer_id] = new_cursor
+                if persist_cursor:
+                    await redis_client.hset(self.cursors_key, consumer_id, new_cursor)
+            
+            return records
+            
+        except Exception as e:
+            self.logger.error(f"读取新发言失败: {str(e)}")
+            return []
+    
+    async def follow_speeches(
+        self,
+        consumer_id: str,
+        block_ms: int = 5000,
+        persist_cursor: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        持续跟随会议发言（供GodView、Web界面等观察者使用）
+        
+        Args:
+            consumer_id: 观察者ID
+            block_ms: 每次阻塞等待的毫秒数
+            persist_cursor: 是否把游标保存到Redis
+            
+        Yields:
+            按时间正序的发言记录
+        """
+        while True:
+            records = await self.read_new_speeches(
+                consumer_id, block_ms=block_ms, persist_cursor=persist_cursor
+            )
+            for record in records:
+                yield record
+    
+    async def _get_context_window(self, requesting_agent_id: str, max_context: int) -> List[Dict[str, Any]]:
+        """
+        stream后端：维护每个智能体的本地上下文窗口，只读取上次之后的新条目
+        
+        Args:
+            requesting_agent_id: 请求上下文的智能体ID
+            max_context: 最大上下文条数
+            
+        Returns:
+            按时间倒序的发言记录
+        """
+        # 上下文窗口使用独立的游标，不影响该智能体其他增量读取
+        cursor_id = f"context:{requesting_agent_id}"
+        window = self._context_windows.get(requesting_agent_id)
+        if window is None or window.maxlen < max_context:
+            # 首次读取：用最近的条目初始化窗口，并把游标移到最新条目
+            timeline = await self.get_meeting_timeline(limit=max_context)
+            window = deque(reversed(timeline), maxlen=max(max_context, CONTEXT_WINDOW_SIZE))
+            self._context_windows[requesting_agent_id] = window
+            self._cursors[cursor_id] = timeline[0]["entry_id"] if timeline else "0-0"
+        else:
+            batch_size = window.maxlen
+            while True:
+                records = await self.read_new_speeches(cursor_id, count=batch_size)
+                window.extend(records)
+                if len(records) < batch_size:
+                    break
+        
+        return list(window)[-max_context:][::-1]
+    
     async def get_current_context(self, requesting_agent_id: str, max_context: int = 10) -> str:
         """
         获取当前会议上下文（供智能体参考）
@@ -241,8 +481,66 @@ class GlobalMemory:
         Returns:
             格式化的会议上下文文本
         """
-        timeline = await self.get_meeting_timeline(limit=max_context)
-        
+        if self.use_stream:
+            timeline = await self._get_context_window(requesting_agent_id, max_context)
+        else:
+            timeline = await self.get_meeting_timeline(limit=max_context)
+        return self.format_context(timeline, requesting_agent_id)
+
+    @staticmethod
+    def fold_speech(
+        timeline: List[Dict[str, Any]],
+        speech_id: Optional[str],
+        agent_id: str,
+        agent_name: str,
+        speech_type: str,
+        content: str,
+        stage: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        将一条新发言增量合并进时间线快照（不访问Redis）
+
+        用于预取的快照：快照读取时当前发言人还未完成，发言结束后把它补进去即可，
+        无需重新读取整个时间线。
+
+        Args:
+            timeline: 按时间倒序的发言记录（get_meeting_timeline的返回值）
+            speech_id: 发言ID，快照中已存在时不重复添加
+            agent_id: 智能体ID
+            agent_name: 智能体名称
+            speech_type: 发言类型
+            content: 发言内容
+            stage: 会议阶段
+            limit: 合并后保留的最大条数
+
+        Returns:
+            新的时间线快照
+        """
+        if speech_id and any(record.get('speech_id') == speech_id for record in timeline):
+            return timeline[:limit]
+
+        speech_record = {
+            "speech_id": speech_id or "",
+            "agent_id": agent_id,
+            "agent_name": agent_name,
+            "speech_type": speech_type,
+            "content": content,
+            "stage": stage
+        }
+        return ([speech_record] + list(timeline))[:limit]
+
+    def format_context(self, timeline: List[Dict[str, Any]], requesting_agent_id: str) -> str:
+        """
+        将时间线快照格式化为会议上下文
+
+        Args:
+            timeline: 按时间倒序的发言记录（get_meeting_timeline的返回值）
+            requesting_agent_id: 请求上下文的智能体ID
+
+        Returns:
+            格式化的会议上下文文本
+        """
         if not timeline:
             return "会议刚开始，暂无其他发言。"
         
@@ -326,6 +624,8 @@ class GlobalMemory:
         redis_client = await self._get_redis_client()
         if redis_client:
             try:
+                # 阶段边界的写入屏障：上一阶段的发言和记忆全部写入后再切换
+                await self._wait_for_writes(all_writers=True)
                 await redis_client.hset(
                     self.stage_key,
                     mapping={
@@ -342,6 +642,8 @@ class GlobalMemory:
         redis_client = await self._get_redis_client()
         if redis_client:
             try:
+                await self._wait_for_writes()
+                
                 # 查找所有相关的key
                 pattern = f"{self.global_key_prefix}:*"
                 keys = []
@@ -352,6 +654,8 @@ class GlobalMemory:
                 if keys:
                     await redis_client.delete(*keys)
                 
+                self._cursors.clear()
+                self._context_windows.clear()
                 self.logger.info(f"清空会议会话数据: {len(keys)} 个key")
                 
             except Exception as e:
@@ -11,19 +11,50 @@ import re
 from typing import Dict, List, Any, Optional
 
 from src.models.base import BaseModel
+from src.models.errors import ModelError
+from src.models.router import get_stage_model
+from src.utils.kj_clustering import KJClusterer
+from src.utils.structured_output import generate_structured
+
+# 为本地聚类结果命名时的输出格式
+KJ_NAMING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "core_concept": {"type": "string", "minLength": 1, "maxLength": 30},
+        "names": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "name": {"type": "string", "minLength": 1, "maxLength": 20}
+                },
+                "required": ["id", "name"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["core_concept", "names"],
+    "additionalProperties": False
+}
 
 
 class KJMethod:
     """KJ法关键词分类类"""
 
-    def __init__(self, model: BaseModel):
+    def __init__(self, model: BaseModel, engine: str = "local", name_clusters: bool = False):
         """
         初始化KJ法关键词分类
 
         Args:
             model: AI模型
+            engine: 分类方式，local（本地聚类）或 llm（由模型分类）
+            name_clusters: 本地聚类后是否由模型一次性为各类别命名
         """
         self.model = model
+        self.engine = engine
+        self.name_clusters = name_clusters
+        self.clusterer = KJClusterer()
         self.logger = logging.getLogger("kj_method")
 
     async def categorize_keywords(self, keywords: List[str]) -> Dict[str, Any]:
@@ -44,6 +75,59 @@ class KJMethod:
                 "categories": []
             }
 
+        if self.engine == "llm":
+            return await self._categorize_with_model(keywords)
+
+        result = self.clusterer.categorize(keywords)
+        if self.name_clusters:
+            await self._name_categories(result)
+        return result
+
+    async def _name_categories(self, result: Dict[str, Any]) -> None:
+        """
+        由模型为本地聚类的各类别命名（一次请求，失败时保留本地名称）
+
+        Args:
+            result: 本地聚类结果（原地修改名称和核心概念）
+        """
+        groups = []
+        for i, category in enumerate(result["categories"], 1):
+            groups.append({"id": str(i), "keywords": [kw for sub in category["subcategories"] for kw in sub["keywords"]]})
+            for j, subcategory in enumerate(category["subcategories"], 1):
+                groups.append({"id": f"{i}.{j}", "keywords": subcategory["keywords"]})
+
+        prompt = f"""
+        以下是按KJ法聚好的关键词组（id为"i"的是一级类别，"i.j"是其下的二级类别）：
+
+        {json.dumps(groups, ensure_ascii=False)}
+
+        请为每个组提炼一个简短的上位概念作为名称，并给出概括所有关键词的核心概念。
+        请以JSON格式返回：{{"core_concept": "核心概念", "names": [{{"id": "1", "name": "名称"}}, ...]}}
+        """
+
+        try:
+            naming = await generate_structured(get_stage_model(self.model, "kj_categorize"), prompt, "", KJ_NAMING_SCHEMA)
+        except ModelError as e:
+            self.logger.warning(f"类别命名失败，使用本地名称: {str(e)}")
+            return
+
+        names = {item["id"]: item["name"].strip() for item in naming["names"]}
+        result["core_concept"] = naming["core_concept"].strip()
+        for i, category in enumerate(result["categories"], 1):
+            category["name"] = names.get(str(i), category["name"])
+            for j, subcategory in enumerate(category["subcategories"], 1):
+                subcategory["name"] = names.get(f"{i}.{j}", subcategory["name"])
+
+    async def _categorize_with_model(self, keywords: List[str]) -> Dict[str, Any]:
+        """
+        由模型进行KJ法分类并解析其文本结果
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            分类结果
+        """
         # 准备提示词
         prompt = f"""
         请使用KJ法对以下关键词进行分类和归纳：
@@ -74,7 +158,7 @@ class KJMethod:
         """
 
         # 使用模型进行分类
-        response = await self.model.generate(prompt)
+        response = await get_stage_model(self.model, "kj_categorize").generate(prompt)
 
         # 解析分类结果
         result = self._parse_kj_result(response)
@@ -252,7 +336,7 @@ class KJMethod:
         """
 
         # 使用模型生成合并关键词
-        response = await self.model.generate(prompt)
+        response = await get_stage_model(self.model, "kj_categorize").generate(prompt)
 
         # 解析关键词
         try:
@@ -12,6 +12,7 @@ from typing import List, Dict, Any, Optional
 import redis.asyncio as redis
 
 from src.config.redis_config import get_redis_client
+from src.core.write_queue import flush_write_queue
 
 
 class MeetingCleaner:
@@ -46,6 +47,8 @@ class MeetingCleaner:
         self.logger.info("🧹 开始为新会议清理Redis数据...")
         
         try:
+            # 先等待写入队列中的写入完成，否则清理后才落地的写入会重新创建键
+            await flush_write_queue()
             redis_client = await self._get_redis()
             
             # 备份数据（如果需要）
@@ -269,6 +272,52 @@ class MeetingCleaner:
             self.logger.error(f"❌ 清理临时数据失败: {str(e)}")
             return {"error": str(e)}
 
+    async def clean_namespace(self, namespace: str) -> Dict[str, Any]:
+        """
+        只清理指定命名空间下的数据（不影响同一Redis上的其他会议）
+        
+        Args:
+            namespace: 键命名空间
+            
+        Returns:
+            清理结果统计
+        """
+        start_time = time.time()
+        
+        try:
+            # 先等待写入队列中的写入完成，否则清理后才落地的写入会以7天TTL重新创建键
+            await flush_write_queue()
+            redis_client = await self._get_redis()
+            
+            # 使用SCAN分批删除，避免KEYS阻塞其他会议
+            deleted_count = 0
+            keys_batch = []
+            async for key in redis_client.scan_iter(match=f"{namespace}:*", count=500):
+                keys_batch.append(key)
+                if len(keys_batch) >= 500:
+                    deleted_count += await redis_client.delete(*keys_batch)
+                    keys_batch = []
+            if keys_batch:
+                deleted_count += await redis_client.delete(*keys_batch)
+            
+            self.logger.info(f"🗑️ 清理命名空间 {namespace}: 删除了 {deleted_count} 个键")
+            return {
+                "success": True,
+                "namespace": namespace,
+                "cleaned_keys": deleted_count,
+                "duration": round(time.time() - start_time, 3),
+                "timestamp": time.time()
+            }
+            
+        except Exception as e:
+            self.logger.error(f"❌ 清理命名空间失败: {str(e)}")
+            return {
+                "success": False,
+                "namespace": namespace,
+                "error": str(e),
+                "timestamp": time.time()
+            }
+
     async def get_current_data_status(self) -> Dict[str, Any]:
         """获取当前Redis数据状态"""
         try:
@@ -333,6 +382,23 @@ async def clean_redis_for_new_meeting(
         await cleaner.close()
 
 
+async def clean_redis_namespace(namespace: str) -> Dict[str, Any]:
+    """
+    便捷函数：清理指定命名空间下的会议数据
+    
+    Args:
+        namespace: 键命名空间
+        
+    Returns:
+        清理结果
+    """
+    cleaner = MeetingCleaner()
+    try:
+        return await cleaner.clean_namespace(namespace)
+    finally:
+        await cleaner.close()
+
+
 async def get_redis_status() -> Dict[str, Any]:
     """
     便捷函数：获取Redis状态
@@ -7,8 +7,10 @@
 
 import logging
 from typing import Dict, List, Any, Optional
-from src.core.redis_memory import RedisMemory
+from src.core.redis_memory import MemoryRecord, RedisMemory
 from src.config.redis_config import RedisSettings, get_redis_client
+from src.core.write_queue import get_write_queue
+from src.utils.codec import get_record_codec
 
 
 class MemoryAdapter:
@@ -19,7 +21,8 @@ class MemoryAdapter:
         agent_id: str,
         storage_type: str = "redis",  # 只支持redis
         max_tokens: int = 4000,
-        settings: Any = None
+        settings: Any = None,
+        namespace: Optional[str] = None
     ):
         """
         初始化记忆适配器
@@ -29,8 +32,10 @@ class MemoryAdapter:
             storage_type: 存储类型 (只支持redis，保持兼容性)
             max_tokens: 最大记忆令牌数（保留参数兼容性）
             settings: 全局设置
+            namespace: 键命名空间（按会议会话隔离），None表示不隔离
         """
         self.agent_id = agent_id
+        self.namespace = namespace
         self.storage_type = "redis"  # 强制使用Redis
         self.max_tokens = max_tokens
         self.settings = settings
@@ -39,6 +44,19 @@ class MemoryAdapter:
         self._memory_impl: Optional[RedisMemory] = None
         self._redis_settings: Optional[RedisSettings] = None
     
+    def set_namespace(self, namespace: Optional[str]) -> None:
+        """
+        设置键命名空间（由对话管理器在加入会议时调用）
+
+        Args:
+            namespace: 键命名空间
+        """
+        if namespace == self.namespace:
+            return
+        self.namespace = namespace
+        # 已创建的实现使用旧的key前缀，下次访问时按新命名空间重建
+        self._memory_impl = None
+
     def _get_redis_settings(self) -> RedisSettings:
         """获取Redis设置实例"""
         if self._redis_settings is None:
@@ -57,7 +75,11 @@ class MemoryAdapter:
                 agent_id=self.agent_id,
                 redis_client=redis_client,
                 max_memories=redis_settings.MEMORY_MAX_SIZE,
-                ttl=redis_settings.MEMORY_TTL
+                ttl=redis_settings.MEMORY_TTL,
+                use_script=redis_settings.MEMORY_USE_LUA,
+                codec=get_record_codec(redis_settings),
+                namespace=self.namespace,
+                write_queue=get_write_queue(redis_settings)
             )
             self.logger.info(f"使用Redis存储记忆: {self.agent_id}")
         except Exception as e:
@@ -93,6 +115,20 @@ class MemoryAdapter:
         memory_impl = await self._get_memory_impl()
         return await memory_impl.get_relevant_memories(topic, limit)
     
+    async def get_relevant_records(self, topic: str, limit: int = 5) -> List[MemoryRecord]:
+        """
+        获取相关记忆记录（文本在访问时才渲染）
+
+        Args:
+            topic: 主题
+            limit: 最大返回数量
+
+        Returns:
+            记忆记录列表
+        """
+        memory_impl = await self._get_memory_impl()
+        return await memory_impl.get_relevant_records(topic, limit)
+
     async def get_all_memories(self) -> List[str]:
         """
         获取所有记忆
@@ -116,6 +152,20 @@ class MemoryAdapter:
         memory_impl = await self._get_memory_impl()
         return await memory_impl.get_memories_by_type(memory_type)
     
+    async def get_records_by_type(self, memory_type: str, limit: int = 10) -> List[MemoryRecord]:
+        """
+        获取指定类型的记忆记录（文本在访问时才渲染）
+
+        Args:
+            memory_type: 记忆类型
+            limit: 最大返回数量
+
+        Returns:
+            记忆记录列表（最新的优先）
+        """
+        memory_impl = await self._get_memory_impl()
+        return await memory_impl.get_records_by_type(memory_type, limit)
+
     async def get_conversation_history(self) -> str:
         """
         获取对话历史
@@ -158,6 +208,7 @@ class MemoryAdapter:
         redis_settings = self._get_redis_settings()
         info = {
             "agent_id": self.agent_id,
+            "namespace": self.namespace,
             "storage_type": "redis",
             "redis_enabled": redis_settings.ENABLE_REDIS,
             "max_tokens": self.max_tokens,
@@ -5,19 +5,157 @@
 Redis记忆模块 - 优化版本
 """
 
+import functools
 import json
 import logging
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple, Union
 import redis.asyncio as redis
 
+from src.utils.codec import RecordCodec, get_record_codec
+
+if TYPE_CHECKING:
+    from src.core.write_queue import WriteQueue
+
 # 常量定义
 UUID_LENGTH = 8
 DEFAULT_BATCH_SIZE = 100
 MAX_RETRIES = 3
 
+# 原子写入并裁剪的Lua脚本：一次往返完成写入记忆、更新索引和统计、从总索引裁剪超出上限的旧记忆
+# KEYS[1]=记忆哈希 KEYS[2]=总索引 KEYS[3]=类型索引 KEYS[4]=统计哈希
+# ARGV[1]=记忆ID ARGV[2]=时间戳 ARGV[3]=TTL ARGV[4]=最大记忆数 ARGV[5]=记忆类型
+# ARGV[6..]=记忆哈希的字段/值
+# 脚本只访问KEYS中声明的key（满足集群和严格key声明的脚本规则），返回被裁剪的记忆ID，
+# 由客户端删除这些记忆的哈希和类型索引项
+ADD_AND_TRIM_SCRIPT = """
+local memory_id = ARGV[1]
+local timestamp = ARGV[2]
+local ttl = tonumber(ARGV[3])
+local max_memories = tonumber(ARGV[4])
+local memory_type = ARGV[5]
+
+redis.call('HSET', KEYS[1], unpack(ARGV, 6, #ARGV))
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('ZADD', KEYS[2], timestamp, memory_id)
+redis.call('EXPIRE', KEYS[2], ttl)
+redis.call('ZADD', KEYS[3], timestamp, memory_id)
+redis.call('EXPIRE', KEYS[3], ttl)
+redis.call('HINCRBY', KEYS[4], 'total_memories', 1)
+redis.call('HINCRBY', KEYS[4], 'type_' .. memory_type, 1)
+redis.call('HSET', KEYS[4], 'last_update', timestamp)
+redis.call('EXPIRE', KEYS[4], ttl)
+
+local overflow = redis.call('ZCARD', KEYS[2]) - max_memories
+if overflow <= 0 then
+    return {}
+end
+
+local old_ids = redis.call('ZRANGE', KEYS[2], 0, overflow - 1)
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, overflow - 1)
+return old_ids
+"""
+
+
+class MemoryRecord:
+    """
+    记忆记录 - 轻量只读对象
+
+    类型在读取时即可获得；内容和时间戳在首次访问时才解码，文本表示在首次访问时才渲染，
+    结果都会缓存在对象上。调用方只需要单个字段时不会触发整条记忆的格式化。
+    """
+
+    __slots__ = ("memory_id", "memory_type", "_store", "_raw", "_content", "_timestamp", "_text")
+
+    def __init__(
+        self,
+        store: "RedisMemory",
+        memory_id: str,
+        memory_type: str,
+        raw: Optional[Dict] = None,
+        content: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[float] = None
+    ):
+        """
+        初始化记忆记录
+
+        Args:
+            store: 所属的RedisMemory（负责解码和格式化）
+            memory_id: 记忆ID
+            memory_type: 记忆类型
+            raw: Redis中的原始哈希（content为None时在首次访问时解码）
+            content: 已解码的记忆内容
+            timestamp: 时间戳
+        """
+        self.memory_id = memory_id
+        self.memory_type = memory_type
+        self._store = store
+        self._raw = raw
+        self._content = content
+        self._timestamp = timestamp
+        self._text: Optional[str] = None
+
+    @classmethod
+    def from_hash(cls, store: "RedisMemory", memory_id: str, memory_data: Dict) -> "MemoryRecord":
+        """
+        由Redis哈希创建记录（只解码类型字段）
+
+        Args:
+            store: 所属的RedisMemory
+            memory_id: 记忆ID
+            memory_data: Redis中的记忆哈希
+
+        Returns:
+            记忆记录
+        """
+        memory_type = memory_data.get(b"type", memory_data.get("type", "unknown"))
+        return cls(store, memory_id, store._safe_decode(memory_type), raw=memory_data)
+
+    def _ensure_decoded(self) -> None:
+        """首次访问内容或时间戳时解码原始哈希"""
+        if self._raw is not None:
+            self._content, self._timestamp = self._store._decode_memory(self._raw)
+            self._raw = None
+
+    @property
+    def content(self) -> Dict[str, Any]:
+        """记忆内容"""
+        self._ensure_decoded()
+        return self._content if self._content is not None else {}
+
+    @property
+    def timestamp(self) -> float:
+        """记忆时间戳"""
+        self._ensure_decoded()
+        return self._timestamp if self._timestamp is not None else 0.0
+
+    @property
+    def text(self) -> str:
+        """格式化后的文本（首次访问时渲染并缓存）"""
+        if self._text is None:
+            self._text = self._store._render_record(self)
+        return self._text
+
+    def matches(self, keyword: str) -> bool:
+        """
+        判断文本是否包含关键词（忽略大小写）
+
+        Args:
+            keyword: 搜索关键词
+
+        Returns:
+            是否包含
+        """
+        return keyword.lower() in self.text.lower()
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"MemoryRecord(id={self.memory_id!r}, type={self.memory_type!r})"
+
 
 class RedisMemory:
     """基于Redis的记忆模块 - 优化版本"""
@@ -27,7 +165,11 @@ class RedisMemory:
         agent_id: str,
         redis_client: redis.Redis,
         max_memories: int = 1000,
-        ttl: int = 86400 * 7  # 7天过期
+        ttl: int = 86400 * 7,  # 7天过期
+        use_script: bool = True,
+        codec: Optional[RecordCodec] = None,
+        namespace: Optional[str] = None,
+        write_queue: Optional["WriteQueue"] = None
     ):
         """
         初始化Redis记忆模块
@@ -37,15 +179,24 @@ class RedisMemory:
             redis_client: Redis客户端
             max_memories: 最大记忆数量
             ttl: 记忆过期时间（秒）
+            use_script: 是否使用Lua脚本原子写入并裁剪（客户端不支持时自动回退到管道）
+            codec: 记录编解码器，None时使用配置中的默认编解码器
+            namespace: 键命名空间（同一进程运行多场会议时按会话隔离），None表示不隔离
+            write_queue: 写入队列，提供时写入入队后立即返回，None表示直接写入
         """
         self.agent_id = agent_id
         self.redis = redis_client
         self.max_memories = max_memories
         self.ttl = ttl
+        self.use_script = use_script
+        self._add_script = None
+        self.codec = codec or get_record_codec()
+        self.write_queue = write_queue
         self.logger = logging.getLogger(f"redis_memory.{agent_id}")
 
         # Redis Key前缀
-        self.key_prefix = f"agent:{agent_id}"
+        self.namespace = namespace
+        self.key_prefix = f"{namespace}:agent:{agent_id}" if namespace else f"agent:{agent_id}"
         self.memories_list_key = f"{self.key_prefix}:memories:list"
         self.memories_types_key = f"{self.key_prefix}:memories:types"
         self.stats_key = f"{self.key_prefix}:stats"
@@ -68,6 +219,14 @@ class RedisMemory:
             self.logger.warning(f"JSON序列化失败: {e}")
             return json.dumps({"error": "serialization_failed", "original_type": type(obj).__name__})
 
+    def _safe_encode(self, record: Dict[str, Any]) -> bytes:
+        """安全的记录编码"""
+        try:
+            return self.codec.encode(record)
+        except Exception as e:
+            self.logger.warning(f"记录编码失败: {e}")
+            return self.codec.encode({"c": {"error": "serialization_failed"}, "t": record.get("t", time.time())})
+
     def _safe_json_loads(self, json_str: str) -> Dict[str, Any]:
         """安全的JSON反序列化"""
         try:
@@ -106,58 +265,192 @@ class RedisMemory:
         memory_id = self._generate_memory_id()
         timestamp = time.time()
 
+        # 紧凑存储：类型单独成字段（裁剪旧记忆时需要读取），内容和时间戳编码为一个值；
+        # ID、agent_id和创建时间可由key和时间戳推出，不再重复存储
         memory_data = {
-            "id": memory_id,
             "type": memory_type,
-            "content": self._safe_json_dumps(content),
-            "timestamp": str(timestamp),
-            "agent_id": self.agent_id,
-            "created_at": datetime.fromtimestamp(timestamp).isoformat()
+            "v": self._safe_encode({"c": content, "t": timestamp})
         }
 
         try:
-            # 使用管道进行原子操作
-            pipe = self.redis.pipeline()
-
-            # 存储记忆详情
-            memory_key = f"{self.key_prefix}:memory:{memory_id}"
-            pipe.hset(memory_key, mapping=memory_data)
-            pipe.expire(memory_key, self.ttl)
+            if self.write_queue is not None:
+                # 入队后立即返回，由后台任务按批写入
+                await self.write_queue.submit(
+                    self.redis,
+                    functools.partial(self._stage_memory, memory_id, memory_type, memory_data, timestamp),
+                    on_result=self._on_memory_written,
+                    fallback=functools.partial(self._write_memory, memory_id, memory_type, memory_data, timestamp),
+                    description=f"记忆 {self.key_prefix}:memory:{memory_id}",
+                    writer=self.key_prefix
+                )
+            else:
+                await self._write_memory(memory_id, memory_type, memory_data, timestamp)
 
-            # 添加到有序列表（按时间戳排序）
-            pipe.zadd(self.memories_list_key, {memory_id: timestamp})
-            pipe.expire(self.memories_list_key, self.ttl)
+            # 更新缓存（内容已知，无需再解码）
+            self._update_cache(
+                f"memory:{memory_id}",
+                MemoryRecord(self, memory_id, memory_type, content=content, timestamp=timestamp)
+            )
 
-            # 按类型分组
-            type_key = f"{self.memories_types_key}:{memory_type}"
-            pipe.zadd(type_key, {memory_id: timestamp})
-            pipe.expire(type_key, self.ttl)
+            self.logger.info(f"添加记忆成功: {memory_type} - {memory_id}")
+            return memory_id
 
-            # 更新统计信息
-            pipe.hincrby(self.stats_key, "total_memories", 1)
-            pipe.hincrby(self.stats_key, f"type_{memory_type}", 1)
-            pipe.hset(self.stats_key, "last_update", timestamp)
-            pipe.expire(self.stats_key, self.ttl)
+        except Exception as e:
+            self.logger.error(f"添加记忆失败: {str(e)}", exc_info=True)
+            raise
 
-            # 执行管道操作
-            results = await pipe.execute()
+    def _script_keys_and_args(
+        self,
+        memory_id: str,
+        memory_type: str,
+        memory_data: Dict[str, Any],
+        timestamp: float
+    ) -> Tuple[List[str], List[Any]]:
+        """写入脚本的KEYS和ARGV"""
+        keys = [
+            f"{self.key_prefix}:memory:{memory_id}",
+            self.memories_list_key,
+            f"{self.memories_types_key}:{memory_type}",
+            self.stats_key
+        ]
+        args = [memory_id, timestamp, self.ttl, self.max_memories, memory_type]
+        for field, value in memory_data.items():
+            args.extend((field, value))
+        return keys, args
+
+    async def _write_memory(
+        self,
+        memory_id: str,
+        memory_type: str,
+        memory_data: Dict[str, Any],
+        timestamp: float
+    ) -> None:
+        """直接写入一条记忆（优先使用Lua脚本，不可用时使用管道）"""
+        script = self._get_add_script()
+        if script is not None:
+            try:
+                # 一次往返：写入、更新索引和统计、从总索引裁剪旧记忆
+                keys, args = self._script_keys_and_args(memory_id, memory_type, memory_data, timestamp)
+                trimmed_ids = await script(keys=keys, args=args)
+            except redis.ResponseError as e:
+                # 服务端禁用了脚本（如部分托管Redis），回退到管道
+                self.logger.warning(f"Lua脚本执行失败，回退到管道写入: {str(e)}")
+                self.use_script = False
+            else:
+                if trimmed_ids:
+                    await self._delete_memories(trimmed_ids)
+                return
 
-            # 检查执行结果
-            if not all(results[:4]):  # 检查前4个关键操作
-                raise Exception("Pipeline执行部分失败")
+        await self._add_memory_pipeline(memory_id, memory_type, memory_data, timestamp)
 
-            # 异步清理旧记忆（避免在同一事务中）
-            await self._cleanup_old_memories()
+    async def _stage_memory(
+        self,
+        memory_id: str,
+        memory_type: str,
+        memory_data: Dict[str, Any],
+        timestamp: float,
+        pipe: Any
+    ) -> int:
+        """
+        把一条记忆的写入命令加入写入队列的管道
 
-            # 更新缓存
-            self._update_cache(f"memory:{memory_id}", memory_data)
+        Args:
+            memory_id: 记忆ID
+            memory_type: 记忆类型
+            memory_data: 记忆哈希字段
+            timestamp: 时间戳
+            pipe: 管道
 
-            self.logger.info(f"添加记忆成功: {memory_type} - {memory_id}")
-            return memory_id
+        Returns:
+            加入的命令数
+        """
+        script = self._get_add_script()
+        if script is not None:
+            keys, args = self._script_keys_and_args(memory_id, memory_type, memory_data, timestamp)
+            await script(keys=keys, args=args, client=pipe)
+            return 1
+        return self._queue_memory_commands(pipe, memory_id, memory_type, memory_data, timestamp)
+
+    async def _on_memory_written(self, results: List[Any]) -> None:
+        """写入队列执行后的处理：删除脚本从总索引裁剪的记忆，管道写入需要单独裁剪"""
+        if len(results) == 1:
+            if results[0]:
+                await self._delete_memories(results[0])
+            return
+        await self._cleanup_old_memories()
+
+    async def _wait_for_writes(self) -> None:
+        """等待本记忆已入队的写入完成（读取和清空前调用，保证读到已返回的写入；不等待其他写入方）"""
+        if self.write_queue is not None:
+            await self.write_queue.flush(self.key_prefix)
+
+    def _get_add_script(self):
+        """获取已注册的写入脚本（EVALSHA，脚本缓存丢失时由客户端自动重新加载）"""
+        if not self.use_script:
+            return None
+        if self._add_script is None:
+            if not hasattr(self.redis, "register_script"):
+                self.use_script = False
+                return None
+            self._add_script = self.redis.register_script(ADD_AND_TRIM_SCRIPT)
+        return self._add_script
+
+    async def _add_memory_pipeline(
+        self,
+        memory_id: str,
+        memory_type: str,
+        memory_data: Dict[str, Any],
+        timestamp: float
+    ) -> None:
+        """使用管道写入记忆（不支持Lua脚本时的回退路径）"""
+        # 使用管道进行原子操作
+        pipe = self.redis.pipeline()
+        self._queue_memory_commands(pipe, memory_id, memory_type, memory_data, timestamp)
+
+        # 执行管道操作
+        results = await pipe.execute()
+
+        # 检查执行结果
+        if not all(results[:4]):  # 检查前4个关键操作
+            raise Exception("Pipeline执行部分失败")
+
+        # 异步清理旧记忆（避免在同一事务中）
+        await self._cleanup_old_memories()
+
+    def _queue_memory_commands(
+        self,
+        pipe: Any,
+        memory_id: str,
+        memory_type: str,
+        memory_data: Dict[str, Any],
+        timestamp: float
+    ) -> int:
+        """
+        把写入记忆、更新索引和统计的命令加入管道（前4个为关键写入）
 
-        except Exception as e:
-            self.logger.error(f"添加记忆失败: {str(e)}", exc_info=True)
-            raise
+        Returns:
+            加入的命令数
+        """
+        # 存储记忆详情
+        memory_key = f"{self.key_prefix}:memory:{memory_id}"
+        pipe.hset(memory_key, mapping=memory_data)
+        pipe.expire(memory_key, self.ttl)
+
+        # 添加到有序列表（按时间戳排序）
+        pipe.zadd(self.memories_list_key, {memory_id: timestamp})
+        pipe.expire(self.memories_list_key, self.ttl)
+
+        # 按类型分组
+        type_key = f"{self.memories_types_key}:{memory_type}"
+        pipe.zadd(type_key, {memory_id: timestamp})
+        pipe.expire(type_key, self.ttl)
+
+        # 更新统计信息
+        pipe.hincrby(self.stats_key, "total_memories", 1)
+        pipe.hincrby(self.stats_key, f"type_{memory_type}", 1)
+        pipe.hset(self.stats_key, "last_update", timestamp)
+        pipe.expire(self.stats_key, self.ttl)
+        return 10
 
     async def _cleanup_old_memories(self) -> None:
         """清理旧记忆（异步执行）"""
@@ -170,30 +463,62 @@ class RedisMemory:
                 old_memory_ids = await self.redis.zrange(self.memories_list_key, 0, to_remove - 1)
 
                 if old_memory_ids:
-                    pipe = self.redis.pipeline()
-                    for memory_id in old_memory_ids:
-                        memory_id_str = self._safe_decode(memory_id)
-                        memory_key = f"{self.key_prefix}:memory:{memory_id_str}"
-                        pipe.delete(memory_key)
+                    await self._delete_memories(old_memory_ids, trim_list=to_remove)
+
+        except Exception as e:
+            self.logger.warning(f"清理旧记忆失败: {str(e)}")
+
+    async def _delete_memories(self, memory_ids: List[Any], trim_list: int = 0) -> None:
+        """
+        删除被裁剪的记忆：记忆哈希和类型索引项
+
+        Args:
+            memory_ids: 记忆ID
+            trim_list: 同时从总索引头部删除的条数（Lua脚本已从总索引裁剪时为0）
+        """
+        try:
+            memory_ids = [self._safe_decode(memory_id) for memory_id in memory_ids]
+
+            # 记忆类型优先从本地缓存取得，缓存中没有的再从Redis读取
+            memory_types: Dict[str, str] = {}
+            unknown_ids = []
+            for memory_id in memory_ids:
+                record = self._cache.pop(f"memory:{memory_id}", None)
+                if record is not None:
+                    memory_types[memory_id] = record.memory_type
+                else:
+                    unknown_ids.append(memory_id)
+            if unknown_ids:
+                pipe = self.redis.pipeline()
+                for memory_id in unknown_ids:
+                    pipe.hget(f"{self.key_prefix}:memory:{memory_id}", "type")
+                for memory_id, memory_type in zip(unknown_ids, await pipe.execute()):
+                    if memory_type:
+                        memory_types[memory_id] = self._safe_decode(memory_type)
 
-                    # 从索引中删除
-                    pipe.zremrangebyrank(self.memories_list_key, 0, to_remove - 1)
-                    await pipe.execute()
+            pipe = self.redis.pipeline()
+            for memory_id in memory_ids:
+                pipe.delete(f"{self.key_prefix}:memory:{memory_id}")
+                if memory_id in memory_types:
+                    pipe.zrem(f"{self.memories_types_key}:{memory_types[memory_id]}", memory_id)
+            if trim_list:
+                pipe.zremrangebyrank(self.memories_list_key, 0, trim_list - 1)
+            await pipe.execute()
 
-                    self.logger.debug(f"清理了 {len(old_memory_ids)} 条旧记忆")
+            self.logger.debug(f"清理了 {len(memory_ids)} 条旧记忆")
 
         except Exception as e:
-            self.logger.warning(f"清理旧记忆失败: {str(e)}")
+            self.logger.warning(f"删除旧记忆失败: {str(e)}")
 
-    async def _get_memories_batch(
+    async def _get_records_batch(
         self,
         key: str,
         limit: int,
         reverse: bool = False,
         start: int = 0
-    ) -> List[str]:
+    ) -> List["MemoryRecord"]:
         """
-        批量获取记忆的通用方法
+        批量获取记忆记录的通用方法（只读取哈希，不解码、不格式化）
 
         Args:
             key: Redis key
@@ -202,9 +527,11 @@ class RedisMemory:
             start: 起始位置
 
         Returns:
-            格式化的记忆列表
+            记忆记录列表
         """
         try:
+            await self._wait_for_writes()
+
             # 从Redis获取记忆ID
             if reverse:
                 memory_ids = await self.redis.zrevrange(key, start, start + limit - 1)
@@ -214,55 +541,69 @@ class RedisMemory:
             if not memory_ids:
                 return []
 
-            # 批量获取记忆详情
+            # 先查缓存，只批量获取未缓存的记忆详情
+            records: List[Optional[MemoryRecord]] = []
+            missing = []
             pipe = self.redis.pipeline()
             for memory_id in memory_ids:
                 memory_id_str = self._safe_decode(memory_id)
-                memory_key = f"{self.key_prefix}:memory:{memory_id_str}"
-
-                # 先检查缓存
-                cached_data = self._get_from_cache(f"memory:{memory_id_str}")
-                if cached_data:
-                    continue
-
-                pipe.hgetall(memory_key)
+                cached_record = self._get_from_cache(f"memory:{memory_id_str}")
+                if cached_record is None:
+                    missing.append((len(records), memory_id_str))
+                    pipe.hgetall(f"{self.key_prefix}:memory:{memory_id_str}")
+                records.append(cached_record)
+
+            if missing:
+                memories_data = await pipe.execute()
+                for (index, memory_id_str), memory_data in zip(missing, memories_data):
+                    if memory_data:
+                        record = MemoryRecord.from_hash(self, memory_id_str, memory_data)
+                        self._update_cache(f"memory:{memory_id_str}", record)
+                        records[index] = record
+
+            return [record for record in records if record is not None]
 
-            memories_data = await pipe.execute()
-
-            # 格式化记忆
-            formatted_memories = []
-            cache_index = 0
+        except Exception as e:
+            self.logger.error(f"批量获取记忆失败: {str(e)}")
+            return []
 
-            for i, memory_id in enumerate(memory_ids):
-                memory_id_str = self._safe_decode(memory_id)
+    async def _get_memories_batch(
+        self,
+        key: str,
+        limit: int,
+        reverse: bool = False,
+        start: int = 0
+    ) -> List[str]:
+        """
+        批量获取记忆的文本表示
 
-                # 先尝试从缓存获取
-                cached_data = self._get_from_cache(f"memory:{memory_id_str}")
-                if cached_data:
-                    formatted_memory = await self._format_memory_as_text(cached_data)
-                else:
-                    # 从Redis结果获取
-                    if cache_index < len(memories_data):
-                        memory_data = memories_data[cache_index]
-                        cache_index += 1
+        Args:
+            key: Redis key
+            limit: 限制数量
+            reverse: 是否倒序
+            start: 起始位置
 
-                        if memory_data:
-                            # 更新缓存
-                            self._update_cache(f"memory:{memory_id_str}", memory_data)
-                            formatted_memory = await self._format_memory_as_text(memory_data)
-                        else:
-                            continue
-                    else:
-                        continue
+        Returns:
+            格式化的记忆列表
+        """
+        records = await self._get_records_batch(key, limit, reverse, start)
+        return [record.text for record in records]
 
-                if formatted_memory:
-                    formatted_memories.append(formatted_memory)
+    async def get_relevant_records(self, topic: str, limit: int = 5) -> List["MemoryRecord"]:
+        """
+        获取相关记忆记录
 
-            return formatted_memories
+        Args:
+            topic: 主题（当前版本基于时间，未来可实现语义匹配）
+            limit: 最大返回数量
 
-        except Exception as e:
-            self.logger.error(f"批量获取记忆失败: {str(e)}")
-            return []
+        Returns:
+            记忆记录列表（最新的优先）
+        """
+        # TODO: 实现基于topic的语义匹配
+        # 当前版本：返回最近的记忆作为临时方案
+        self.logger.debug(f"获取与主题 '{topic}' 相关的记忆，限制 {limit} 条")
+        return await self._get_records_batch(self.memories_list_key, limit, reverse=True)
 
     async def get_relevant_memories(self, topic: str, limit: int = 5) -> List[str]:
         """
@@ -275,21 +616,31 @@ class RedisMemory:
         Returns:
             相关记忆的文本表示
         """
-        try:
-            # TODO: 实现基于topic的语义匹配
-            # 当前版本：返回最近的记忆作为临时方案
-            self.logger.debug(f"获取与主题 '{topic}' 相关的记忆，限制 {limit} 条")
-
-            # 使用通用批量获取方法
-            return await self._get_memories_batch(
-                self.memories_list_key,
-                limit,
-                reverse=True  # 最新的记忆优先
-            )
+        return [record.text for record in await self.get_relevant_records(topic, limit)]
 
-        except Exception as e:
-            self.logger.error(f"获取相关记忆失败: {str(e)}")
-            return []
+    async def search_records(self, keyword: str, limit: int = 10) -> List["MemoryRecord"]:
+        """
+        根据内容关键词搜索记忆记录（命中数量达到上限后不再格式化剩余记录）
+
+        Args:
+            keyword: 搜索关键词
+            limit: 最大返回数量
+
+        Returns:
+            匹配的记忆记录列表
+        """
+        records = await self._get_records_batch(self.memories_list_key, self.max_memories, reverse=True)
+
+        # 简单的关键词匹配
+        matched_records = []
+        for record in records:
+            if record.matches(keyword):
+                matched_records.append(record)
+                if len(matched_records) >= limit:
+                    break
+
+        self.logger.debug(f"关键词 '{keyword}' 匹配到 {len(matched_records)} 条记忆")
+        return matched_records
 
     async def search_memories_by_content(self, keyword: str, limit: int = 10) -> List[str]:
         """
@@ -302,30 +653,21 @@ class RedisMemory:
         Returns:
             匹配的记忆列表
         """
-        try:
-            # 获取所有记忆进行内容匹配
-            all_memories = await self._get_memories_batch(
-                self.memories_list_key,
-                self.max_memories,
-                reverse=True
-            )
-
-            # 简单的关键词匹配
-            matched_memories = []
-            keyword_lower = keyword.lower()
+        return [record.text for record in await self.search_records(keyword, limit)]
 
-            for memory in all_memories:
-                if keyword_lower in memory.lower():
-                    matched_memories.append(memory)
-                    if len(matched_memories) >= limit:
-                        break
+    async def get_records_by_type(self, memory_type: str, limit: int = 10) -> List["MemoryRecord"]:
+        """
+        获取指定类型的记忆记录
 
-            self.logger.debug(f"关键词 '{keyword}' 匹配到 {len(matched_memories)} 条记忆")
-            return matched_memories
+        Args:
+            memory_type: 记忆类型
+            limit: 最大返回数量
 
-        except Exception as e:
-            self.logger.error(f"搜索记忆失败: {str(e)}")
-            return []
+        Returns:
+            记忆记录列表（最新的优先）
+        """
+        type_key = f"{self.memories_types_key}:{memory_type}"
+        return await self._get_records_batch(type_key, limit, reverse=True)
 
     async def get_memories_by_type(self, memory_type: str, limit: int = 10) -> List[str]:
         """
@@ -338,15 +680,16 @@ class RedisMemory:
         Returns:
             指定类型记忆的文本表示
         """
-        try:
-            type_key = f"{self.memories_types_key}:{memory_type}"
+        return [record.text for record in await self.get_records_by_type(memory_type, limit)]
 
-            # 使用通用批量获取方法
-            return await self._get_memories_batch(type_key, limit, reverse=True)
+    async def get_all_records(self) -> List["MemoryRecord"]:
+        """
+        获取所有记忆记录
 
-        except Exception as e:
-            self.logger.error(f"获取类型记忆失败: {str(e)}")
-            return []
+        Returns:
+            记忆记录列表（按时间正序）
+        """
+        return await self._get_records_batch(self.memories_list_key, self.max_memories, reverse=False)
 
     async def get_all_memories(self) -> List[str]:
         """
@@ -355,17 +698,19 @@ class RedisMemory:
         Returns:
             所有记忆的文本表示
         """
-        try:
-            # 使用通用批量获取方法，按时间正序
-            return await self._get_memories_batch(
-                self.memories_list_key,
-                self.max_memories,
-                reverse=False  # 按时间正序
-            )
+        return [record.text for record in await self.get_all_records()]
 
-        except Exception as e:
-            self.logger.error(f"获取所有记忆失败: {str(e)}")
-            return []
+    async def get_recent_records(self, limit: int = 10) -> List["MemoryRecord"]:
+        """
+        获取最近的记忆记录
+
+        Args:
+            limit: 限制数量
+
+        Returns:
+            记忆记录列表（最新的优先）
+        """
+        return await self._get_records_batch(self.memories_list_key, limit, reverse=True)
 
     async def get_recent_memories(self, limit: int = 10) -> List[str]:
         """
@@ -377,16 +722,7 @@ class RedisMemory:
         Returns:
             最近的记忆列表
         """
-        try:
-            return await self._get_memories_batch(
-                self.memories_list_key,
-                limit,
-                reverse=True  # 最新的优先
-            )
-
-        except Exception as e:
-            self.logger.error(f"获取最近记忆失败: {str(e)}")
-            return []
+        return [record.text for record in await self.get_recent_records(limit)]
 
     async def clear_memories(self) -> int:
         """
@@ -396,6 +732,8 @@ class RedisMemory:
             删除的key数量
         """
         try:
+            await self._wait_for_writes()
+
             # 分批获取和删除key，避免一次性加载太多
             pattern = f"{self.key_prefix}:*"
             deleted_count = 0
@@ -436,6 +774,8 @@ class RedisMemory:
             统计信息字典
         """
         try:
+            await self._wait_for_writes()
+
             # 获取基础统计信息
             stats = await self.redis.hgetall(self.stats_key)
 
@@ -472,49 +812,59 @@ class RedisMemory:
             self.logger.error(f"获取统计信息失败: {str(e)}")
             return {}
 
-    async def _format_memory_as_text(self, memory_data: Dict) -> str:
+    def _render_record(self, record: "MemoryRecord") -> str:
         """
-        将记忆格式化为文本 - 优化版本
+        将记忆记录格式化为文本（由MemoryRecord.text在首次访问时调用）
 
         Args:
-            memory_data: 记忆数据
+            record: 记忆记录
 
         Returns:
             格式化后的文本
         """
         try:
-            # 安全解码字节数据
-            decoded_data = {}
-            for key, value in memory_data.items():
-                key_str = self._safe_decode(key)
-                value_str = self._safe_decode(value)
-                decoded_data[key_str] = value_str
-
-            memory_type = decoded_data.get("type", "unknown")
-            content_str = decoded_data.get("content", "{}")
-            timestamp_str = decoded_data.get("timestamp", "0")
-
-            # 安全解析时间戳
-            try:
-                timestamp = float(timestamp_str)
-            except ValueError:
-                timestamp = time.time()  # 使用当前时间作为默认值
-
-            # 安全解析内容JSON
-            content = self._safe_json_loads(content_str)
-
             # 格式化时间戳
             try:
-                time_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+                time_str = datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M:%S")
             except (ValueError, OSError):
                 time_str = "未知时间"
 
             # 根据记忆类型格式化内容
-            return self._format_by_type(memory_type, content, time_str)
+            return self._format_by_type(record.memory_type, record.content, time_str)
 
         except Exception as e:
             self.logger.error(f"格式化记忆失败: {str(e)}")
-            return f"[格式化失败] 类型: {memory_data.get('type', 'unknown')}"
+            return f"[格式化失败] 类型: {record.memory_type}"
+
+    def _decode_memory(self, memory_data: Dict) -> Tuple[Dict[str, Any], float]:
+        """
+        解码记忆哈希（兼容旧版逐字段JSON格式）
+
+        Args:
+            memory_data: Redis中的记忆哈希
+
+        Returns:
+            (记忆内容, 时间戳)
+        """
+        fields = {self._safe_decode(key): value for key, value in memory_data.items()}
+
+        if "v" in fields:
+            # 新格式：编码后的 {"c": 内容, "t": 时间戳}
+            try:
+                record = self.codec.decode(fields["v"])
+                return record.get("c") or {}, float(record.get("t", 0))
+            except Exception as e:
+                self.logger.warning(f"记录解码失败: {e}")
+                return {"error": "deserialization_failed"}, time.time()
+
+        # 旧格式：content为JSON字符串，timestamp为字符串
+        try:
+            timestamp = float(self._safe_decode(fields.get("timestamp", "0")))
+        except ValueError:
+            timestamp = time.time()  # 使用当前时间作为默认值
+
+        content = self._safe_json_loads(self._safe_decode(fields.get("content", "{}")))
+        return content, timestamp
 
     def _format_by_type(self, memory_type: str, content: Dict[str, Any], time_str: str) -> str:
         """
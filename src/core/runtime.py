@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多会议运行时模块 - 在同一事件循环上同时运行多场会议
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.redis_config import get_redis_client
+from src.core.agent import Agent
+from src.core.conversation import ConversationManager
+from src.core.god_view import GodView
+from src.core.memory_adapter import MemoryAdapter
+from src.core.write_queue import flush_write_queue, get_write_queue_stats
+from src.utils.http_pool import close_http_session, configure_http_pool, get_http_session
+from src.utils.stream import BufferedOutput
+
+# 智能体固定名字（与命令行界面一致）
+AGENT_NAMES = {
+    "craftsman": ["巴雅尔"],
+    "consumer": ["阿依古丽", "张小雅", "王晓萌"],
+    "manufacturer": ["李志强"],
+    "designer": ["林思雨"]
+}
+
+# 备用命名使用的中文类型名
+AGENT_TYPE_NAMES = {
+    "craftsman": "手工艺人",
+    "consumer": "消费者",
+    "manufacturer": "制造商人",
+    "designer": "设计师"
+}
+
+
+def build_agents(
+    settings,
+    model,
+    agent_counts: Optional[Dict[str, int]] = None,
+    namespace: Optional[str] = None
+) -> List[Agent]:
+    """
+    按智能体数量配置创建智能体（不显示任何界面）
+
+    Args:
+        settings: 全局设置
+        model: 模型实例（所有智能体共享）
+        agent_counts: 各类型智能体数量，None时使用设置中的数量
+        namespace: 个人记忆的键命名空间
+
+    Returns:
+        智能体列表
+    """
+    from src.agents.craftsman import Craftsman
+    from src.agents.consumer import Consumer
+    from src.agents.manufacturer import Manufacturer
+    from src.agents.designer import Designer
+
+    agent_classes = {
+        "craftsman": Craftsman,
+        "consumer": Consumer,
+        "manufacturer": Manufacturer,
+        "designer": Designer
+    }
+
+    agents = []
+    for agent_type, count in (agent_counts or settings.agent_counts).items():
+        for i in range(count):
+            agent_id = f"{agent_type}_{i+1}"
+            names = AGENT_NAMES.get(agent_type, [])
+            agent_name = names[i] if i < len(names) else f"{AGENT_TYPE_NAMES.get(agent_type, agent_type)}{i+1}"
+
+            memory = MemoryAdapter(
+                agent_id=agent_id,
+                storage_type="redis",
+                max_tokens=settings.memory_max_tokens,
+                settings=settings,
+                namespace=namespace
+            )
+
+            agent_class = agent_classes.get(agent_type)
+            if agent_class:
+                agent = agent_class(agent_id=agent_id, name=agent_name, model=model, memory=memory)
+            else:
+                agent = Agent(agent_id=agent_id, agent_type=agent_type, name=agent_name, model=model, memory=memory)
+            agents.append(agent)
+
+    return agents
+
+
+def can_switch_roles(agents) -> bool:
+    """
+    判断智能体能否全部换到与自身不同的视角
+
+    视角转换对类型列表做错排，当某一类型的数量超过总数的一半时不存在错排。
+
+    Args:
+        agents: 智能体列表
+
+    Returns:
+        是否可以进行视角转换
+    """
+    type_counts = Counter(agent.type for agent in agents)
+    total = sum(type_counts.values())
+    return total >= 2 and max(type_counts.values()) * 2 <= total
+
+
+class MeetingRuntime:
+    """
+    多会议运行时
+
+    每场会议使用独立的Redis键命名空间和输出缓冲区；Redis连接池、HTTP连接池和模型实例
+    在会议之间共享。同时进行的会议数量受 max_concurrent_meetings 限制。
+    """
+
+    def __init__(
+        self,
+        settings,
+        max_concurrent_meetings: Optional[int] = None,
+        model_factory: Optional[Callable[[Any], Any]] = None,
+        cleanup_on_finish: bool = True
+    ):
+        """
+        初始化多会议运行时
+
+        Args:
+            settings: 全局设置
+            max_concurrent_meetings: 最大并发会议数，None时使用设置中的值
+            model_factory: 模型工厂函数（接收settings），None时使用settings.get_model_instance
+            cleanup_on_finish: 会议结束后是否清理其命名空间下的Redis数据
+        """
+        self.settings = settings
+        self.max_concurrent_meetings = max_concurrent_meetings or getattr(settings, 'max_concurrent_meetings', 8)
+        self.model_factory = model_factory or (lambda s: s.get_model_instance())
+        self.cleanup_on_finish = cleanup_on_finish
+        self.logger = logging.getLogger("runtime")
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_meetings)
+        self._model = None
+        self._started = False
+
+        # 运行统计
+        self.active_meetings = 0
+        self.completed_meetings = 0
+        self.failed_meetings = 0
+
+    @property
+    def model(self) -> Any:
+        """共享的模型实例（start之后可用）"""
+        return self._model
+
+    async def start(self) -> None:
+        """初始化共享资源（Redis连接池、HTTP连接池、模型实例）"""
+        if self._started:
+            return
+
+        configure_http_pool(getattr(self.settings, 'http_pool_size', 100))
+        get_http_session()
+        await get_redis_client()
+        self._model = self.model_factory(self.settings)
+        self._started = True
+        self.logger.info(f"多会议运行时已启动，最大并发会议数: {self.max_concurrent_meetings}")
+
+    async def run_meeting(
+        self,
+        topic: str,
+        image_path: Optional[str] = None,
+        meeting_id: Optional[str] = None,
+        agent_counts: Optional[Dict[str, int]] = None,
+        role_switch: bool = True,
+        final_keywords: Optional[List[str]] = None,
+        design_prompt: Optional[str] = None,
+        output_func: Optional[Callable[..., None]] = None,
+        model: Any = None
+    ) -> Dict[str, Any]:
+        """
+        运行一场完整会议
+
+        Args:
+            topic: 会议主题
+            image_path: 参考图片路径
+            meeting_id: 会议ID，None时自动生成
+            agent_counts: 各类型智能体数量，None时使用设置中的数量
+            role_switch: 是否进行视角转换阶段
+            final_keywords: 视角转换使用的关键词，None时使用投票结果
+            design_prompt: 设计提示词，提供时在视角转换后生成设计图像
+            output_func: 会议输出函数，None时写入本场会议的缓冲区
+            model: 本场会议使用的模型，None时使用共享模型
+
+        Returns:
+            会议结果
+        """
+        await self.start()
+        meeting_id = meeting_id or uuid.uuid4().hex[:12]
+        output = output_func or BufferedOutput(strip_ansi=True)
+
+        async with self._semaphore:
+            self.active_meetings += 1
+            start_time = time.time()
+            manager = ConversationManager(
+                GodView(self.settings),
+                self.settings,
+                clean_redis_on_start=False,
+                output_func=output,
+                key_namespace=f"ns:{meeting_id}"
+            )
+            manager.stream_handler.set_delay(0)
+
+            result: Dict[str, Any] = {
+                "meeting_id": meeting_id,
+                "session_id": manager.session_id,
+                "topic": topic,
+                "success": False
+            }
+
+            try:
+                for agent in build_agents(self.settings, model or self._model, agent_counts, manager.key_namespace):
+                    await manager.add_agent(agent)
+
+                await manager.start_conversation(topic, image_path)
+                if role_switch and can_switch_roles(manager.agents.values()):
+                    await manager.start_role_switch(final_keywords or manager.voted_keywords)
+                elif role_switch:
+                    self.logger.warning(f"会议 {meeting_id} 的智能体类型无法两两交换视角，跳过视角转换")
+
+                image_paths = None
+                if design_prompt is not None and manager.stage == "waiting_for_user_input":
+                    image_paths = await manager.process_user_input(design_prompt)
+
+                result.update({
+                    "success": True,
+                    "voted_keywords": manager.voted_keywords,
+                    "keyword_clusters": manager.keyword_clusters,
+                    "keyword_frequency": dict(manager.keyword_frequency.most_common()),
+                    "final_keywords": manager.final_keywords,
+                    "design_keywords": getattr(manager, 'design_keywords', []),
+                    "image_paths": image_paths,
+                    "discussion_history": manager.discussion_history
+                })
+                self.completed_meetings += 1
+
+            except Exception as e:
+                self.logger.error(f"会议 {meeting_id} 运行失败: {str(e)}", exc_info=True)
+                result["error"] = str(e)
+                self.failed_meetings += 1
+
+            finally:
+                self.active_meetings -= 1
+                result["duration"] = round(time.time() - start_time, 3)
+                if isinstance(output, BufferedOutput):
+                    result["output"] = output.getvalue()
+                if self.cleanup_on_finish:
+                    await manager.cleanup_session()
+
+        return result
+
+    async def run_many(self, meetings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        并发运行多场会议
+
+        Args:
+            meetings: 每场会议的参数（run_meeting的关键字参数）
+
+        Returns:
+            与输入顺序一致的会议结果列表
+        """
+        return await asyncio.gather(*(self.run_meeting(**meeting) for meeting in meetings))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取运行统计
+
+        Returns:
+            统计信息字典
+        """
+        return {
+            "max_concurrent_meetings": self.max_concurrent_meetings,
+            "active_meetings": self.active_meetings,
+            "completed_meetings": self.completed_meetings,
+            "failed_meetings": self.failed_meetings,
+            "model_usage": self._model.get_usage() if self._model is not None else None,
+            "write_queue": get_write_queue_stats()
+        }
+
+    async def close(self) -> None:
+        """写入积压的记忆和发言，释放共享的HTTP连接池（Redis连接由全局管理器负责关闭）"""
+        await flush_write_queue()
+        await close_http_session()
+        self._started = False
+
+    async def __aenter__(self) -> "MeetingRuntime":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
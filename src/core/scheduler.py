@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+阶段调度模块 - 基于依赖关系（DAG）并发执行会议任务
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class StageDependencyError(RuntimeError):
+    """依赖任务失败，当前任务被跳过"""
+
+
+async def iter_completed(
+    items: Iterable[Any],
+    func: Callable[[Any], Awaitable[Any]],
+    max_concurrency: Optional[int] = None
+) -> AsyncIterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """
+    并发执行 func(item)，按完成顺序逐个产出结果（先完成的先处理，不等待最慢的一个）
+
+    Args:
+        items: 输入项（如智能体）
+        func: 单参数协程函数
+        max_concurrency: 最大并发数，None表示不限制
+
+    Yields:
+        (输入项, 结果, 异常)；执行失败时结果为None、异常为抛出的异常
+    """
+    pending = list(items)
+    pending.reverse()
+    limit = max(1, max_concurrency) if max_concurrency else len(pending) or 1
+    running: Dict[asyncio.Future, Any] = {}
+
+    try:
+        while pending or running:
+            while pending and len(running) < limit:
+                item = pending.pop()
+                running[asyncio.ensure_future(func(item))] = item
+
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            # 同时完成的按启动顺序产出
+            for future in [f for f in running if f in done]:
+                item = running.pop(future)
+                error = future.exception()
+                yield item, (None if error else future.result()), error
+    finally:
+        # 调用方提前结束迭代时取消仍在执行的任务
+        for future in running:
+            future.cancel()
+
+
+class StageTask:
+    """调度任务"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+        group: str = ""
+    ):
+        """
+        初始化调度任务
+
+        Args:
+            name: 任务名称（唯一）
+            func: 无参协程函数
+            depends_on: 依赖的任务名称
+            group: 任务分组（如 introduction / image_story），用于结果展示
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.group = group
+
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """是否成功完成"""
+        return self.done and self.error is None
+
+    @property
+    def duration(self) -> float:
+        """执行耗时（秒）"""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class StageScheduler:
+    """
+    阶段调度器
+
+    依赖满足的任务在并发上限内同时执行；结果按任务添加顺序依次回调，
+    保证输出顺序与串行执行时一致。指定为流式的分组在任务完成且依赖均已回调后立即回调。
+    """
+
+    def __init__(self, max_concurrency: int = 4):
+        """
+        初始化调度器
+
+        Args:
+            max_concurrency: 最大并发任务数
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._tasks: Dict[str, StageTask] = {}
+        self.logger = logging.getLogger("stage_scheduler")
+
+    def add_task(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+        group: str = ""
+    ) -> StageTask:
+        """
+        添加任务
+
+        Args:
+            name: 任务名称（唯一）
+            func: 无参协程函数
+            depends_on: 依赖的任务名称
+            group: 任务分组
+
+        Returns:
+            调度任务
+        """
+        if name in self._tasks:
+            raise ValueError(f"任务名称重复: {name}")
+        task = StageTask(name, func, depends_on, group)
+        self._tasks[name] = task
+        return task
+
+    def get_task(self, name: str) -> Optional[StageTask]:
+        """获取任务"""
+        return self._tasks.get(name)
+
+    def _validate(self) -> None:
+        """检查依赖是否存在以及是否有环"""
+        for task in self._tasks.values():
+            for dependency in task.depends_on:
+                if dependency not in self._tasks:
+                    raise ValueError(f"任务 {task.name} 依赖不存在的任务: {dependency}")
+
+        # Kahn算法检测环
+        in_degree = {name: len(task.depends_on) for name, task in self._tasks.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self._tasks}
+        for task in self._tasks.values():
+            for dependency in task.depends_on:
+                dependents[dependency].append(task.name)
+
+        queue = [name for name, degree in in_degree.items() if degree == 0]
+        visited = 0
+        while queue:
+            name = queue.pop()
+            visited += 1
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        if visited != len(self._tasks):
+            raise ValueError("任务依赖存在环")
+
+    async def _execute(self, task: StageTask) -> Any:
+        """执行单个任务"""
+        task.started_at = time.time()
+        try:
+            return await task.func()
+        finally:
+            task.finished_at = time.time()
+
+    async def run(
+        self,
+        on_result: Optional[Callable[[StageTask], Awaitable[None]]] = None,
+        stream_groups: Sequence[str] = ()
+    ) -> Dict[str, StageTask]:
+        """
+        执行所有任务
+
+        Args:
+            on_result: 结果回调，按任务添加顺序调用（前面的任务全部完成后才回调后面的任务）
+            stream_groups: 按完成顺序回调的任务分组（如各智能体的关键词提取）
+
+        Returns:
+            {任务名称: 调度任务}
+        """
+        self._validate()
+
+        order = list(self._tasks.values())
+        waiting = list(order)
+        running: Dict[asyncio.Task, StageTask] = {}
+        emitted = 0
+        emitted_names = set()
+
+        async def emit(task: StageTask) -> None:
+            if task.name not in emitted_names:
+                emitted_names.add(task.name)
+                if on_result:
+                    await on_result(task)
+
+        try:
+            while True:
+                # 依赖失败的任务直接跳过
+                changed = True
+                while changed:
+                    changed = False
+                    for task in list(waiting):
+                        failed = [d for d in task.depends_on if self._tasks[d].done and not self._tasks[d].succeeded]
+                        if failed:
+                            task.error = StageDependencyError(f"依赖任务失败: {', '.join(failed)}")
+                            task.done = True
+                            waiting.remove(task)
+                            changed = True
+
+                # 按ordered emission回调已完成的前缀
+                while emitted < len(order) and order[emitted].done:
+                    await emit(order[emitted])
+                    emitted += 1
+
+                # 流式分组：完成且依赖均已回调即回调
+                for task in order[emitted:]:
+                    if (
+                        task.group in stream_groups and task.done
+                        and all(d in emitted_names for d in task.depends_on)
+                    ):
+                        await emit(task)
+
+                # 启动依赖已满足的任务（按添加顺序优先）
+                for task in list(waiting):
+                    if len(running) >= self.max_concurrency:
+                        break
+                    if all(self._tasks[d].succeeded for d in task.depends_on):
+                        waiting.remove(task)
+                        running[asyncio.ensure_future(self._execute(task))] = task
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        task.result = future.result()
+                    except Exception as e:
+                        task.error = e
+                        self.logger.error(f"任务 {task.name} 执行失败: {str(e)}")
+                    task.done = True
+                    self.logger.debug(f"任务完成: {task.name} ({task.duration:.2f}s)")
+        finally:
+            for future in running:
+                future.cancel()
+
+        return dict(self._tasks)
@@ -0,0 +1,416 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+持久化写入队列模块 - 把智能体记忆和会议发言的Redis写入移出关键路径
+
+写入方（RedisMemory.add_memory、GlobalMemory.record_speech）把写入操作放入进程内的队列后
+立即返回；后台任务把积压的写入合并进一个管道（一次往返）批量执行，执行期间新到的写入
+组成下一批。读取前通过 flush(writer) 只等待本写入方已入队的写入：有读取方在等待的写入方的
+操作会被提前单独成批（同一写入方内保持顺序），不必排在其他会议的积压后面。阶段切换和会议
+结束时通过 flush() 屏障等待全部已入队的写入完成。
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.config.redis_config import RedisSettings
+
+# 管道中加入写入命令的协程函数，返回加入的命令数
+StageFunc = Callable[[Any], Awaitable[int]]
+# 批量执行后处理该操作结果的协程函数
+ResultFunc = Callable[[List[Any]], Awaitable[None]]
+# 批量执行失败后单独写入的协程函数
+FallbackFunc = Callable[[], Awaitable[Any]]
+
+
+class WriteOp:
+    """一个待写入的操作"""
+
+    __slots__ = ("client", "stage", "on_result", "fallback", "description", "writer", "seq", "enqueued_at")
+
+    def __init__(
+        self,
+        client: Any,
+        stage: StageFunc,
+        on_result: Optional[ResultFunc] = None,
+        fallback: Optional[FallbackFunc] = None,
+        description: str = "",
+        writer: Optional[str] = None,
+        seq: int = 0
+    ):
+        """
+        初始化写入操作
+
+        Args:
+            client: Redis客户端（同一批中按客户端分别建管道）
+            stage: 把写入命令加入管道的协程函数，返回加入的命令数
+            on_result: 处理本操作命令结果的协程函数
+            fallback: 在管道中写入失败时单独写入的协程函数（如Lua脚本被禁用时改用普通命令）
+            description: 操作说明（用于日志）
+            writer: 写入方标识（如记忆的Key前缀），用于只等待该写入方的写入
+            seq: 入队序号
+        """
+        self.client = client
+        self.stage = stage
+        self.on_result = on_result
+        self.fallback = fallback
+        self.description = description
+        self.writer = writer
+        self.seq = seq
+        self.enqueued_at = time.perf_counter()
+
+
+class WriteQueue:
+    """进程内的持久化写入队列"""
+
+    def __init__(self, batch_size: int = 64, max_pending: int = 1024):
+        """
+        初始化写入队列
+
+        Args:
+            batch_size: 每个管道最多合并的写入操作数
+            max_pending: 积压上限，达到上限时入队方等待（背压）
+        """
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max(self.batch_size, max_pending)
+        self.logger = logging.getLogger("write_queue")
+
+        self._ops: Deque[WriteOp] = deque()  # 按入队序号排列
+        self._in_flight: List[WriteOp] = []
+        self._submitted = 0
+        self._completed = 0
+        # 写入方 -> 其未完成操作的入队序号
+        self._writer_ops: Dict[str, Deque[int]] = {}
+        # 有读取方正在等待的写入方（其操作优先写入）
+        self._urgent: Counter = Counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._progress: Optional[asyncio.Condition] = None
+
+        # 统计
+        self.max_depth = 0
+        self.batches = 0
+        self.written_ops = 0
+        self.failed_ops = 0
+        self._last_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_wait_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        """队列深度（尚未写完的操作数，包括正在执行的一批）"""
+        return len(self._ops) + len(self._in_flight)
+
+    def _oldest_pending(self) -> float:
+        """最早的未完成操作的入队序号（没有时为无穷大）"""
+        candidates = [op.seq for op in self._in_flight]
+        if self._ops:
+            candidates.append(self._ops[0].seq)
+        return min(candidates, default=float("inf"))
+
+    def _bind_loop(self) -> None:
+        """绑定当前事件循环（事件循环更换时重建同步原语和后台任务）"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._ops or self._in_flight:
+            self.logger.warning(f"事件循环已更换，丢弃 {self.depth} 个未写入的操作")
+        self._ops.clear()
+        self._in_flight = []
+        self._completed = self._submitted
+        self._writer_ops.clear()
+        self._urgent.clear()
+        self._loop = loop
+        self._worker = None
+        self._wakeup = asyncio.Event()
+        self._progress = asyncio.Condition()
+
+    def _ensure_worker(self) -> None:
+        """启动后台写入任务"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def submit(
+        self,
+        client: Any,
+        stage: StageFunc,
+        on_result: Optional[ResultFunc] = None,
+        fallback: Optional[FallbackFunc] = None,
+        description: str = "",
+        writer: Optional[str] = None
+    ) -> None:
+        """
+        加入一个写入操作（队列未满时不等待写入完成）
+
+        Args:
+            client: Redis客户端
+            stage: 把写入命令加入管道的协程函数，返回加入的命令数
+            on_result: 处理本操作命令结果的协程函数
+            fallback: 在管道中写入失败时单独写入的协程函数
+            description: 操作说明
+            writer: 写入方标识，用于 flush(writer) 只等待该写入方的写入
+        """
+        self._bind_loop()
+        if self.depth >= self.max_pending:
+            # 背压：等待积压降到上限以下
+            async with self._progress:
+                await self._progress.wait_for(lambda: self.depth < self.max_pending)
+
+        self._submitted += 1
+        self._ops.append(WriteOp(client, stage, on_result, fallback, description, writer, self._submitted))
+        if writer is not None:
+            self._writer_ops.setdefault(writer, deque()).append(self._submitted)
+        self.max_depth = max(self.max_depth, self.depth)
+        self._wakeup.set()
+        self._ensure_worker()
+
+    async def flush(self, writer: Optional[str] = None) -> None:
+        """
+        屏障：等待调用之前入队的写入完成（没有积压时立即返回）
+
+        Args:
+            writer: 写入方标识，提供时只等待该写入方已入队的写入（这些写入被提前到下一批），
+                None时等待全部写入（阶段切换、会议结束时使用）
+        """
+        if self._loop is not asyncio.get_running_loop():
+            return
+
+        if writer is None:
+            target = self._submitted
+            if self._oldest_pending() > target:
+                return
+            self._ensure_worker()
+            async with self._progress:
+                await self._progress.wait_for(lambda: self._oldest_pending() > target)
+            return
+
+        pending = self._writer_ops.get(writer)
+        if not pending:
+            return
+        target = pending[-1]
+        self._urgent[writer] += 1
+        self._ensure_worker()
+        try:
+            async with self._progress:
+                await self._progress.wait_for(
+                    lambda: not self._writer_ops.get(writer) or self._writer_ops[writer][0] > target
+                )
+        finally:
+            self._urgent[writer] -= 1
+            if self._urgent[writer] <= 0:
+                del self._urgent[writer]
+
+    def _take_batch(self) -> List[WriteOp]:
+        """
+        取出下一批写入：有读取方在等待的写入方时，这一批只包含这些写入方的操作（同一写入方内
+        保持入队顺序，不与其他写入方合并，避免读取方等待其他客户端的管道），否则按入队顺序取出
+
+        Returns:
+            写入操作
+        """
+        if self._urgent:
+            ops = list(self._ops)
+            batch = [op for op in ops if op.writer in self._urgent][:self.batch_size]
+            if batch:
+                taken = {op.seq for op in batch}
+                self._ops = deque(op for op in ops if op.seq not in taken)
+                return batch
+        return [self._ops.popleft() for _ in range(min(self.batch_size, len(self._ops)))]
+
+    async def _run(self) -> None:
+        """后台任务：每次取出一批写入，合并为管道执行"""
+        while True:
+            if not self._ops:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            batch = self._take_batch()
+            self._in_flight = batch
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                # 不应发生（_write_batch 内部已处理），保证后台任务不退出
+                self.logger.error(f"批量写入异常: {str(e)}", exc_info=True)
+            finally:
+                self._in_flight = []
+                self._completed += len(batch)
+                for op in batch:
+                    pending = self._writer_ops.get(op.writer)
+                    if pending:
+                        pending.remove(op.seq)
+                        if not pending:
+                            del self._writer_ops[op.writer]
+                async with self._progress:
+                    self._progress.notify_all()
+
+    async def _write_batch(self, batch: List[WriteOp]) -> None:
+        """
+        写入一批操作（每个Redis客户端一个管道，一次往返）
+
+        Args:
+            batch: 写入操作
+        """
+        start = time.perf_counter()
+        groups: Dict[int, List[WriteOp]] = {}
+        for op in batch:
+            groups.setdefault(id(op.client), []).append(op)
+
+        for ops in groups.values():
+            try:
+                failed = await self._execute(ops)
+            except Exception as e:
+                # 整个管道失败（如连接中断）时逐个重试，避免一个错误的操作拖累整批
+                self.logger.warning(f"管道批量写入失败，逐个重试 {len(ops)} 个操作: {str(e)}")
+                for op in ops:
+                    if await self._retry(op):
+                        self.written_ops += 1
+                    else:
+                        self.failed_ops += 1
+                continue
+
+            self.written_ops += len(ops) - len(failed)
+            for op, error in failed:
+                # 单个操作的命令出错（如服务端禁用了脚本）：有回退写入时使用回退写入，否则丢弃
+                if op.fallback and await self._retry(op):
+                    self.written_ops += 1
+                else:
+                    self.failed_ops += 1
+                    self.logger.error(f"写入失败，已丢弃: {op.description} - {str(error)}")
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.batches += 1
+        self._last_flush_ms = elapsed_ms
+        self._total_flush_ms += elapsed_ms
+        self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        now = time.perf_counter()
+        self._total_wait_ms += sum((now - op.enqueued_at) * 1000 for op in batch)
+
+    async def _execute(self, ops: List[WriteOp]) -> List[Tuple[WriteOp, Exception]]:
+        """
+        把一组操作加入同一个管道并执行
+
+        Args:
+            ops: 使用同一客户端的写入操作
+
+        Returns:
+            命令出错的操作及其错误
+        """
+        pipe = ops[0].client.pipeline(transaction=False)
+        counts = [await op.stage(pipe) for op in ops]
+        results = await pipe.execute(raise_on_error=False)
+
+        failed = []
+        offset = 0
+        for op, count in zip(ops, counts):
+            op_results = results[offset:offset + count]
+            offset += count
+            error = next((result for result in op_results if isinstance(result, Exception)), None)
+            if error is not None:
+                failed.append((op, error))
+            elif op.on_result:
+                try:
+                    await op.on_result(op_results)
+                except Exception as e:
+                    self.logger.warning(f"处理写入结果失败: {op.description} - {str(e)}")
+        return failed
+
+    async def _retry(self, op: WriteOp) -> bool:
+        """
+        单独写入一个操作（有回退写入时使用回退写入）
+
+        Args:
+            op: 写入操作
+
+        Returns:
+            是否写入成功
+        """
+        try:
+            if op.fallback:
+                await op.fallback()
+            else:
+                failed = await self._execute([op])
+                if failed:
+                    raise failed[0][1]
+            return True
+        except Exception as e:
+            self.logger.error(f"写入失败，已丢弃: {op.description} - {str(e)}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取队列统计
+
+        Returns:
+            统计信息字典（队列深度、批次数、写入延迟等）
+        """
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "submitted": self._submitted,
+            "written": self.written_ops,
+            "failed": self.failed_ops,
+            "batches": self.batches,
+            "avg_batch_size": round(self.written_ops / self.batches, 2) if self.batches else 0.0,
+            "last_flush_ms": round(self._last_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.batches, 3) if self.batches else 0.0,
+            "max_flush_ms": round(self._max_flush_ms, 3),
+            "avg_wait_ms": round(self._total_wait_ms / self._completed, 3) if self._completed else 0.0
+        }
+
+    async def close(self) -> None:
+        """写入全部积压后停止后台任务"""
+        await self.flush()
+        if self._worker is not None and self._loop is asyncio.get_running_loop():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+
+# 全局写入队列实例
+_write_queue: Optional[WriteQueue] = None
+
+
+def get_write_queue(settings: Optional[RedisSettings] = None) -> Optional[WriteQueue]:
+    """
+    获取进程内的写入队列（未启用 MEMORY_WRITE_QUEUE 时返回None，写入方直接同步写入）
+
+    Args:
+        settings: Redis配置，None时从环境变量加载
+
+    Returns:
+        写入队列
+    """
+    global _write_queue
+    if _write_queue is None:
+        settings = settings or RedisSettings()
+        if not settings.MEMORY_WRITE_QUEUE:
+            return None
+        _write_queue = WriteQueue(settings.MEMORY_WRITE_BATCH_SIZE, settings.MEMORY_WRITE_MAX_PENDING)
+    return _write_queue
+
+
+async def flush_write_queue() -> None:
+    """屏障：等待已入队的写入全部完成（未启用写入队列时立即返回）"""
+    if _write_queue is not None:
+        await _write_queue.flush()
+
+
+async def close_write_queue() -> None:
+    """写入全部积压后停止后台任务（进程退出、关闭Redis连接前调用）"""
+    if _write_queue is not None:
+        await _write_queue.close()
+
+
+def get_write_queue_stats() -> Optional[Dict[str, Any]]:
+    """获取写入队列统计（未启用时为None）"""
+    return _write_queue.get_stats() if _write_queue is not None else None
@@ -7,6 +7,7 @@
 
 import os
 import sys
+import json
 import asyncio
 import logging
 import argparse
@@ -16,11 +17,14 @@ from pathlib import Path
 ROOT_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, str(ROOT_DIR))
 
+# 启动耗时分析需在导入项目模块之前开始（直接运行本文件时）
+if "--profile-startup" in sys.argv:
+    from src.utils.startup_profile import start_import_profile
+    start_import_profile()
+
+# 运行模式相关的模块（命令行界面、批量、服务、模型SDK）在进入对应模式时才导入
 from src.config.settings import Settings
-from src.core.conversation import ConversationManager
-from src.core.god_view import GodView
 from src.utils.logger import setup_logger
-from ui.cli.terminal import start_cli
 
 
 def parse_args():
@@ -55,9 +59,137 @@ def parse_args():
         help="不输出日志到控制台"
     )
     
+    # 批量模式（非交互）
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        help="批量模式：JSONL任务文件路径（每行一个会议：topic、image、agent_counts、final_keywords、design_prompt）"
+    )
+    
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="batch_results.jsonl",
+        help="批量模式：结果文件路径（每场会议一行JSON）"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="批量模式：同时进行的最大会议数（默认使用MAX_CONCURRENT_MEETINGS）"
+    )
+    
+    parser.add_argument(
+        "--include-output",
+        action="store_true",
+        help="批量模式：结果中包含会议的完整文本输出"
+    )
+    
+    parser.add_argument(
+        "--scripted-model",
+        action="store_true",
+        help="批量/服务模式：使用脚本化模型（不调用API，用于演练、测试和压测）"
+    )
+    
+    # 服务模式（HTTP/WebSocket）
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="服务模式：启动HTTP/WebSocket服务，由前端驱动会议"
+    )
+    
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=None,
+        help="服务模式：监听地址（默认使用API_HOST）"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="服务模式：监听端口（默认使用API_PORT）"
+    )
+    
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="输出启动耗时报告（各模块导入耗时）后退出，可与 --batch/--serve 组合查看对应模式"
+    )
+    
     return parser.parse_args()
 
 
+def get_model_factory(args):
+    """
+    根据命令行参数获取模型工厂函数
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        模型工厂函数，None表示使用配置中的模型
+    """
+    if not args.scripted_model:
+        return None
+    from src.models.scripted import ScriptedModel
+    return lambda _settings: ScriptedModel()
+
+
+def profile_startup(args, settings) -> None:
+    """
+    导入所选运行模式和模型需要的模块，输出启动耗时报告（不启动会议）
+
+    Args:
+        args: 命令行参数
+        settings: 全局设置
+    """
+    from src.utils.startup_profile import format_import_report, stop_import_profile
+
+    if args.batch:
+        import src.core.batch  # noqa: F401
+    elif args.serve:
+        import ui.web.server  # noqa: F401
+    else:
+        import ui.cli.terminal  # noqa: F401
+
+    model_factory = get_model_factory(args)
+    try:
+        model_factory(settings) if model_factory else settings.get_model_instance()
+    except Exception as e:
+        logging.getLogger("main").warning(f"创建模型实例失败（不影响导入耗时统计）: {str(e)}")
+
+    stop_import_profile()
+    print(format_import_report())
+
+
+async def run_batch_mode(args, settings) -> None:
+    """
+    运行批量模式
+
+    Args:
+        args: 命令行参数
+        settings: 全局设置
+    """
+    from src.core.batch import load_jobs, run_batch
+
+    model_factory = get_model_factory(args)
+
+    jobs = load_jobs(args.batch)
+    summary = await run_batch(
+        settings,
+        jobs,
+        args.output,
+        concurrency=args.concurrency,
+        model_factory=model_factory,
+        include_output=args.include_output
+    )
+    print(json.dumps(summary, ensure_ascii=False))
+
+
 async def main():
     """主函数"""
     # 解析命令行参数
@@ -81,6 +213,10 @@ async def main():
         # 加载设置
         settings = Settings(args.config)
 
+        if args.profile_startup:
+            profile_startup(args, settings)
+            return
+
         # 初始化Redis连接（如果启用）
         try:
             from src.config.redis_config import init_redis
@@ -89,14 +225,26 @@ async def main():
         except Exception as e:
             logger.warning(f"Redis连接初始化失败: {str(e)}")
 
-        # 创建上帝视角
-        god_view = GodView(settings)
+        if args.batch:
+            # 批量模式：不启动命令行界面
+            await run_batch_mode(args, settings)
+        elif args.serve:
+            # 服务模式：由前端通过HTTP/WebSocket驱动会议
+            from ui.web.server import serve
+            await serve(settings, args.host, args.port, get_model_factory(args))
+        else:
+            from src.core.conversation import ConversationManager
+            from src.core.god_view import GodView
+            from ui.cli.terminal import start_cli
+
+            # 创建上帝视角
+            god_view = GodView(settings)
 
-        # 创建对话管理器
-        conversation_manager = ConversationManager(god_view, settings)
+            # 创建对话管理器
+            conversation_manager = ConversationManager(god_view, settings)
 
-        # 启动命令行界面
-        await start_cli(conversation_manager, settings)
+            # 启动命令行界面
+            await start_cli(conversation_manager, settings)
         
     except Exception as e:
         logger.error(f"程序运行出错: {str(e)}", exc_info=True)
@@ -1,23 +1,51 @@
 """
 AI模型接口模块
+
+各提供商的模型类在首次访问时才导入（避免启动时加载全部SDK）。
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from src.models.base import BaseModel
-from src.models.openai import OpenAIModel
-from src.models.google import GoogleModel
-from src.models.anthropic import AnthropicModel
-from src.models.deepseek import DeepSeekModel
-from src.models.openrouter import OpenRouterModel
-from src.models.doubao import DoubaoModel
-from src.models.github import GithubModel
-
-__all__ = [
-    'BaseModel',
-    'OpenAIModel',
-    'GoogleModel',
-    'AnthropicModel',
-    'DeepSeekModel',
-    'OpenRouterModel',
-    'DoubaoModel',
-    'GithubModel'
-]
+
+if TYPE_CHECKING:
+    from src.models.openai import OpenAIModel
+    from src.models.google import GoogleModel
+    from src.models.anthropic import AnthropicModel
+    from src.models.deepseek import DeepSeekModel
+    from src.models.openrouter import OpenRouterModel
+    from src.models.doubao import DoubaoModel
+    from src.models.github import GithubModel
+    from src.models.scripted import ScriptedModel
+    from src.models.failover import FailoverModel
+    from src.models.router import ModelRouter
+
+# 模型类名 -> 所在模块
+_LAZY_MODELS = {
+    'OpenAIModel': 'src.models.openai',
+    'GoogleModel': 'src.models.google',
+    'AnthropicModel': 'src.models.anthropic',
+    'DeepSeekModel': 'src.models.deepseek',
+    'OpenRouterModel': 'src.models.openrouter',
+    'DoubaoModel': 'src.models.doubao',
+    'GithubModel': 'src.models.github',
+    'ScriptedModel': 'src.models.scripted',
+    'FailoverModel': 'src.models.failover',
+    'ModelRouter': 'src.models.router'
+}
+
+__all__ = ['BaseModel'] + list(_LAZY_MODELS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_MODELS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_MODELS))
@@ -6,18 +6,22 @@ Anthropic模型接口模块
 """
 
 import base64
+import json
 import logging
 import os
-from typing import Optional, Dict, Any, List, Callable
-
-import aiohttp
+import time
+from typing import Optional, Dict, Any, List, Callable, Union
 
 from src.models.base import BaseModel
+from src.models.errors import ModelError, ModelResponseError, ModelUnsupportedError
+from src.utils.http_pool import http_session
 
 
 class AnthropicModel(BaseModel):
     """Anthropic模型接口"""
 
+    provider = "anthropic"
+
     def __init__(
         self,
         model_name: str = "claude-3-opus-20240229",
@@ -55,16 +59,56 @@ class AnthropicModel(BaseModel):
         
         self.logger = logging.getLogger(f"model.anthropic.{model_name}")
 
-    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+    def _system_field(self, system_prompt: str) -> Union[str, List[Dict[str, Any]]]:
         """
-        生成文本
+        构建请求的system字段（启用提示词缓存时将系统提示词标记为可缓存）
+
+        Args:
+            system_prompt: 系统提示词
+
+        Returns:
+            system字段的值
+        """
+        if not self.prompt_cache:
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+    def _record_response_usage(
+        self,
+        usage: Dict[str, Any],
+        started: float,
+        first_token_at: Optional[float] = None
+    ) -> None:
+        """
+        记录响应中的用量（input_tokens不含缓存命中和写入缓存的部分）
+
+        Args:
+            usage: 响应的usage字段
+            started: 请求开始时间
+            first_token_at: 收到首个文本片段的时间（仅流式调用）
+        """
+        cache_read = usage.get("cache_read_input_tokens") or 0
+        cache_write = usage.get("cache_creation_input_tokens") or 0
+        self.record_usage(
+            input_tokens=(usage.get("input_tokens") or 0) + cache_read + cache_write,
+            output_tokens=usage.get("output_tokens") or 0,
+            cache_read_tokens=cache_read,
+            cache_write_tokens=cache_write,
+            response_seconds=time.perf_counter() - started,
+            first_token_seconds=first_token_at - started if first_token_at is not None else None
+        )
+
+    async def _create_message(self, prompt: str, system_prompt: str = "", **request_options: Any) -> Dict[str, Any]:
+        """
+        调用消息接口
 
         Args:
             prompt: 提示词
             system_prompt: 系统提示词
+            **request_options: 额外的请求参数（如 tools、tool_choice）
 
         Returns:
-            生成的文本
+            响应数据
         """
         try:
             # 构建消息
@@ -75,18 +119,20 @@ class AnthropicModel(BaseModel):
                 "model": self.model_name,
                 "messages": messages,
                 "max_tokens": self.max_tokens,
-                "temperature": self.temperature
+                "temperature": self.temperature,
+                **request_options
             }
             
             # 添加系统提示词
             if system_prompt:
-                data["system"] = system_prompt
+                data["system"] = self._system_field(system_prompt)
             
             # 构建URL
             url = f"{self.base_url.rstrip('/')}/messages"
             
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            started = time.perf_counter()
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -99,16 +145,61 @@ class AnthropicModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return f"生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
                     
                     result = await response.json()
-                    
-                    # 获取生成的文本
-                    return result["content"][0]["text"]
+                    self._record_response_usage(result.get("usage", {}), started)
+                    return result
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        生成文本
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+
+        Returns:
+            生成的文本
+        """
+        result = await self._create_message(prompt, system_prompt)
+        try:
+            return result["content"][0]["text"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise ModelResponseError(f"无法解析响应: {str(e)}", self.provider, self.model_name) from e
+
+    async def generate_json(self, prompt: str, system_prompt: str = "", schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        生成JSON文本（提供Schema时通过强制调用工具约束输出格式）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            schema: 输出需满足的JSON Schema（顶层为object）
+
+        Returns:
+            JSON文本
+        """
+        if not schema:
+            return await self.generate(prompt, system_prompt)
+
+        result = await self._create_message(
+            prompt,
+            system_prompt,
+            tools=[{"name": "submit_result", "description": "提交结构化结果", "input_schema": schema}],
+            tool_choice={"type": "tool", "name": "submit_result"}
+        )
+        for block in result.get("content", []):
+            if block.get("type") == "tool_use":
+                return json.dumps(block.get("input", {}), ensure_ascii=False)
+        # 没有调用工具时返回文本，由调用方解析和校验
+        return "".join(block.get("text", "") for block in result.get("content", []))
 
     async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
         """
@@ -123,7 +214,7 @@ class AnthropicModel(BaseModel):
             生成的文本
         """
         if not self.supports_vision():
-            return "该模型不支持图像处理"
+            raise ModelUnsupportedError("该模型不支持图像处理", self.provider, self.model_name)
         
         try:
             # 读取图像
@@ -158,13 +249,14 @@ class AnthropicModel(BaseModel):
             
             # 添加系统提示词
             if system_prompt:
-                data["system"] = system_prompt
+                data["system"] = self._system_field(system_prompt)
             
             # 构建URL
             url = f"{self.base_url.rstrip('/')}/messages"
             
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            started = time.perf_counter()
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -177,16 +269,19 @@ class AnthropicModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return f"生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
                     
                     result = await response.json()
+                    self._record_response_usage(result.get("usage", {}), started)
                     
                     # 获取生成的文本
                     return result["content"][0]["text"]
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"基于图像生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_stream(
         self, 
@@ -220,14 +315,17 @@ class AnthropicModel(BaseModel):
             
             # 添加系统提示词
             if system_prompt:
-                data["system"] = system_prompt
+                data["system"] = self._system_field(system_prompt)
             
             # 构建URL
             url = f"{self.base_url.rstrip('/')}/messages"
             
             # 发送请求
             full_text = ""
-            async with aiohttp.ClientSession() as session:
+            usage: Dict[str, Any] = {}
+            first_token_at = None
+            started = time.perf_counter()
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -240,10 +338,7 @@ class AnthropicModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        error_message = f"生成失败: API请求返回 {response.status}"
-                        if callback:
-                            callback(error_message)
-                        return error_message
+                        raise self._status_error(response.status, error_text)
                     
                     # 处理流式响应
                     async for line in response.content:
@@ -253,24 +348,31 @@ class AnthropicModel(BaseModel):
                             try:
                                 import json
                                 data = json.loads(data_str)
-                                if 'type' in data and data['type'] == 'content_block_delta':
+                                if data.get('type') == 'message_start':
+                                    # 输入token和缓存用量在消息开始事件中
+                                    usage.update(data.get('message', {}).get('usage', {}))
+                                elif data.get('type') == 'message_delta':
+                                    usage.update(data.get('usage', {}))
+                                elif 'type' in data and data['type'] == 'content_block_delta':
                                     delta = data.get('delta', {})
                                     if 'text' in delta:
                                         content = delta['text']
+                                        if first_token_at is None:
+                                            first_token_at = time.perf_counter()
                                         full_text += content
                                         if callback:
                                             callback(content)
                             except Exception as e:
                                 self.logger.error(f"解析流式响应失败: {str(e)}")
             
+            self._record_response_usage(usage, started, first_token_at)
             return full_text
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"流式生成文本失败: {str(e)}")
-            error_message = f"生成失败: {str(e)}"
-            if callback:
-                callback(error_message)
-            return error_message
+            raise self._model_error(e) from e
 
     def supports_vision(self) -> bool:
         """
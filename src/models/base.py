@@ -5,13 +5,28 @@
 模型基类模块
 """
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List, Callable
 
+from src.models.errors import ModelError, ModelTimeoutError, error_from_status
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    """平均值（保留4位小数，空列表返回None）"""
+    return round(sum(values) / len(values), 4) if values else None
+
 
 class BaseModel(ABC):
-    """模型基类"""
+    """
+    模型基类
+
+    调用失败时抛出 ModelError 及其子类（见 src.models.errors），不返回错误字符串。
+    """
+
+    # 提供商名称（用于错误信息和故障转移）
+    provider = ""
 
     def __init__(self, model_name: str, **kwargs):
         """
@@ -24,6 +39,106 @@ class BaseModel(ABC):
         self.model_name = model_name
         self.logger = logging.getLogger(f"model.{model_name}")
 
+        # 是否使用提供商的提示词缓存（Anthropic需显式标记，OpenAI/DeepSeek按前缀自动缓存）
+        self.prompt_cache = kwargs.get("prompt_cache", True)
+
+        # 用量统计（输入token数包含缓存命中和写入缓存的部分）
+        self.usage_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self._response_seconds: Dict[bool, List[float]] = {True: [], False: []}
+        self._first_token_seconds: Dict[bool, List[float]] = {True: [], False: []}
+
+    def _status_error(self, status: int, message: str) -> ModelError:
+        """
+        根据HTTP状态码构建模型错误
+
+        Args:
+            status: HTTP状态码
+            message: 响应内容
+
+        Returns:
+            模型错误
+        """
+        return error_from_status(status, message, self.provider, self.model_name)
+
+    def _model_error(self, error: BaseException) -> ModelError:
+        """
+        将调用过程中的异常转换为模型错误
+
+        Args:
+            error: 原始异常
+
+        Returns:
+            模型错误
+        """
+        if isinstance(error, ModelError):
+            return error
+        if isinstance(error, asyncio.TimeoutError) or "Timeout" in type(error).__name__:
+            return ModelTimeoutError(f"请求超时: {error}", self.provider, self.model_name)
+        status = getattr(error, "status_code", None) or getattr(error, "status", None)
+        if isinstance(status, int):
+            return error_from_status(status, str(error), self.provider, self.model_name)
+        return ModelError(str(error) or type(error).__name__, self.provider, self.model_name)
+
+    def record_usage(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        response_seconds: Optional[float] = None,
+        first_token_seconds: Optional[float] = None
+    ) -> None:
+        """
+        记录一次调用的用量
+
+        Args:
+            input_tokens: 输入token总数（含缓存命中部分）
+            output_tokens: 输出token数
+            cache_read_tokens: 命中缓存的输入token数
+            cache_write_tokens: 写入缓存的输入token数
+            response_seconds: 完整响应耗时
+            first_token_seconds: 首字耗时（仅流式调用）
+        """
+        self.usage_calls += 1
+        self.input_tokens += input_tokens or 0
+        self.output_tokens += output_tokens or 0
+        self.cache_read_tokens += cache_read_tokens or 0
+        self.cache_write_tokens += cache_write_tokens or 0
+
+        cached = bool(cache_read_tokens)
+        if response_seconds is not None:
+            self._response_seconds[cached].append(response_seconds)
+        if first_token_seconds is not None:
+            self._first_token_seconds[cached].append(first_token_seconds)
+
+    def get_usage(self) -> Dict[str, Any]:
+        """
+        获取用量统计（耗时按是否命中缓存分开统计平均值）
+
+        Returns:
+            用量统计字典
+        """
+        return {
+            "calls": self.usage_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cache_hit_rate": round(self.cache_read_tokens / self.input_tokens, 4) if self.input_tokens else 0.0,
+            "response_seconds": {
+                "cached": _mean(self._response_seconds[True]),
+                "uncached": _mean(self._response_seconds[False])
+            },
+            "first_token_seconds": {
+                "cached": _mean(self._first_token_seconds[True]),
+                "uncached": _mean(self._first_token_seconds[False])
+            }
+        }
+
     @abstractmethod
     async def generate(self, prompt: str, system_prompt: str = "") -> str:
         """
@@ -73,6 +188,23 @@ class BaseModel(ABC):
         """
         pass
 
+    async def generate_json(self, prompt: str, system_prompt: str = "", schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        生成JSON文本
+
+        支持结构化输出的提供商使用JSON模式或工具调用约束输出格式，默认实现为普通生成，
+        解析和校验见 src.utils.structured_output。
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            schema: 输出需满足的JSON Schema（顶层为object）
+
+        Returns:
+            JSON文本
+        """
+        return await self.generate(prompt, system_prompt)
+
     def supports_vision(self) -> bool:
         """
         是否支持图像处理
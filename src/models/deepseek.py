@@ -8,16 +8,19 @@ DeepSeek模型接口模块
 import base64
 import logging
 import os
+import time
 from typing import Optional, Dict, Any, List, Callable
 
-import aiohttp
-
 from src.models.base import BaseModel
+from src.models.errors import ModelError, ModelUnsupportedError
+from src.utils.http_pool import http_session
 
 
 class DeepSeekModel(BaseModel):
     """DeepSeek模型接口"""
 
+    provider = "deepseek"
+
     def __init__(
         self,
         model_name: str = "deepseek-chat-v3-0324",
@@ -55,13 +58,37 @@ class DeepSeekModel(BaseModel):
         
         self.logger = logging.getLogger(f"model.deepseek.{model_name}")
 
-    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+    def _record_response_usage(
+        self,
+        usage: Optional[Dict[str, Any]],
+        started: float,
+        first_token_at: Optional[float] = None
+    ) -> None:
         """
-        生成文本
+        记录响应中的用量（DeepSeek自动缓存相同前缀，命中数在prompt_cache_hit_tokens中）
+
+        Args:
+            usage: 响应的usage字段（可能为None）
+            started: 请求开始时间
+            first_token_at: 收到首个文本片段的时间（仅流式调用）
+        """
+        usage = usage or {}
+        self.record_usage(
+            input_tokens=usage.get("prompt_tokens") or 0,
+            output_tokens=usage.get("completion_tokens") or 0,
+            cache_read_tokens=usage.get("prompt_cache_hit_tokens") or 0,
+            response_seconds=time.perf_counter() - started,
+            first_token_seconds=first_token_at - started if first_token_at is not None else None
+        )
+
+    async def _complete(self, prompt: str, system_prompt: str = "", **request_options: Any) -> str:
+        """
+        调用对话补全接口
 
         Args:
             prompt: 提示词
             system_prompt: 系统提示词
+            **request_options: 额外的请求参数（如 response_format）
 
         Returns:
             生成的文本
@@ -81,14 +108,16 @@ class DeepSeekModel(BaseModel):
                 "model": self.model_name,
                 "messages": messages,
                 "temperature": self.temperature,
-                "max_tokens": self.max_tokens
+                "max_tokens": self.max_tokens,
+                **request_options
             }
             
             # 构建URL
             url = f"{self.base_url.rstrip('/')}/chat/completions"
             
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            started = time.perf_counter()
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -100,16 +129,46 @@ class DeepSeekModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return f"生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
                     
                     result = await response.json()
+                    self._record_response_usage(result.get("usage"), started)
                     
                     # 获取生成的文本
                     return result["choices"][0]["message"]["content"]
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        生成文本
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+
+        Returns:
+            生成的文本
+        """
+        return await self._complete(prompt, system_prompt)
+
+    async def generate_json(self, prompt: str, system_prompt: str = "", schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        生成JSON文本（使用JSON模式，Schema由调用方校验）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            schema: 输出需满足的JSON Schema（顶层为object）
+
+        Returns:
+            JSON文本
+        """
+        return await self._complete(prompt, system_prompt, response_format={"type": "json_object"})
 
     async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
         """
@@ -124,7 +183,7 @@ class DeepSeekModel(BaseModel):
             生成的文本
         """
         if not self.supports_vision():
-            return "该模型不支持图像处理"
+            raise ModelUnsupportedError("该模型不支持图像处理", self.provider, self.model_name)
         
         try:
             # 读取图像
@@ -163,7 +222,8 @@ class DeepSeekModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/chat/completions"
             
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            started = time.perf_counter()
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -175,16 +235,19 @@ class DeepSeekModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return f"生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
                     
                     result = await response.json()
+                    self._record_response_usage(result.get("usage"), started)
                     
                     # 获取生成的文本
                     return result["choices"][0]["message"]["content"]
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"基于图像生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_stream(
         self, 
@@ -222,12 +285,19 @@ class DeepSeekModel(BaseModel):
                 "stream": True
             }
             
+            # 启用提示词缓存时请求在最后一个片段中返回用量，用于统计缓存命中
+            if self.prompt_cache:
+                data["stream_options"] = {"include_usage": True}
+            
             # 构建URL
             url = f"{self.base_url.rstrip('/')}/chat/completions"
             
             # 发送请求
             full_text = ""
-            async with aiohttp.ClientSession() as session:
+            usage = None
+            first_token_at = None
+            started = time.perf_counter()
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -239,10 +309,7 @@ class DeepSeekModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        error_message = f"生成失败: API请求返回 {response.status}"
-                        if callback:
-                            callback(error_message)
-                        return error_message
+                        raise self._status_error(response.status, error_text)
                     
                     # 处理流式响应
                     async for line in response.content:
@@ -252,24 +319,28 @@ class DeepSeekModel(BaseModel):
                             try:
                                 import json
                                 data = json.loads(data_str)
+                                if data.get('usage'):
+                                    usage = data['usage']
                                 if 'choices' in data and data['choices'] and 'delta' in data['choices'][0]:
                                     delta = data['choices'][0]['delta']
                                     if 'content' in delta and delta['content']:
                                         content = delta['content']
+                                        if first_token_at is None:
+                                            first_token_at = time.perf_counter()
                                         full_text += content
                                         if callback:
                                             callback(content)
                             except Exception as e:
                                 self.logger.error(f"解析流式响应失败: {str(e)}")
             
+            self._record_response_usage(usage, started, first_token_at)
             return full_text
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"流式生成文本失败: {str(e)}")
-            error_message = f"生成失败: {str(e)}"
-            if callback:
-                callback(error_message)
-            return error_message
+            raise self._model_error(e) from e
 
     def supports_vision(self) -> bool:
         """
@@ -12,15 +12,18 @@ import json
 import time
 from typing import Optional, Dict, Any, List, AsyncGenerator
 
-import aiohttp
 import requests
 
 from src.models.base import BaseModel
+from src.models.errors import ModelError, ModelUnsupportedError
+from src.utils.http_pool import http_session
 
 
 class DoubaoModel(BaseModel):
     """豆包API模型接口"""
 
+    provider = "doubao"
+
     def __init__(
         self,
         model_name: str = "doubao-seedream-3-0-t2i-250415",
@@ -101,7 +104,7 @@ class DoubaoModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/chat/completions"
 
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -113,16 +116,18 @@ class DoubaoModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return f"生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
 
                     result = await response.json()
 
                     # 获取生成的文本
                     return result["choices"][0]["message"]["content"]
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_stream(self, prompt: str, system_prompt: str = "") -> AsyncGenerator[str, None]:
         """
@@ -159,7 +164,7 @@ class DoubaoModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/chat/completions"
 
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -171,8 +176,7 @@ class DoubaoModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        yield f"生成失败: API请求返回 {response.status}"
-                        return
+                        raise self._status_error(response.status, error_text)
 
                     # 处理流式响应
                     async for line in response.content:
@@ -183,9 +187,11 @@ class DoubaoModel(BaseModel):
                             if content:
                                 yield content
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"流式生成文本失败: {str(e)}")
-            yield f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
         """
@@ -200,7 +206,7 @@ class DoubaoModel(BaseModel):
             生成的文本
         """
         if not self.supports_vision():
-            return "该模型不支持图像处理"
+            raise ModelUnsupportedError("该模型不支持图像处理", self.provider, self.model_name)
 
         try:
             # 读取图像
@@ -240,7 +246,7 @@ class DoubaoModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/chat/completions"
 
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -252,16 +258,18 @@ class DoubaoModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return f"生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
 
                     result = await response.json()
 
                     # 获取生成的文本
                     return result["choices"][0]["message"]["content"]
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"基于图像生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_image(self, prompt: str, size: str = "1024x1024", n: int = 4, watermark: bool = False) -> List[str]:
         """
@@ -277,7 +285,7 @@ class DoubaoModel(BaseModel):
             生成的图像URL列表
         """
         if not self.supports_image_generation():
-            return ["该模型不支持图像生成"]
+            raise ModelUnsupportedError("该模型不支持图像生成", self.provider, self.model_name)
 
         try:
             # 构建请求数据
@@ -293,7 +301,7 @@ class DoubaoModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/images/generations"
 
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -305,16 +313,18 @@ class DoubaoModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return [f"生成失败: API请求返回 {response.status}"]
+                        raise self._status_error(response.status, error_text)
 
                     result = await response.json()
 
                     # 获取生成的图像URL
                     return [item["url"] for item in result["data"]]
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成图像失败: {str(e)}")
-            return [f"生成失败: {str(e)}"]
+            raise self._model_error(e) from e
 
     def supports_vision(self) -> bool:
         """
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+模型错误模块 - 模型调用失败时抛出的异常类型（取代"生成失败: ..."字符串）
+"""
+
+from typing import List, Optional
+
+
+class ModelError(Exception):
+    """模型调用失败"""
+
+    # 同一后端稍后重试是否可能成功（认证失败、不支持的功能等为False）
+    retryable = True
+
+    def __init__(
+        self,
+        message: str,
+        provider: str = "",
+        model_name: str = "",
+        status: Optional[int] = None
+    ):
+        """
+        初始化模型错误
+
+        Args:
+            message: 错误信息
+            provider: 提供商
+            model_name: 模型名称
+            status: HTTP状态码
+        """
+        super().__init__(message)
+        self.provider = provider
+        self.model_name = model_name
+        self.status = status
+
+    def __str__(self) -> str:
+        source = "/".join(part for part in (self.provider, self.model_name) if part)
+        message = super().__str__()
+        return f"[{source}] {message}" if source else message
+
+
+class ModelTimeoutError(ModelError):
+    """请求超时"""
+
+
+class ModelRateLimitError(ModelError):
+    """超出速率限制（HTTP 429）"""
+
+
+class ModelAuthError(ModelError):
+    """认证失败（HTTP 401/403）"""
+
+    retryable = False
+
+
+class ModelResponseError(ModelError):
+    """接口返回错误状态或无法解析的响应"""
+
+
+class ModelOutputError(ModelResponseError):
+    """模型输出不符合要求的格式（修复后仍无效）"""
+
+    def __init__(self, message: str, output: str = "", **kwargs):
+        """
+        初始化
+
+        Args:
+            message: 错误信息
+            output: 最后一次的模型输出
+            **kwargs: ModelError的其他参数
+        """
+        super().__init__(message, **kwargs)
+        self.output = output
+
+
+class ModelUnsupportedError(ModelError):
+    """模型不支持请求的功能（如图像输入）"""
+
+    retryable = False
+
+
+class ModelUnavailableError(ModelError):
+    """所有后端都调用失败"""
+
+    def __init__(self, message: str, errors: Optional[List[ModelError]] = None, **kwargs):
+        """
+        初始化
+
+        Args:
+            message: 错误信息
+            errors: 各后端的错误
+            **kwargs: ModelError的其他参数
+        """
+        super().__init__(message, **kwargs)
+        self.errors = errors or []
+
+
+def error_from_status(status: int, message: str, provider: str = "", model_name: str = "") -> ModelError:
+    """
+    根据HTTP状态码构建错误
+
+    Args:
+        status: HTTP状态码
+        message: 错误信息（响应内容）
+        provider: 提供商
+        model_name: 模型名称
+
+    Returns:
+        对应类型的模型错误
+    """
+    if status == 429:
+        error_class = ModelRateLimitError
+    elif status in (401, 403):
+        error_class = ModelAuthError
+    elif status in (408, 504):
+        error_class = ModelTimeoutError
+    else:
+        error_class = ModelResponseError
+    return error_class(f"API请求返回 {status}: {message[:500]}", provider, model_name, status)
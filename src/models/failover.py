@@ -0,0 +1,434 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+故障转移模型模块 - 在多个提供商之间按健康评分路由请求，支持对冲请求
+
+- 故障转移：按健康评分依次尝试各后端，连续失败的后端进入冷却期
+- 对冲请求：主请求超过该后端p95耗时仍未返回时，向下一个后端发出备份请求，取先成功的结果
+- 流式输出：以首个文本片段决定胜出者，其余请求取消；胜出者输出后再失败时不再转移
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from src.models.base import BaseModel
+from src.models.errors import ModelError, ModelTimeoutError, ModelUnavailableError, ModelUnsupportedError
+
+# 计算耗时分位数所需的最少样本数（不足时使用固定的对冲延迟）
+MIN_LATENCY_SAMPLES = 5
+
+# 不可重试错误（认证失败等）的冷却时间倍数
+NON_RETRYABLE_COOLDOWN_FACTOR = 10
+
+
+class BackendHealth:
+    """单个后端的健康状态"""
+
+    def __init__(self, window: int = 100, smoothing: float = 0.2):
+        """
+        初始化
+
+        Args:
+            window: 用于计算分位数的耗时样本数
+            smoothing: 成功率指数平滑系数
+        """
+        self.smoothing = smoothing
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.first_token_latencies: Deque[float] = deque(maxlen=window)
+        self.score = 1.0  # 平滑后的成功率
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.last_error: Optional[str] = None
+
+    def record_success(self, seconds: float, first_token_seconds: Optional[float] = None) -> None:
+        """记录一次成功调用"""
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.score = self.score * (1 - self.smoothing) + self.smoothing
+        self.latencies.append(seconds)
+        if first_token_seconds is not None:
+            self.first_token_latencies.append(first_token_seconds)
+
+    def record_failure(self, error: ModelError, threshold: int, cooldown: float) -> None:
+        """
+        记录一次失败调用，连续失败达到阈值（或不可重试错误）时进入冷却期
+
+        Args:
+            error: 模型错误
+            threshold: 进入冷却期的连续失败次数
+            cooldown: 冷却时间（秒），连续失败越多冷却越久
+        """
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.score = self.score * (1 - self.smoothing)
+        self.last_error = str(error)
+
+        if not error.retryable:
+            self.cooldown_until = time.monotonic() + cooldown * NON_RETRYABLE_COOLDOWN_FACTOR
+        elif self.consecutive_failures >= threshold:
+            factor = 2 ** min(self.consecutive_failures - threshold, 4)
+            self.cooldown_until = time.monotonic() + cooldown * factor
+
+    def available(self) -> bool:
+        """是否不在冷却期"""
+        return time.monotonic() >= self.cooldown_until
+
+    def quantile(self, q: float, first_token: bool = False) -> Optional[float]:
+        """
+        耗时分位数
+
+        Args:
+            q: 分位（0-1）
+            first_token: 是否使用首字耗时
+
+        Returns:
+            分位数（样本不足时返回None）
+        """
+        samples = self.first_token_latencies if first_token else self.latencies
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        p95 = self.quantile(0.95)
+        return {
+            "score": round(self.score, 3),
+            "available": self.available(),
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+            "last_error": self.last_error
+        }
+
+
+class FailoverModel(BaseModel):
+    """
+    故障转移模型
+
+    组合多个模型后端，对外表现为一个模型。
+    """
+
+    provider = "failover"
+
+    def __init__(
+        self,
+        models: List[BaseModel],
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_delay: float = 3.0,
+        request_timeout: Optional[float] = None,
+        failure_threshold: int = 2,
+        cooldown: float = 30.0,
+        **kwargs
+    ):
+        """
+        初始化故障转移模型
+
+        Args:
+            models: 模型后端（按优先级排列）
+            hedge: 是否启用对冲请求
+            hedge_quantile: 发出备份请求的耗时分位
+            hedge_delay: 样本不足时发出备份请求的延迟（秒）
+            request_timeout: 单次请求超时（秒，None表示不限制）
+            failure_threshold: 进入冷却期的连续失败次数
+            cooldown: 冷却时间（秒）
+            **kwargs: 其他参数
+        """
+        if not models:
+            raise ValueError("故障转移模型至少需要一个后端")
+
+        super().__init__("failover(" + ",".join(f"{m.provider}/{m.model_name}" for m in models) + ")", **kwargs)
+        self.models = list(models)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_delay = hedge_delay
+        self.request_timeout = request_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.health = [BackendHealth() for _ in self.models]
+        self.logger = logging.getLogger("model.failover")
+
+        # 路由统计
+        self.hedged_requests = 0
+        self.failovers = 0
+
+    def _ordered_backends(self, require_vision: bool = False) -> List[int]:
+        """
+        按健康评分排列后端（冷却中的后端排在最后，仍作为最后的尝试）
+
+        Args:
+            require_vision: 是否只选择支持图像的后端
+
+        Returns:
+            后端下标列表
+        """
+        indexes = [
+            index for index, model in enumerate(self.models)
+            if not require_vision or model.supports_vision()
+        ]
+        # 评分按0.1分档，同档内保持配置的优先级
+        return sorted(
+            indexes,
+            key=lambda index: (not self.health[index].available(), -round(self.health[index].score, 1), index)
+        )
+
+    def _get_hedge_delay(self, index: int, first_token: bool) -> float:
+        """
+        获取对冲延迟：该后端耗时的分位数（样本不足时使用固定延迟）
+
+        Args:
+            index: 后端下标
+            first_token: 是否按首字耗时计算（流式调用）
+
+        Returns:
+            延迟（秒）
+        """
+        delay = self.health[index].quantile(self.hedge_quantile, first_token)
+        return delay if delay is not None else self.hedge_delay
+
+    async def _attempt(
+        self,
+        index: int,
+        call: Callable[[BaseModel], Awaitable[str]],
+        first_token_times: Dict[int, float]
+    ) -> str:
+        """
+        调用单个后端并更新健康状态
+
+        Args:
+            index: 后端下标
+            call: 调用函数（接收模型后端）
+            first_token_times: 各后端收到首个文本片段的时间（流式调用）
+
+        Returns:
+            生成的文本
+        """
+        model = self.models[index]
+        health = self.health[index]
+        started = time.perf_counter()
+        try:
+            if self.request_timeout:
+                result = await asyncio.wait_for(call(model), self.request_timeout)
+            else:
+                result = await call(model)
+        except asyncio.TimeoutError:
+            error = ModelTimeoutError(f"请求超过 {self.request_timeout} 秒", model.provider, model.model_name)
+            health.record_failure(error, self.failure_threshold, self.cooldown)
+            raise error
+        except ModelError as e:
+            health.record_failure(e, self.failure_threshold, self.cooldown)
+            raise
+        except Exception as e:
+            error = model._model_error(e)
+            health.record_failure(error, self.failure_threshold, self.cooldown)
+            raise error from e
+
+        first_token_at = first_token_times.get(index)
+        health.record_success(
+            time.perf_counter() - started,
+            first_token_at - started if first_token_at is not None else None
+        )
+        return result
+
+    async def _route(
+        self,
+        make_call: Callable[[int, Callable[[int], bool]], Callable[[BaseModel], Awaitable[str]]],
+        require_vision: bool = False,
+        streaming: bool = False
+    ) -> str:
+        """
+        按健康评分路由请求：失败时转移到下一个后端，启用对冲时超时发出备份请求
+
+        Args:
+            make_call: 根据后端下标和首个片段回调构建调用函数（首个片段回调返回该后端是否胜出）
+            require_vision: 是否只选择支持图像的后端
+            streaming: 是否为流式调用（以首个文本片段决定胜出者）
+
+        Returns:
+            先成功的后端生成的文本
+        """
+        order = self._ordered_backends(require_vision)
+        if not order:
+            raise ModelUnsupportedError("没有支持图像处理的后端", self.provider, self.model_name)
+
+        errors: List[ModelError] = []
+        pending: Dict[asyncio.Task, int] = {}
+        first_token_times: Dict[int, float] = {}
+        winner: List[int] = []  # 流式调用中先输出的后端
+        launched = 0
+
+        def launch() -> None:
+            nonlocal launched
+            index = order[launched]
+            launched += 1
+            task = asyncio.ensure_future(self._attempt(index, make_call(index, on_first_token), first_token_times))
+            pending[task] = index
+
+        def on_first_token(index: int) -> bool:
+            """流式调用收到首个片段：第一个到达的后端胜出，取消其余请求"""
+            if index not in first_token_times:
+                first_token_times[index] = time.perf_counter()
+            if not winner:
+                winner.append(index)
+                for task, other in pending.items():
+                    if other != index:
+                        task.cancel()
+            return winner[0] == index
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if self.hedge and not winner and len(pending) == 1 and launched < len(order):
+                    timeout = self._get_hedge_delay(next(iter(pending.values())), streaming)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # 主请求超过分位耗时仍未返回：发出备份请求
+                    self.hedged_requests += 1
+                    self.logger.info(f"请求耗时超过 {timeout:.2f} 秒，向备用后端发出对冲请求")
+                    launch()
+                    continue
+
+                for task in done:
+                    index = pending.pop(task)
+                    if task.cancelled():
+                        continue
+                    try:
+                        result = task.result()
+                    except ModelError as e:
+                        self.logger.warning(f"后端 {self.models[index].provider}/{self.models[index].model_name} 调用失败: {str(e)}")
+                        if winner and winner[0] == index:
+                            # 已经输出了部分内容，无法转移
+                            raise
+                        errors.append(e)
+                        continue
+                    if index != order[0]:
+                        self.failovers += 1
+                    return result
+
+                if not pending and launched < len(order):
+                    launch()
+
+            raise ModelUnavailableError(
+                "所有后端调用失败: " + "; ".join(str(e) for e in errors),
+                errors=errors,
+                provider=self.provider,
+                model_name=self.model_name
+            )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        生成文本
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+
+        Returns:
+            生成的文本
+        """
+        return await self._route(lambda index, first_token: lambda model: model.generate(prompt, system_prompt))
+
+    async def generate_json(self, prompt: str, system_prompt: str = "", schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        生成JSON文本
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            schema: 输出需满足的JSON Schema
+
+        Returns:
+            JSON文本
+        """
+        return await self._route(lambda index, first_token: lambda model: model.generate_json(prompt, system_prompt, schema))
+
+    async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
+        """
+        基于图像生成文本（只路由到支持图像的后端）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            image_path: 图像路径
+
+        Returns:
+            生成的文本
+        """
+        return await self._route(
+            lambda index, first_token: lambda model: model.generate_with_image(prompt, system_prompt, image_path),
+            require_vision=True
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        callback: Callable[[str], None] = None
+    ) -> str:
+        """
+        流式生成文本（只转发胜出后端的片段）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            callback: 回调函数，用于处理流式输出
+
+        Returns:
+            生成的完整文本
+        """
+        def make_call(index: int, first_token: Callable[[int], bool]) -> Callable[[BaseModel], Awaitable[str]]:
+            def on_chunk(chunk: str) -> None:
+                if first_token(index) and callback:
+                    callback(chunk)
+            return lambda model: model.generate_stream(prompt, system_prompt, on_chunk)
+
+        return await self._route(make_call, streaming=True)
+
+    def supports_vision(self) -> bool:
+        """
+        是否支持图像处理（任一后端支持即可）
+
+        Returns:
+            是否支持图像处理
+        """
+        return any(model.supports_vision() for model in self.models)
+
+    def get_usage(self) -> Dict[str, Any]:
+        """
+        获取用量统计（汇总各后端，并附带各后端的健康状态）
+
+        Returns:
+            用量统计字典
+        """
+        usages = [model.get_usage() for model in self.models]
+        keys = ("calls", "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+        totals: Dict[str, Any] = {key: sum(usage.get(key, 0) for usage in usages) for key in keys}
+        totals["cache_hit_rate"] = (
+            round(totals["cache_read_tokens"] / totals["input_tokens"], 4) if totals["input_tokens"] else 0.0
+        )
+        totals["hedged_requests"] = self.hedged_requests
+        totals["failovers"] = self.failovers
+        totals["backends"] = [
+            {
+                "provider": model.provider,
+                "model": model.model_name,
+                "health": health.to_dict(),
+                "usage": usage
+            }
+            for model, health, usage in zip(self.models, self.health, usages)
+        ]
+        return totals
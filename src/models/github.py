@@ -12,10 +12,20 @@ import aiohttp
 import json
 from typing import Optional, Callable
 from src.models.base import BaseModel
+from src.models.errors import (
+    ModelError,
+    ModelRateLimitError,
+    ModelResponseError,
+    ModelTimeoutError,
+    ModelUnsupportedError
+)
+from src.utils.http_pool import http_session
 
 class GithubModel(BaseModel):
     """Github AI模型接口（使用异步HTTP客户端）"""
 
+    provider = "github"
+
     def __init__(
         self,
         model_name: str = "openai/gpt-4.1",
@@ -65,7 +75,7 @@ class GithubModel(BaseModel):
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with http_session() as session:
                         async with session.post(
                             url,
                             json=data,
@@ -83,7 +93,7 @@ class GithubModel(BaseModel):
                                     await asyncio.sleep(wait_time)
                                     continue
                                 else:
-                                    return "生成失败: 超出API速率限制，请稍后再试"
+                                    raise ModelRateLimitError("超出API速率限制，请稍后再试", self.provider, self.model_name, 429)
 
                             if response.status != 200:
                                 error_text = await response.text()
@@ -92,7 +102,7 @@ class GithubModel(BaseModel):
                                     await asyncio.sleep(2)  # 等待2秒后重试
                                     continue
                                 else:
-                                    return f"生成失败: API请求返回 {response.status}"
+                                    raise self._status_error(response.status, error_text)
 
                             result = await response.json()
 
@@ -101,7 +111,7 @@ class GithubModel(BaseModel):
                                 content = result["choices"][0]["message"]["content"]
                                 return content
                             else:
-                                return "生成失败: 响应格式错误"
+                                raise ModelResponseError("响应格式错误", self.provider, self.model_name)
 
                 except asyncio.TimeoutError:
                     self.logger.warning(f"请求超时，尝试重试 ({attempt + 1}/{max_retries})")
@@ -109,20 +119,22 @@ class GithubModel(BaseModel):
                         await asyncio.sleep(2)
                         continue
                     else:
-                        return "生成失败: 请求超时"
+                        raise ModelTimeoutError("请求超时", self.provider, self.model_name)
                 except Exception as e:
                     self.logger.error(f"请求异常: {str(e)}")
                     if attempt < max_retries - 1:
                         await asyncio.sleep(2)
                         continue
                     else:
-                        return f"生成失败: {str(e)}"
+                        raise self._model_error(e) from e
 
-            return "生成失败: 所有重试都失败了"
+            raise ModelError("所有重试都失败了", self.provider, self.model_name)
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
         """
@@ -137,7 +149,7 @@ class GithubModel(BaseModel):
             生成的文本
         """
         # Github AI 暂不支持 vision
-        return "该模型暂不支持图像输入"
+        raise ModelUnsupportedError("该模型暂不支持图像输入", self.provider, self.model_name)
 
     async def generate_stream(self, prompt: str, system_prompt: str = "", callback: Callable[[str], None] = None) -> str:
         """
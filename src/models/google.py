@@ -26,6 +26,7 @@ except ImportError:
     aiohttp = None
 
 from src.models.base import BaseModel
+from src.models.errors import ModelError, ModelRateLimitError, ModelResponseError, ModelTimeoutError
 
 # 速率限制器类
 class RateLimiter:
@@ -110,6 +111,8 @@ class RateLimiter:
 class GoogleModel(BaseModel):
     """Google模型接口"""
 
+    provider = "google"
+
     def __init__(
         self,
         model_name: str = "gemini-2.5-flash",
@@ -230,7 +233,7 @@ class GoogleModel(BaseModel):
                             await asyncio.sleep(wait_time)
                             continue
                         else:
-                            return "生成失败: 超出API速率限制，请稍后再试"
+                            raise ModelRateLimitError("超出API速率限制，请稍后再试", self.provider, self.model_name, 429)
 
                     if response.status_code != 200:
                         error_text = response.text
@@ -238,7 +241,7 @@ class GoogleModel(BaseModel):
                         if attempt < max_retries - 1:
                             await asyncio.sleep(2)  # 短暂等待后重试
                             continue
-                        return f"生成失败: API请求返回 {response.status_code}"
+                        raise self._status_error(response.status_code, error_text)
 
                     result = response.json()
 
@@ -251,14 +254,14 @@ class GoogleModel(BaseModel):
                         
                         return result["choices"][0]["message"]["content"]
 
-                    return "生成失败: 无法解析响应"
+                    raise ModelResponseError("无法解析响应", self.provider, self.model_name)
 
                 except requests.exceptions.Timeout:
                     if attempt < max_retries - 1:
                         self.logger.warning(f"请求超时，正在重试... (尝试 {attempt + 1}/{max_retries})")
                         await asyncio.sleep(5)
                         continue
-                    return "生成失败: 请求超时"
+                    raise ModelTimeoutError("请求超时", self.provider, self.model_name)
                 except Exception as e:
                     if attempt < max_retries - 1:
                         self.logger.warning(f"请求失败: {e}，正在重试... (尝试 {attempt + 1}/{max_retries})")
@@ -266,9 +269,11 @@ class GoogleModel(BaseModel):
                         continue
                     raise e
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
         """
@@ -360,7 +365,7 @@ class GoogleModel(BaseModel):
                             self.logger.warning(f"请求超时，正在重试... (尝试 {attempt + 1}/{max_retries})")
                             await asyncio.sleep(5)
                             continue
-                        return "生成失败: 请求超时"
+                        raise ModelTimeoutError("请求超时", self.provider, self.model_name)
                 
                 if response.status_code == 429:  # 速率限制
                     if attempt < max_retries - 1:
@@ -369,7 +374,7 @@ class GoogleModel(BaseModel):
                         await asyncio.sleep(wait_time)
                         continue
                     else:
-                        return "生成失败: 超出API速率限制，请稍后再试"
+                        raise ModelRateLimitError("超出API速率限制，请稍后再试", self.provider, self.model_name, 429)
                 
                 if response.status_code != 200:
                     error_text = response.text
@@ -377,7 +382,7 @@ class GoogleModel(BaseModel):
                     if attempt < max_retries - 1:
                         await asyncio.sleep(2)  # 短暂等待后重试
                         continue
-                    return f"生成失败: API请求返回 {response.status_code}"
+                    raise self._status_error(response.status_code, error_text)
                 
                 result = response.json()
                 
@@ -391,24 +396,24 @@ class GoogleModel(BaseModel):
                     return result["choices"][0]["message"]["content"]
                 else:
                     self.logger.error(f"无效的API响应: {result}")
-                    return f"无效的API响应: {result}"
+                    raise ModelResponseError(f"无效的API响应: {result}", self.provider, self.model_name)
             
             except requests.exceptions.Timeout:
                 if attempt < max_retries - 1:
                     self.logger.warning(f"请求超时，正在重试... (尝试 {attempt + 1}/{max_retries})")
                     await asyncio.sleep(5)
                     continue
-                return "生成失败: 请求超时"
+                raise ModelTimeoutError("请求超时", self.provider, self.model_name)
             except Exception as e:
                 self.logger.error(f"基于图像生成文本失败: {str(e)}")
                 if attempt < max_retries - 1:
                     self.logger.warning(f"请求失败: {e}，正在重试... (尝试 {attempt + 1}/{max_retries})")
                     await asyncio.sleep(2)
                     continue
-                return f"生成失败: {str(e)}"
+                raise self._model_error(e) from e
         
         # 如果所有重试都失败
-        return "生成失败: 多次尝试后仍无法获取响应"
+        raise ModelError("多次尝试后仍无法获取响应", self.provider, self.model_name)
 
     async def generate_stream(
         self,
@@ -442,12 +447,11 @@ class GoogleModel(BaseModel):
 
             return result
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"流式生成文本失败: {str(e)}")
-            error_message = f"生成失败: {str(e)}"
-            if callback:
-                callback(error_message)
-            return error_message
+            raise self._model_error(e) from e
 
     def supports_vision(self) -> bool:
         """
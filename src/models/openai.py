@@ -8,17 +8,36 @@ OpenAI模型接口模块
 import base64
 import logging
 import os
+import time
 from typing import Optional, Dict, Any, List, Callable
 
 import openai
 from openai import AsyncOpenAI
 
 from src.models.base import BaseModel
+from src.models.errors import ModelError, ModelUnsupportedError
+
+# 支持按JSON Schema约束输出（response_format.json_schema）的模型
+STRUCTURED_OUTPUT_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "o1", "o3", "o4")
+
+# 严格模式不一定支持的校验关键字（由本地校验负责）
+_VALIDATION_ONLY_KEYWORDS = {"minLength", "maxLength", "minItems", "maxItems"}
+
+
+def _strict_schema(schema: Any) -> Any:
+    """去掉仅用于本地校验的关键字，得到可用于严格模式的Schema"""
+    if isinstance(schema, dict):
+        return {key: _strict_schema(value) for key, value in schema.items() if key not in _VALIDATION_ONLY_KEYWORDS}
+    if isinstance(schema, list):
+        return [_strict_schema(value) for value in schema]
+    return schema
 
 
 class OpenAIModel(BaseModel):
     """OpenAI模型接口"""
 
+    provider = "openai"
+
     def __init__(
         self,
         model_name: str = "gpt-4",
@@ -60,13 +79,32 @@ class OpenAIModel(BaseModel):
         
         self.logger = logging.getLogger(f"model.openai.{model_name}")
 
-    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+    def _record_response_usage(self, usage: Any, started: float, first_token_at: Optional[float] = None) -> None:
         """
-        生成文本
+        记录响应中的用量（OpenAI对1024 token以上的相同前缀自动缓存，命中数在cached_tokens中）
+
+        Args:
+            usage: 响应的usage对象（可能为None）
+            started: 请求开始时间
+            first_token_at: 收到首个文本片段的时间（仅流式调用）
+        """
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.record_usage(
+            input_tokens=getattr(usage, "prompt_tokens", 0),
+            output_tokens=getattr(usage, "completion_tokens", 0),
+            cache_read_tokens=getattr(details, "cached_tokens", 0),
+            response_seconds=time.perf_counter() - started,
+            first_token_seconds=first_token_at - started if first_token_at is not None else None
+        )
+
+    async def _complete(self, prompt: str, system_prompt: str = "", **request_options: Any) -> str:
+        """
+        调用对话补全接口
 
         Args:
             prompt: 提示词
             system_prompt: 系统提示词
+            **request_options: 额外的请求参数（如 response_format）
 
         Returns:
             生成的文本
@@ -82,19 +120,58 @@ class OpenAIModel(BaseModel):
             messages.append({"role": "user", "content": prompt})
             
             # 调用API
+            started = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model=self.model_name,
                 messages=messages,
                 temperature=self.temperature,
-                max_tokens=self.max_tokens
+                max_tokens=self.max_tokens,
+                **request_options
             )
+            self._record_response_usage(response.usage, started)
             
             # 获取生成的文本
             return response.choices[0].message.content
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        生成文本
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+
+        Returns:
+            生成的文本
+        """
+        return await self._complete(prompt, system_prompt)
+
+    async def generate_json(self, prompt: str, system_prompt: str = "", schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        生成JSON文本（支持结构化输出的模型按Schema约束，其余使用JSON模式）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            schema: 输出需满足的JSON Schema（顶层为object）
+
+        Returns:
+            JSON文本
+        """
+        if schema and self.model_name.startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES):
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {"name": "result", "schema": _strict_schema(schema), "strict": True}
+            }
+        else:
+            response_format = {"type": "json_object"}
+        return await self._complete(prompt, system_prompt, response_format=response_format)
 
     async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
         """
@@ -109,7 +186,7 @@ class OpenAIModel(BaseModel):
             生成的文本
         """
         if not self.supports_vision():
-            return "该模型不支持图像处理"
+            raise ModelUnsupportedError("该模型不支持图像处理", self.provider, self.model_name)
         
         try:
             # 读取图像
@@ -137,19 +214,23 @@ class OpenAIModel(BaseModel):
             })
             
             # 调用API
+            started = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model=self.model_name,
                 messages=messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens
             )
+            self._record_response_usage(response.usage, started)
             
             # 获取生成的文本
             return response.choices[0].message.content
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"基于图像生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_stream(
         self, 
@@ -178,32 +259,41 @@ class OpenAIModel(BaseModel):
             # 添加用户提示词
             messages.append({"role": "user", "content": prompt})
             
-            # 调用API
+            # 调用API（启用提示词缓存时请求在最后一个片段中返回用量，用于统计缓存命中）
+            extra_kwargs = {"stream_options": {"include_usage": True}} if self.prompt_cache else {}
+            started = time.perf_counter()
             stream = await self.client.chat.completions.create(
                 model=self.model_name,
                 messages=messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                stream=True
+                stream=True,
+                **extra_kwargs
             )
             
             # 处理流式输出
             full_text = ""
+            usage = None
+            first_token_at = None
             async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
                 if chunk.choices and chunk.choices[0].delta.content:
                     content = chunk.choices[0].delta.content
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
                     full_text += content
                     if callback:
                         callback(content)
             
+            self._record_response_usage(usage, started, first_token_at)
             return full_text
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"流式生成文本失败: {str(e)}")
-            error_message = f"生成失败: {str(e)}"
-            if callback:
-                callback(error_message)
-            return error_message
+            raise self._model_error(e) from e
 
     def supports_vision(self) -> bool:
         """
@@ -11,15 +11,17 @@ import os
 import re
 from typing import Optional, Dict, Any, List, Callable
 
-import aiohttp
-
 from src.models.base import BaseModel
+from src.models.errors import ModelError
 from src.utils.image_compressor import ImageCompressor
+from src.utils.http_pool import http_session
 
 
 class OpenRouterModel(BaseModel):
     """OpenRouter模型接口"""
 
+    provider = "openrouter"
+
     def __init__(
         self,
         model_name: str = "meta-llama/llama-4-maverick:free",
@@ -111,7 +113,7 @@ class OpenRouterModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/chat/completions"
             
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -125,7 +127,7 @@ class OpenRouterModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        return f"生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
                     
                     result = await response.json()
                     
@@ -139,9 +141,11 @@ class OpenRouterModel(BaseModel):
                     
                     return content
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"生成文本失败: {str(e)}")
-            return f"生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
         """
@@ -218,7 +222,7 @@ class OpenRouterModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/chat/completions"
 
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -232,7 +236,7 @@ class OpenRouterModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"视觉模型API请求失败: {response.status}, {error_text}")
-                        return f"图像描述失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
 
                     result = await response.json()
 
@@ -245,9 +249,11 @@ class OpenRouterModel(BaseModel):
                     self.logger.info(f"视觉模型图像描述完成，长度: {len(content)}")
                     return content
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"视觉模型图像描述失败: {str(e)}")
-            return f"图像描述失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def _generate_with_chat_model(self, prompt: str, system_prompt: str, image_description: str) -> str:
         """
@@ -286,7 +292,7 @@ class OpenRouterModel(BaseModel):
             url = f"{self.base_url.rstrip('/')}/chat/completions"
 
             # 发送请求
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -300,7 +306,7 @@ class OpenRouterModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"对话模型API请求失败: {response.status}, {error_text}")
-                        return f"对话生成失败: API请求返回 {response.status}"
+                        raise self._status_error(response.status, error_text)
 
                     result = await response.json()
 
@@ -313,9 +319,11 @@ class OpenRouterModel(BaseModel):
                     self.logger.info(f"对话模型生成完成，长度: {len(content)}")
                     return content
 
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"对话模型生成失败: {str(e)}")
-            return f"对话生成失败: {str(e)}"
+            raise self._model_error(e) from e
 
     async def generate_stream(
         self,
@@ -361,7 +369,7 @@ class OpenRouterModel(BaseModel):
             thinking_buffer = ""
             in_thinking = False
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async with session.post(
                     url,
                     json=data,
@@ -375,10 +383,7 @@ class OpenRouterModel(BaseModel):
                     if response.status != 200:
                         error_text = await response.text()
                         self.logger.error(f"API请求失败: {response.status}, {error_text}")
-                        error_message = f"生成失败: API请求返回 {response.status}"
-                        if callback:
-                            callback(error_message)
-                        return error_message
+                        raise self._status_error(response.status, error_text)
                     
                     # 处理流式响应
                     async for line in response.content:
@@ -426,12 +431,11 @@ class OpenRouterModel(BaseModel):
             
             return full_text
         
+        except ModelError:
+            raise
         except Exception as e:
             self.logger.error(f"流式生成文本失败: {str(e)}")
-            error_message = f"生成失败: {str(e)}"
-            if callback:
-                callback(error_message)
-            return error_message
+            raise self._model_error(e) from e
 
     def supports_vision(self) -> bool:
         """
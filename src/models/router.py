@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+阶段路由模型模块 - 按会议阶段和角色选择模型（如投票、关键词提取使用小而快的模型）
+
+路由模型本身作为默认模型使用，智能体在各阶段通过 for_stage() 取得该阶段的模型。
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.models.base import BaseModel
+
+
+def get_stage_model(model: BaseModel, stage: str, role: Optional[str] = None) -> BaseModel:
+    """
+    获取某阶段使用的模型（非路由模型直接返回自身）
+
+    Args:
+        model: 模型实例
+        stage: 阶段名称（见 ModelConfig.STAGES）
+        role: 角色类型
+
+    Returns:
+        该阶段使用的模型
+    """
+    for_stage = getattr(model, "for_stage", None)
+    return for_stage(stage, role) if for_stage else model
+
+
+class _StageModel:
+    """某阶段使用的模型：转发到实际模型，并按实际调用次数计入路由模型的阶段统计"""
+
+    def __init__(self, model: BaseModel, stage_calls: Counter, key: str):
+        """
+        初始化阶段模型
+
+        Args:
+            model: 实际使用的模型
+            stage_calls: 路由模型的阶段调用计数
+            key: 计数键（阶段:提供商/模型）
+        """
+        self._model = model
+        self._stage_calls = stage_calls
+        self._key = key
+
+    def __getattr__(self, name: str) -> Any:
+        """其他属性和方法（如 supports_vision、model_name）直接使用实际模型的"""
+        return getattr(self._model, name)
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """生成文本"""
+        self._stage_calls[self._key] += 1
+        return await self._model.generate(prompt, system_prompt)
+
+    async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
+        """基于图像生成文本"""
+        self._stage_calls[self._key] += 1
+        return await self._model.generate_with_image(prompt, system_prompt, image_path)
+
+    async def generate_json(self, prompt: str, system_prompt: str = "", schema: Optional[Dict[str, Any]] = None) -> str:
+        """生成JSON文本"""
+        self._stage_calls[self._key] += 1
+        return await self._model.generate_json(prompt, system_prompt, schema)
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        callback: Callable[[str], None] = None
+    ) -> str:
+        """流式生成文本"""
+        self._stage_calls[self._key] += 1
+        return await self._model.generate_stream(prompt, system_prompt, callback)
+
+
+class ModelRouter(BaseModel):
+    """
+    阶段路由模型
+
+    路由键为阶段名（如 intelligent_vote）或 角色.阶段（如 designer.discuss），
+    角色.阶段 优先；未配置路由的阶段使用默认模型。
+    """
+
+    def __init__(self, default_model: BaseModel, routes: Dict[str, BaseModel], **kwargs):
+        """
+        初始化阶段路由模型
+
+        Args:
+            default_model: 默认模型
+            routes: 路由键 -> 模型
+            **kwargs: 其他参数
+        """
+        super().__init__(default_model.model_name, **kwargs)
+        self.default_model = default_model
+        self.routes = dict(routes)
+        self.provider = default_model.provider
+
+        # 各阶段的调用次数（按实际使用的模型，每次模型调用计一次）
+        self.stage_calls: Counter = Counter()
+        self._stage_models: Dict[Tuple[str, int], _StageModel] = {}
+
+    def for_stage(self, stage: str, role: Optional[str] = None) -> BaseModel:
+        """
+        获取某阶段使用的模型
+
+        Args:
+            stage: 阶段名称
+            role: 角色类型
+
+        Returns:
+            模型实例（调用时计入该阶段的调用次数）
+        """
+        model = (role and self.routes.get(f"{role}.{stage}")) or self.routes.get(stage) or self.default_model
+        key = (stage, id(model))
+        if key not in self._stage_models:
+            self._stage_models[key] = _StageModel(
+                model, self.stage_calls, f"{stage}:{model.provider}/{model.model_name}"
+            )
+        return self._stage_models[key]
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        生成文本（默认模型）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+
+        Returns:
+            生成的文本
+        """
+        return await self.default_model.generate(prompt, system_prompt)
+
+    async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
+        """
+        基于图像生成文本（默认模型）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            image_path: 图像路径
+
+        Returns:
+            生成的文本
+        """
+        return await self.default_model.generate_with_image(prompt, system_prompt, image_path)
+
+    async def generate_json(self, prompt: str, system_prompt: str = "", schema: Optional[Dict[str, Any]] = None) -> str:
+        """
+        生成JSON文本（默认模型）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            schema: 输出需满足的JSON Schema
+
+        Returns:
+            JSON文本
+        """
+        return await self.default_model.generate_json(prompt, system_prompt, schema)
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        callback: Callable[[str], None] = None
+    ) -> str:
+        """
+        流式生成文本（默认模型）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            callback: 回调函数，用于处理流式输出
+
+        Returns:
+            生成的完整文本
+        """
+        return await self.default_model.generate_stream(prompt, system_prompt, callback)
+
+    def supports_vision(self) -> bool:
+        """
+        默认模型是否支持图像处理
+
+        Returns:
+            是否支持图像处理
+        """
+        return self.default_model.supports_vision()
+
+    def _unique_models(self) -> List[BaseModel]:
+        """默认模型和各路由模型（去重）"""
+        models: List[BaseModel] = []
+        for model in [self.default_model, *self.routes.values()]:
+            if all(model is not existing for existing in models):
+                models.append(model)
+        return models
+
+    def get_usage(self) -> Dict[str, Any]:
+        """
+        获取用量统计（汇总默认模型和各路由模型）
+
+        Returns:
+            用量统计字典
+        """
+        models = self._unique_models()
+        usages = [model.get_usage() for model in models]
+        keys = ("calls", "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+        totals: Dict[str, Any] = {key: sum(usage.get(key, 0) for usage in usages) for key in keys}
+        totals["cache_hit_rate"] = (
+            round(totals["cache_read_tokens"] / totals["input_tokens"], 4) if totals["input_tokens"] else 0.0
+        )
+        totals["stage_calls"] = dict(self.stage_calls)
+        totals["models"] = [
+            {"provider": model.provider, "model": model.model_name, "usage": usage}
+            for model, usage in zip(models, usages)
+        ]
+        return totals
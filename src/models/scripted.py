@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+脚本化模型模块 - 确定性的离线模型，用于基准测试和本地调试（不调用任何API）
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+import zlib
+from typing import Callable, Dict, Any, List, Optional
+
+from src.models.base import BaseModel
+
+# 生成内容使用的词汇表
+SCRIPTED_KEYWORDS = [
+    "剪纸纹样", "对称构图", "吉祥寓意", "中国红", "蝴蝶图案", "镂空工艺", "民族文化",
+    "非遗传承", "现代审美", "文创产品", "手工质感", "节庆礼品", "色彩搭配", "材料创新",
+    "年轻用户", "家居装饰", "传统技艺", "品牌故事", "批量生产", "环保材料"
+]
+
+# 提示词中随运行时间变化的内容（时间戳、UUID、毫秒时间戳构成的ID），计算随机种子前替换掉，
+# 使同样的会议流程在不同时间运行得到同样的输出
+VOLATILE_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|\d{10,}(?:\.\d+)?"
+)
+
+SCRIPTED_SENTENCES = [
+    "我觉得{0}和{1}的结合很有潜力。",
+    "从我的经验来看，{0}需要兼顾{1}。",
+    "如果把{0}做成日常用品，{1}会更容易被接受。",
+    "{0}是这次讨论里最打动我的部分。",
+    "我们可以先从{0}入手，再考虑{1}的成本。",
+    "用户其实很在意{0}，尤其是{1}带来的情感价值。"
+]
+
+
+class ScriptedModel(BaseModel):
+    """
+    脚本化模型
+
+    根据提示词类型返回确定性的内容（讨论发言、JSON关键词列表、投票结果），
+    并按配置的首字延迟和生成速度模拟耗时。
+    """
+
+    def __init__(
+        self,
+        model_name: str = "scripted",
+        latency: float = 0.05,
+        tokens_per_second: float = 200.0,
+        response_tokens: int = 120,
+        keyword_count: int = 6,
+        seed: int = 0,
+        vision: bool = True,
+        **kwargs
+    ):
+        """
+        初始化脚本化模型
+
+        Args:
+            model_name: 模型名称
+            latency: 首字延迟（秒）
+            tokens_per_second: 生成速度（token/秒，0表示不模拟生成耗时）
+            response_tokens: 普通发言的目标token数（按字符近似）
+            keyword_count: 关键词提取返回的关键词数量
+            seed: 随机种子
+            vision: 是否模拟支持图像
+            **kwargs: 其他参数
+        """
+        super().__init__(model_name, **kwargs)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.keyword_count = keyword_count
+        self.seed = seed
+        self.vision = vision
+        self.logger = logging.getLogger(f"model.scripted.{model_name}")
+
+        # 调用统计
+        self.call_count = 0
+        self.prompt_chars = 0
+        self.output_tokens = 0
+        self.simulated_seconds = 0.0  # 各次调用的模拟耗时之和（并发调用会重复计算）
+
+        # 至少有一个调用在进行中的总时长（各调用时间区间的并集，即模型在关键路径上的耗时）
+        self.busy_seconds = 0.0
+        self._in_flight = 0
+        self._busy_since = 0.0
+
+        # 模拟提供商的前缀缓存：见过的系统提示词再次出现时计为缓存命中
+        self._cached_system_prompts = set()
+
+    def _rng(self, prompt: str, system_prompt: str) -> random.Random:
+        """同样的输入得到同样的输出（忽略时间戳和生成的ID）"""
+        text = VOLATILE_PATTERN.sub("#", f"{self.seed}|{system_prompt}|{prompt}")
+        return random.Random(zlib.crc32(text.encode("utf-8")))
+
+    @staticmethod
+    def _count_tokens(text: str) -> int:
+        """粗略估算token数：每个中文字符、每个英文单词各算一个"""
+        return len(re.findall(r"[一-鿿]|[A-Za-z0-9]+", text))
+
+    def _respond(self, prompt: str, system_prompt: str) -> str:
+        """根据提示词类型生成回复"""
+        rng = self._rng(prompt, system_prompt)
+
+        # 批量投票：按参会者ID返回JSON对象
+        voters = re.findall(r"^- (\S+?)：", prompt, re.MULTILINE)
+        candidates_match = re.search(r"候选关键词[:：]\s*\n?\s*(.+)", prompt)
+        if voters and candidates_match and "按参会者ID返回JSON" in prompt:
+            candidates = [k.strip() for k in candidates_match.group(1).split(",") if k.strip()]
+            count_match = re.search(r"各选择最重要的(\d+)个关键词", prompt)
+            count = int(count_match.group(1)) if count_match else 5
+            return json.dumps(
+                {voter: rng.sample(candidates, min(count, len(candidates))) for voter in voters},
+                ensure_ascii=False
+            )
+
+        # 投票：从候选关键词中选择
+        candidates_match = re.search(r"候选关键词[:：]\s*\n?\s*(.+)", prompt)
+        if candidates_match:
+            candidates = [k.strip() for k in candidates_match.group(1).split(",") if k.strip()]
+            count_match = re.search(r"选择最重要的(\d+)个关键词", prompt)
+            count = int(count_match.group(1)) if count_match else 5
+            return ", ".join(rng.sample(candidates, min(count, len(candidates))))
+
+        # 关键词提取：返回JSON列表
+        if "JSON格式返回关键词" in prompt:
+            keywords = rng.sample(SCRIPTED_KEYWORDS, self.keyword_count)
+            if '"keywords"' in prompt:
+                return json.dumps({"keywords": keywords}, ensure_ascii=False)
+            return json.dumps(keywords, ensure_ascii=False)
+
+        # 其他：生成长度约为response_tokens的发言
+        parts = []
+        length = 0
+        while length < self.response_tokens:
+            sentence = rng.choice(SCRIPTED_SENTENCES).format(*rng.sample(SCRIPTED_KEYWORDS, 2))
+            parts.append(sentence)
+            length += self._count_tokens(sentence)
+        return "".join(parts)
+
+    async def _simulate(self, prompt: str, system_prompt: str, callback: Optional[Callable[[str], None]] = None) -> str:
+        """模拟一次模型调用"""
+        response = self._respond(prompt, system_prompt)
+        tokens = self._count_tokens(response)
+        generation_time = tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+        self.call_count += 1
+        self.prompt_chars += len(prompt) + len(system_prompt)
+        self.output_tokens += tokens
+        self.simulated_seconds += self.latency + generation_time
+
+        system_tokens = self._count_tokens(system_prompt)
+        cached = self.prompt_cache and system_prompt in self._cached_system_prompts
+        if self.prompt_cache and system_prompt:
+            self._cached_system_prompts.add(system_prompt)
+        self.record_usage(
+            input_tokens=self._count_tokens(prompt) + system_tokens,
+            output_tokens=tokens,
+            cache_read_tokens=system_tokens if cached else 0,
+            cache_write_tokens=system_tokens if self.prompt_cache and system_prompt and not cached else 0,
+            response_seconds=self.latency + generation_time,
+            first_token_seconds=self.latency if callback else None
+        )
+
+        if self._in_flight == 0:
+            self._busy_since = time.perf_counter()
+        self._in_flight += 1
+        try:
+            await asyncio.sleep(self.latency)
+            if callback:
+                # 流式输出：分块回调
+                chunks = re.findall(r".{1,8}", response, re.DOTALL) or [""]
+                for chunk in chunks:
+                    await asyncio.sleep(generation_time / len(chunks))
+                    callback(chunk)
+            else:
+                await asyncio.sleep(generation_time)
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self.busy_seconds += time.perf_counter() - self._busy_since
+
+        return response
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        生成文本
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+
+        Returns:
+            生成的文本
+        """
+        return await self._simulate(prompt, system_prompt)
+
+    async def generate_with_image(self, prompt: str, system_prompt: str, image_path: str) -> str:
+        """
+        基于图像生成文本（忽略图像内容）
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            image_path: 图像路径
+
+        Returns:
+            生成的文本
+        """
+        return await self._simulate(prompt, system_prompt)
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        callback: Callable[[str], None] = None
+    ) -> str:
+        """
+        流式生成文本
+
+        Args:
+            prompt: 提示词
+            system_prompt: 系统提示词
+            callback: 回调函数，用于处理流式输出
+
+        Returns:
+            生成的完整文本
+        """
+        return await self._simulate(prompt, system_prompt, callback)
+
+    def supports_vision(self) -> bool:
+        """
+        是否支持图像处理
+
+        Returns:
+            是否支持图像处理
+        """
+        return self.vision
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取调用统计
+
+        Returns:
+            统计信息字典
+        """
+        return {
+            "calls": self.call_count,
+            "prompt_chars": self.prompt_chars,
+            "output_tokens": self.output_tokens,
+            "simulated_seconds": round(self.simulated_seconds, 3),
+            "busy_seconds": round(self.busy_seconds, 3),
+            "usage": self.get_usage()
+        }
@@ -9,7 +9,7 @@ UI增强模块
 from .enhanced_colors import EnhancedColors
 from .icons import Icons, ASCIIArt, Decorations
 from .ui_components import UIComponents, Panel, ProgressBar, Menu, StatusIndicator, AgentCard
-from .animations import Animations, LoadingSpinner, ProgressTracker
+from .animations import Animations, LoadingSpinner, ProgressTracker, StatusRenderer, get_status_renderer
 from .themes import ThemeManager, theme_manager, primary, secondary, success, warning, error, info, text, muted, accent
 
 __all__ = [
@@ -26,6 +26,8 @@ __all__ = [
     'Animations',
     'LoadingSpinner',
     'ProgressTracker',
+    'StatusRenderer',
+    'get_status_renderer',
     'ThemeManager',
     'theme_manager',
     'primary',
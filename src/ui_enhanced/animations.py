@@ -8,11 +8,16 @@
 
 import time
 import sys
+import asyncio
 import threading
-from typing import List, Callable, Optional
+from typing import Dict, List, Callable, Optional
 from .enhanced_colors import EnhancedColors
 from .icons import ASCIIArt
 
+# 清除当前行 / 光标上移一行
+CLEAR_LINE = "\r\x1b[2K"
+CURSOR_UP = "\x1b[1A"
+
 
 class Animations:
     """动画效果类"""
@@ -137,14 +142,153 @@ class Animations:
         print()  # 换行
 
 
+class StatusRenderer:
+    """
+    终端状态行渲染器
+
+    所有活动的加载动画和进度条作为状态行显示在终端底部，由事件循环上的一个刷新任务
+    统一重绘（多个智能体同时思考时各占一行）。终端的全部写入都在同一把锁下进行：
+    普通输出经 write/print 写在状态行上方，不会与动画帧交错。没有状态行时刷新任务自动结束。
+    """
+
+    REFRESH_INTERVAL = 0.1  # 刷新间隔（秒）
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._items: Dict[int, Callable[[int], str]] = {}
+        self._next_id = 0
+        self._frame = 0
+        self._drawn_lines = 0
+        self._partial = ""  # 状态行上方尚未换行的输出
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def available() -> bool:
+        """是否在事件循环中（可以使用刷新任务）"""
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    def add(self, render: Callable[[int], str]) -> int:
+        """
+        添加状态行
+
+        Args:
+            render: 根据帧序号返回状态行文本的函数
+
+        Returns:
+            状态行ID
+        """
+        with self.lock:
+            item_id = self._next_id
+            self._next_id += 1
+            self._items[item_id] = render
+            self._redraw()
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return item_id
+
+    def remove(self, item_id: int) -> None:
+        """
+        移除状态行（立即从终端清除）
+
+        Args:
+            item_id: 状态行ID
+        """
+        with self.lock:
+            if self._items.pop(item_id, None) is None:
+                return
+            self._redraw()
+
+    def refresh(self) -> None:
+        """立即重绘状态行（如进度更新后）"""
+        with self.lock:
+            self._redraw()
+
+    def write(self, text: str) -> None:
+        """
+        在状态行上方写入文本
+
+        Args:
+            text: 文本
+        """
+        with self.lock:
+            if not self._items and not self._drawn_lines:
+                self._stream.write(text)
+                self._stream.flush()
+                self._partial = text.rpartition("\n")[2] if "\n" in text else self._partial + text
+                return
+
+            self._clear()
+            head, newline, self._partial = (self._partial + text).rpartition("\n")
+            self._stream.write(head + newline)
+            self._draw()
+
+    def print(self, *args, sep: str = " ", end: str = "\n", flush: bool = False, **kwargs) -> None:
+        """与print签名兼容的输出函数"""
+        self.write(sep.join(str(arg) for arg in args) + end)
+
+    @property
+    def _stream(self):
+        # 每次写入时取sys.stdout，兼容redirect_stdout
+        return sys.stdout
+
+    def _clear(self) -> None:
+        """清除已绘制的状态行和未换行的输出，光标回到第一行行首"""
+        if self._drawn_lines:
+            self._stream.write(CLEAR_LINE + (CURSOR_UP + CLEAR_LINE) * (self._drawn_lines - 1))
+            self._drawn_lines = 0
+        elif self._partial:
+            self._stream.write(CLEAR_LINE)
+
+    def _draw(self) -> None:
+        """先写回未换行的输出，再绘制状态行"""
+        lines = [self._partial] if self._partial else []
+        lines.extend(render(self._frame) for render in list(self._items.values()))
+        self._stream.write("\n".join(lines))
+        self._stream.flush()
+        self._drawn_lines = len(lines) if self._items else 0
+
+    def _redraw(self) -> None:
+        self._clear()
+        self._draw()
+
+    async def _run(self) -> None:
+        """刷新循环"""
+        while self._items:
+            await asyncio.sleep(self.REFRESH_INTERVAL)
+            with self.lock:
+                if not self._items:
+                    break
+                self._frame += 1
+                self._redraw()
+
+
+_status_renderer = StatusRenderer()
+
+
+def get_status_renderer() -> StatusRenderer:
+    """获取全局状态行渲染器"""
+    return _status_renderer
+
+
 class LoadingSpinner:
-    """加载动画类（可控制的）"""
+    """
+    加载动画类（可控制的）
+
+    在事件循环中作为状态行交给StatusRenderer统一刷新（不创建线程）；
+    在同步代码中仍使用后台线程。
+    """
     
     def __init__(self, message: str = "加载中", style: str = "spinner"):
         self.message = message
         self.style = style
         self.running = False
         self.thread = None
+        self._status_id = None
         
         self.styles = {
             "spinner": ASCIIArt.LOADING_FRAMES,
@@ -159,39 +303,63 @@ class LoadingSpinner:
             return
         
         self.running = True
+        renderer = get_status_renderer()
+        if renderer.available():
+            self._status_id = renderer.add(self.render_frame)
+            return
+
         self.thread = threading.Thread(target=self._animate)
         self.thread.daemon = True
         self.thread.start()
     
     def stop(self):
         """停止动画"""
+        if not self.running:
+            return
         self.running = False
+
+        if self._status_id is not None:
+            get_status_renderer().remove(self._status_id)
+            self._status_id = None
+            return
+
         if self.thread:
             self.thread.join()
         
         # 清除动画
-        sys.stdout.write('\r' + ' ' * (len(self.message) + 10) + '\r')
-        sys.stdout.flush()
+        with get_status_renderer().lock:
+            sys.stdout.write('\r' + ' ' * (len(self.message) + 10) + '\r')
+            sys.stdout.flush()
+
+    def render_frame(self, frame_index: int) -> str:
+        """
+        渲染一帧
+
+        Args:
+            frame_index: 帧序号
+
+        Returns:
+            动画文本
+        """
+        frames = self.styles.get(self.style, self.styles["spinner"])
+        colored_frame = EnhancedColors.bright_cyan(frames[frame_index % len(frames)])
+        return f"{colored_frame} {self.message}..."
     
     def _animate(self):
-        """动画循环"""
-        frames = self.styles.get(self.style, self.styles["spinner"])
+        """动画循环（同步代码中使用的后台线程）"""
         frame_index = 0
         
         while self.running:
-            frame = frames[frame_index % len(frames)]
-            colored_frame = EnhancedColors.bright_cyan(frame)
-            text = f"\r{colored_frame} {self.message}..."
-            
-            sys.stdout.write(text)
-            sys.stdout.flush()
+            with get_status_renderer().lock:
+                sys.stdout.write("\r" + self.render_frame(frame_index))
+                sys.stdout.flush()
             
             time.sleep(0.1)
             frame_index += 1
 
 
 class ProgressTracker:
-    """进度跟踪器（可控制的）"""
+    """进度跟踪器（可控制的，在事件循环中作为状态行显示）"""
     
     def __init__(self, total: int, message: str = "处理中", width: int = 30):
         self.total = total
@@ -199,6 +367,7 @@ class ProgressTracker:
         self.message = message
         self.width = width
         self.start_time = time.time()
+        self._status_id = None
     
     def update(self, current: int, message: str = None):
         """更新进度"""
@@ -220,21 +389,45 @@ class ProgressTracker:
         """完成进度"""
         self.current = self.total
         self.message = message
+
+        renderer = get_status_renderer()
+        if self._status_id is not None:
+            renderer.remove(self._status_id)
+            self._status_id = None
+            renderer.write(self.render_line() + "\n")
+            return
+
         self._render()
         print()  # 换行
-    
-    def _render(self):
-        """渲染进度条"""
+
+    def render_line(self, frame_index: int = 0) -> str:
+        """
+        渲染进度行
+
+        Args:
+            frame_index: 帧序号（进度条不使用）
+
+        Returns:
+            进度行文本
+        """
         from .ui_components import ProgressBar
         
         progress_bar = ProgressBar(self.total, self.width)
         progress_bar.current = self.current
         progress_bar.start_time = self.start_time
         
-        bar_text = progress_bar.render()
-        
-        sys.stdout.write(f'\r{self.message}: {bar_text}')
-        sys.stdout.flush()
+        return f"{self.message}: {progress_bar.render()}"
+    
+    def _render(self):
+        """渲染进度条"""
+        renderer = get_status_renderer()
+        if self._status_id is not None:
+            renderer.refresh()
+        elif renderer.available():
+            self._status_id = renderer.add(self.render_line)
+        else:
+            sys.stdout.write(f'\r{self.render_line()}')
+            sys.stdout.flush()
 
 
 # 便捷函数
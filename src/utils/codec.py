@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+记录编解码模块 - 记忆和发言记录的紧凑序列化（msgpack/JSON，可选zstd压缩）
+
+编码结果带1字节头部，解码时按头部自动识别格式，因此切换编码方式后旧数据仍可读取。
+"""
+
+import json
+import logging
+from typing import Any, Optional
+
+# 可选依赖：msgpack（更紧凑、解码更快）
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# 可选依赖：zstandard（压缩较长的内容）
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# 头部：低7位为格式，最高位表示zstd压缩
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FLAG_ZSTD = 0x80
+
+logger = logging.getLogger("codec")
+
+
+class RecordCodec:
+    """
+    记录编解码器
+
+    encode输出 bytes（1字节头部 + 载荷），decode接受任意本模块编码过的数据。
+    """
+
+    def __init__(self, format_name: str = "msgpack", compress_threshold: int = 0, compress_level: int = 3):
+        """
+        初始化编解码器
+
+        Args:
+            format_name: 编码格式（msgpack/json），msgpack不可用时回退到json
+            compress_threshold: 载荷超过该字节数时使用zstd压缩（0表示不压缩，需安装zstandard）
+            compress_level: zstd压缩级别
+        """
+        format_name = (format_name or "json").lower()
+        if format_name == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.info("msgpack未安装，使用json编码")
+            format_name = "json"
+        if format_name not in ("msgpack", "json"):
+            raise ValueError(f"不支持的编码格式: {format_name}")
+
+        self.format_name = format_name
+        self.compress_threshold = compress_threshold if ZSTD_AVAILABLE else 0
+        self._compressor = zstandard.ZstdCompressor(level=compress_level) if self.compress_threshold else None
+        self._decompressor = None
+
+    def encode(self, record: Any) -> bytes:
+        """
+        编码记录
+
+        Args:
+            record: 可序列化的记录（dict/list/str/数字）
+
+        Returns:
+            编码后的bytes
+        """
+        if self.format_name == "msgpack":
+            header = FORMAT_MSGPACK
+            payload = msgpack.packb(record, use_bin_type=True, default=str)
+        else:
+            header = FORMAT_JSON
+            payload = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+        if self._compressor is not None and len(payload) > self.compress_threshold:
+            header |= FLAG_ZSTD
+            payload = self._compressor.compress(payload)
+
+        return bytes((header,)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        """
+        解码记录
+
+        Args:
+            data: encode的输出
+
+        Returns:
+            原始记录
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not data:
+            raise ValueError("空数据无法解码")
+
+        header = data[0]
+        payload = data[1:]
+
+        if header & FLAG_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise ValueError("数据使用zstd压缩，但未安装zstandard")
+            if self._decompressor is None:
+                self._decompressor = zstandard.ZstdDecompressor()
+            payload = self._decompressor.decompress(payload)
+
+        record_format = header & ~FLAG_ZSTD
+        if record_format == FORMAT_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                raise ValueError("数据使用msgpack编码，但未安装msgpack")
+            return msgpack.unpackb(payload, raw=False)
+        if record_format == FORMAT_JSON:
+            return json.loads(payload.decode("utf-8"))
+
+        raise ValueError(f"未知的编码头部: {header:#x}")
+
+
+_default_codec: Optional[RecordCodec] = None
+
+
+def get_record_codec(settings: Any = None) -> RecordCodec:
+    """
+    获取按Redis配置创建的编解码器（进程内共享）
+
+    Args:
+        settings: Redis配置（RedisSettings），None时读取环境配置
+
+    Returns:
+        编解码器实例
+    """
+    global _default_codec
+    if settings is not None:
+        return RecordCodec(settings.MEMORY_CODEC, settings.MEMORY_COMPRESS_THRESHOLD)
+    if _default_codec is None:
+        from src.config.redis_config import RedisSettings
+        redis_settings = RedisSettings()
+        _default_codec = RecordCodec(redis_settings.MEMORY_CODEC, redis_settings.MEMORY_COMPRESS_THRESHOLD)
+    return _default_codec
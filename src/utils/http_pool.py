@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP连接池模块 - 进程内共享的aiohttp会话（同一事件循环上的多场会议复用连接）
+"""
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+# aiohttp在首次创建会话时才导入（不调用HTTP接口的运行模式无需加载）
+if TYPE_CHECKING:
+    import aiohttp
+
+# 默认连接池大小
+DEFAULT_POOL_SIZE = 100
+DEFAULT_POOL_SIZE_PER_HOST = 0  # 0表示不限制单个主机
+
+logger = logging.getLogger("http_pool")
+
+# 每个事件循环一个会话（aiohttp会话不能跨事件循环使用）
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+_pool_size = DEFAULT_POOL_SIZE
+_pool_size_per_host = DEFAULT_POOL_SIZE_PER_HOST
+
+
+def configure_http_pool(pool_size: int = DEFAULT_POOL_SIZE, pool_size_per_host: int = DEFAULT_POOL_SIZE_PER_HOST) -> None:
+    """
+    配置连接池大小（只影响之后创建的会话）
+
+    Args:
+        pool_size: 连接总数上限
+        pool_size_per_host: 单个主机的连接数上限（0表示不限制）
+    """
+    global _pool_size, _pool_size_per_host
+    _pool_size = pool_size
+    _pool_size_per_host = pool_size_per_host
+
+
+def get_http_session() -> "aiohttp.ClientSession":
+    """
+    获取当前事件循环的共享会话（不存在或已关闭时创建）
+
+    Returns:
+        共享的aiohttp会话
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=_pool_size, limit_per_host=_pool_size_per_host)
+        session = aiohttp.ClientSession(connector=connector)
+        _sessions[loop] = session
+        logger.debug(f"创建共享HTTP会话，连接池大小: {_pool_size}")
+    return session
+
+
+@asynccontextmanager
+async def http_session() -> AsyncIterator["aiohttp.ClientSession"]:
+    """
+    以 async with 方式使用共享会话（退出时不关闭会话）
+
+    Yields:
+        共享的aiohttp会话
+    """
+    yield get_http_session()
+
+
+async def close_http_session() -> None:
+    """关闭当前事件循环的共享会话"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    session: Optional["aiohttp.ClientSession"] = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+        logger.debug("共享HTTP会话已关闭")
@@ -191,17 +191,11 @@ class ImageProcessor:
                 self.logger.error(f"豆包API生成图像失败: {image_urls}")
                 return None
 
-            # 检查是否有失败的图像
-            valid_urls = [url for url in image_urls if not url.startswith("生成失败")]
-            if not valid_urls:
-                self.logger.error(f"豆包API生成的所有图像都失败: {image_urls}")
-                return None
-
-            # 处理多张图像
+            # 处理多张图像（生成失败时 generate_image 抛出 ModelError）
             image_paths = []
             timestamp = int(time.time())
 
-            for i, image_url in enumerate(valid_urls):
+            for i, image_url in enumerate(image_urls):
                 try:
                     # 下载图像
                     image_data = requests.get(image_url).content
@@ -8,7 +8,6 @@
 import os
 import logging
 from typing import Tuple, Optional
-from PIL import Image, ImageOps
 import io
 
 
@@ -50,6 +49,8 @@ class ImageCompressor:
         Returns:
             图像信息字典
         """
+        from PIL import Image  # 首次处理图像时才加载PIL
+
         try:
             with Image.open(image_path) as img:
                 file_size = os.path.getsize(image_path)
@@ -121,6 +122,8 @@ class ImageCompressor:
         Returns:
             压缩后的图像路径
         """
+        from PIL import Image, ImageOps
+
         try:
             # 获取原始图像信息
             original_info = self.get_image_info(input_path)
@@ -0,0 +1,432 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程内Redis替身 - 无需Redis服务即可运行会议（用于基准测试和本地调试）
+
+只实现本项目用到的命令子集，行为与 redis.asyncio（decode_responses=False）保持一致：
+键、成员和哈希值均以bytes返回。
+"""
+
+import asyncio
+import fnmatch
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _to_bytes(value: Any) -> bytes:
+    """与redis-py一致的值编码"""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, float):
+        return repr(value).encode("utf-8")
+    return str(value).encode("utf-8")
+
+
+class InMemoryPipeline:
+    """管道：缓存命令，execute时按顺序执行（一次往返）"""
+
+    def __init__(self, client: "InMemoryRedis"):
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not hasattr(self._client, f"_cmd_{name}"):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs) -> "InMemoryPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        """执行缓存的命令（raise_on_error为False时出错的命令以异常对象作为结果）"""
+        self._client.round_trips += 1
+        self._client.pipeline_count += 1
+        commands, self._commands = self._commands, []
+        results = []
+        for name, args, kwargs in commands:
+            try:
+                results.append(self._client._dispatch(name, args, kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+
+    async def __aenter__(self) -> "InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._commands = []
+
+
+class InMemoryRedis:
+    """
+    进程内Redis替身
+
+    支持字符串、哈希、有序集合、流的常用命令、键过期和管道；
+    记录每个命令的调用次数和往返次数，供基准测试统计。
+    """
+
+    def __init__(self):
+        self._data: Dict[bytes, Any] = {}
+        self._expires: Dict[bytes, float] = {}
+        self.command_counts: Counter = Counter()
+        self.round_trips = 0
+        self.pipeline_count = 0
+        self._stream_added: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------------
+    # 基础设施
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, name: str, args: tuple, kwargs: dict) -> Any:
+        """执行单个命令并计数"""
+        self.command_counts[name] += 1
+        return getattr(self, f"_cmd_{name}")(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not hasattr(type(self), f"_cmd_{name}"):
+            raise AttributeError(name)
+
+        async def command(*args, **kwargs) -> Any:
+            self.round_trips += 1
+            return self._dispatch(name, args, kwargs)
+
+        return command
+
+    def _alive(self, key: bytes) -> bool:
+        """惰性过期检查"""
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return False
+        return key in self._data
+
+    def _get(self, key: Any, kind: type) -> Optional[Any]:
+        """获取指定类型的值，不存在时返回None"""
+        key = _to_bytes(key)
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        if type(value) is not kind:
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _get_or_create(self, key: Any, kind: type) -> Any:
+        """获取指定类型的值，不存在时创建"""
+        value = self._get(key, kind)
+        if value is None:
+            value = kind()
+            self._data[_to_bytes(key)] = value
+        return value
+
+    def pipeline(self, transaction: bool = True) -> InMemoryPipeline:
+        """创建管道"""
+        return InMemoryPipeline(self)
+
+    def reset_stats(self) -> None:
+        """重置命令统计"""
+        self.command_counts.clear()
+        self.round_trips = 0
+        self.pipeline_count = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取命令统计
+
+        Returns:
+            {"commands": 命令总数, "round_trips": 往返次数, "pipelines": 管道次数, "by_command": {...}}
+        """
+        return {
+            "commands": sum(self.command_counts.values()),
+            "round_trips": self.round_trips,
+            "pipelines": self.pipeline_count,
+            "by_command": dict(sorted(self.command_counts.items()))
+        }
+
+    async def close(self) -> None:
+        """关闭连接（无操作）"""
+
+    async def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None):
+        """遍历匹配的键"""
+        self.round_trips += 1
+        self.command_counts["scan"] += 1
+        for key in self._cmd_keys(match or "*"):
+            yield key
+
+    # ------------------------------------------------------------------
+    # 通用命令
+    # ------------------------------------------------------------------
+
+    def _cmd_ping(self) -> bool:
+        return True
+
+    def _cmd_info(self, section: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "redis_version": "in-memory",
+            "used_memory_human": "N/A",
+            "db0": {"keys": len(self._data)}
+        }
+
+    def _cmd_keys(self, pattern: str = "*") -> List[bytes]:
+        pattern_bytes = _to_bytes(pattern)
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern_bytes)]
+
+    def _cmd_exists(self, *keys: Any) -> int:
+        return sum(1 for key in keys if self._alive(_to_bytes(key)))
+
+    def _cmd_delete(self, *keys: Any) -> int:
+        deleted = 0
+        for key in keys:
+            key = _to_bytes(key)
+            if self._alive(key):
+                deleted += 1
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return deleted
+
+    def _cmd_expire(self, key: Any, seconds: int) -> bool:
+        key = _to_bytes(key)
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.time() + seconds
+        return True
+
+    def _cmd_ttl(self, key: Any) -> int:
+        key = _to_bytes(key)
+        if not self._alive(key):
+            return -2
+        deadline = self._expires.get(key)
+        return -1 if deadline is None else max(0, int(deadline - time.time()))
+
+    def _cmd_flushdb(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    # ------------------------------------------------------------------
+    # 字符串
+    # ------------------------------------------------------------------
+
+    def _cmd_get(self, key: Any) -> Optional[bytes]:
+        return self._get(key, bytes)
+
+    def _cmd_set(self, key: Any, value: Any, ex: Optional[int] = None) -> bool:
+        key = _to_bytes(key)
+        self._data[key] = _to_bytes(value)
+        self._expires.pop(key, None)
+        if ex:
+            self._expires[key] = time.time() + ex
+        return True
+
+    # ------------------------------------------------------------------
+    # 哈希
+    # ------------------------------------------------------------------
+
+    def _cmd_hset(self, name: Any, key: Any = None, value: Any = None, mapping: Optional[Dict] = None) -> int:
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        hash_value = self._get_or_create(name, dict)
+        added = 0
+        for field, field_value in items.items():
+            field = _to_bytes(field)
+            if field not in hash_value:
+                added += 1
+            hash_value[field] = _to_bytes(field_value)
+        return added
+
+    def _cmd_hget(self, name: Any, key: Any) -> Optional[bytes]:
+        hash_value = self._get(name, dict)
+        return hash_value.get(_to_bytes(key)) if hash_value else None
+
+    def _cmd_hgetall(self, name: Any) -> Dict[bytes, bytes]:
+        hash_value = self._get(name, dict)
+        return dict(hash_value) if hash_value else {}
+
+    def _cmd_hincrby(self, name: Any, key: Any, amount: int = 1) -> int:
+        hash_value = self._get_or_create(name, dict)
+        field = _to_bytes(key)
+        new_value = int(hash_value.get(field, b"0")) + amount
+        hash_value[field] = _to_bytes(new_value)
+        return new_value
+
+    # ------------------------------------------------------------------
+    # 有序集合（以 {member: score} 存储，查询时排序）
+    # ------------------------------------------------------------------
+
+    def _sorted_members(self, name: Any) -> List[bytes]:
+        zset = self._get(name, _SortedSet)
+        if not zset:
+            return []
+        return [member for member, _ in sorted(zset.items(), key=lambda item: (item[1], item[0]))]
+
+    @staticmethod
+    def _slice(members: List[bytes], start: int, end: int) -> List[bytes]:
+        """按Redis的闭区间语义截取（支持负数下标）"""
+        size = len(members)
+        if start < 0:
+            start = max(0, size + start)
+        if end < 0:
+            end = size + end
+        return members[start:end + 1] if start <= end else []
+
+    def _cmd_zadd(self, name: Any, mapping: Dict[Any, float]) -> int:
+        zset = self._get_or_create(name, _SortedSet)
+        added = 0
+        for member, score in mapping.items():
+            member = _to_bytes(member)
+            if member not in zset:
+                added += 1
+            zset[member] = float(score)
+        return added
+
+    def _cmd_zcard(self, name: Any) -> int:
+        zset = self._get(name, _SortedSet)
+        return len(zset) if zset else 0
+
+    def _cmd_zrange(self, name: Any, start: int, end: int) -> List[bytes]:
+        return self._slice(self._sorted_members(name), start, end)
+
+    def _cmd_zrevrange(self, name: Any, start: int, end: int) -> List[bytes]:
+        return self._slice(list(reversed(self._sorted_members(name))), start, end)
+
+    def _cmd_zrem(self, name: Any, *members: Any) -> int:
+        zset = self._get(name, _SortedSet)
+        if not zset:
+            return 0
+        removed = 0
+        for member in members:
+            if zset.pop(_to_bytes(member), None) is not None:
+                removed += 1
+        return removed
+
+    def _cmd_zremrangebyrank(self, name: Any, start: int, end: int) -> int:
+        zset = self._get(name, _SortedSet)
+        if not zset:
+            return 0
+        to_remove = self._slice(self._sorted_members(name), start, end)
+        for member in to_remove:
+            del zset[member]
+        return len(to_remove)
+
+
+    # ------------------------------------------------------------------
+    # 流（以 [(id, fields)] 存储，id 为 "毫秒-序号"）
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_stream_id(stream_id: Any, default_seq: int = 0) -> Tuple[int, int]:
+        """解析流ID（"-"/"+" 表示最小/最大）"""
+        stream_id = stream_id.decode("utf-8") if isinstance(stream_id, bytes) else str(stream_id)
+        if stream_id == "-":
+            return (0, 0)
+        if stream_id == "+":
+            return (2 ** 64, 0)
+        ms, _, seq = stream_id.partition("-")
+        return (int(ms), int(seq) if seq else default_seq)
+
+    def _cmd_xadd(
+        self,
+        name: Any,
+        fields: Dict[Any, Any],
+        id: Any = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True
+    ) -> bytes:
+        stream = self._get_or_create(name, _Stream)
+        last = self._parse_stream_id(stream[-1][0]) if stream else (0, 0)
+        if id == "*":
+            ms = int(time.time() * 1000)
+            entry = (ms, 0) if ms > last[0] else (last[0], last[1] + 1)
+        else:
+            entry = self._parse_stream_id(id)
+            if entry <= last:
+                raise ValueError("ERR The ID specified in XADD is equal or smaller than the target stream top item")
+
+        entry_id = f"{entry[0]}-{entry[1]}".encode("utf-8")
+        stream.append((entry_id, {_to_bytes(k): _to_bytes(v) for k, v in fields.items()}))
+        if maxlen is not None and len(stream) > maxlen:
+            del stream[:len(stream) - maxlen]
+
+        if self._stream_added is not None:
+            self._stream_added.set()
+        return entry_id
+
+    def _cmd_xlen(self, name: Any) -> int:
+        stream = self._get(name, _Stream)
+        return len(stream) if stream else 0
+
+    def _stream_range(self, name: Any, low: Any, high: Any) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        stream = self._get(name, _Stream)
+        if not stream:
+            return []
+        low_id = self._parse_stream_id(low)
+        high_id = self._parse_stream_id(high, default_seq=2 ** 64)
+        return [
+            (entry_id, dict(fields)) for entry_id, fields in stream
+            if low_id <= self._parse_stream_id(entry_id) <= high_id
+        ]
+
+    def _cmd_xrange(self, name: Any, min: Any = "-", max: Any = "+", count: Optional[int] = None) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        entries = self._stream_range(name, min, max)
+        return entries[:count] if count is not None else entries
+
+    def _cmd_xrevrange(self, name: Any, max: Any = "+", min: Any = "-", count: Optional[int] = None) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        entries = list(reversed(self._stream_range(name, min, max)))
+        return entries[:count] if count is not None else entries
+
+    def _cmd_xread(self, streams: Dict[Any, Any], count: Optional[int] = None, block: Optional[int] = None) -> List[Any]:
+        result = []
+        for name, last_id in streams.items():
+            stream = self._get(name, _Stream)
+            if not stream:
+                continue
+            after = self._parse_stream_id(last_id)
+            entries = [
+                (entry_id, dict(fields)) for entry_id, fields in stream
+                if self._parse_stream_id(entry_id) > after
+            ]
+            if count is not None:
+                entries = entries[:count]
+            if entries:
+                result.append([_to_bytes(name), entries])
+        return result
+
+    async def xread(self, streams: Dict[Any, Any], count: Optional[int] = None, block: Optional[int] = None) -> List[Any]:
+        """读取流中的新条目（block为毫秒，0表示一直等待）"""
+        self.round_trips += 1
+        result = self._dispatch("xread", (streams,), {"count": count})
+        if result or block is None:
+            return result
+
+        # 阻塞读取：等待新条目写入后重新检查
+        deadline = None if block == 0 else time.monotonic() + block / 1000
+        while not result:
+            if self._stream_added is None:
+                self._stream_added = asyncio.Event()
+            self._stream_added.clear()
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._stream_added.wait(), timeout)
+            except asyncio.TimeoutError:
+                break
+            result = self._cmd_xread(streams, count=count)
+        return result
+
+
+class _Stream(list):
+    """流的存储类型"""
+
+
+class _SortedSet(dict):
+    """有序集合的存储类型（与普通哈希区分）"""
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关键词归一化与聚类模块 - 投票前合并近似重复的关键词（如"对称美学"和"对称的美学"）
+
+归一化后完全相同的关键词直接合并；其余按字符二元组余弦相似度超过阈值的关键词用并查集
+合并为一组。每组以被提出次数最多的写法作为代表，并记录提出该关键词的智能体。
+"""
+
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Sequence
+
+# 归一化时去掉的字符（空白与常见标点）
+KEYWORD_NOISE_PATTERN = re.compile(r"[\s，,。！？!?；;：:、“”\"'‘’（）()【】\[\]<>《》…\-—_~～*#·/]+")
+# 两个字之间的"的"（"对称的美学" -> "对称美学"）
+FILLER_PATTERN = re.compile(r"(?<=\w)的(?=\w)")
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    归一化关键词：全角转半角、英文小写、去掉标点空白和字间的"的"
+
+    Args:
+        keyword: 关键词
+
+    Returns:
+        归一化后的关键词
+    """
+    text = unicodedata.normalize("NFKC", keyword).lower()
+    text = KEYWORD_NOISE_PATTERN.sub("", text)
+    return FILLER_PATTERN.sub("", text)
+
+
+class KeywordCluster:
+    """一组近似重复的关键词"""
+
+    __slots__ = ("variants", "agents")
+
+    def __init__(self):
+        self.variants: Counter = Counter()  # 写法 -> 被提出次数（按首次出现顺序）
+        self.agents: List[str] = []  # 提出过该组关键词的智能体ID（按智能体顺序）
+
+    @property
+    def keyword(self) -> str:
+        """代表写法：被提出次数最多的写法，次数相同时取最先出现的"""
+        return self.variants.most_common(1)[0][0]
+
+    @property
+    def support(self) -> int:
+        """提出该组关键词的智能体数"""
+        return len(self.agents)
+
+    def to_dict(self) -> Dict[str, object]:
+        """转换为字典"""
+        return {"keyword": self.keyword, "variants": list(self.variants), "agents": list(self.agents)}
+
+
+class KeywordClusterer:
+    """关键词聚类器"""
+
+    def __init__(self, threshold: float = 0.8, ngram: int = 2):
+        """
+        初始化聚类器
+
+        Args:
+            threshold: 合并的余弦相似度阈值（大于等于1时只合并归一化后相同的关键词）
+            ngram: 字符n-gram长度
+        """
+        self.threshold = threshold
+        self.ngram = ngram
+        self.logger = logging.getLogger("keyword_clusterer")
+
+    def _vector(self, key: str) -> Counter:
+        """字符n-gram计数向量"""
+        if len(key) < self.ngram:
+            return Counter([key])
+        return Counter(key[i:i + self.ngram] for i in range(len(key) - self.ngram + 1))
+
+    @staticmethod
+    def _cosine(a: Counter, b: Counter) -> float:
+        """两个计数向量的余弦相似度"""
+        if len(a) > len(b):
+            a, b = b, a
+        dot = sum(count * b.get(gram, 0) for gram, count in a.items())
+        if dot == 0:
+            return 0.0
+        return dot / (math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values())))
+
+    def cluster(self, agent_keywords: Dict[str, Sequence[str]]) -> List[KeywordCluster]:
+        """
+        聚类各智能体提出的关键词
+
+        Args:
+            agent_keywords: {智能体ID: [关键词1, 关键词2, ...], ...}
+
+        Returns:
+            关键词组列表（按首次出现顺序）
+        """
+        # 归一化键 -> [(智能体ID, 原写法), ...]
+        occurrences: Dict[str, List[tuple]] = {}
+        for agent_id, keywords in agent_keywords.items():
+            for keyword in keywords:
+                keyword = keyword.strip()
+                key = normalize_keyword(keyword)
+                if key:
+                    occurrences.setdefault(key, []).append((agent_id, keyword))
+
+        keys = list(occurrences)
+        parent = list(range(len(keys)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        if self.threshold < 1:
+            vectors = [self._vector(key) for key in keys]
+            for i in range(len(keys)):
+                for j in range(i + 1, len(keys)):
+                    if self._cosine(vectors[i], vectors[j]) >= self.threshold:
+                        root_i, root_j = find(i), find(j)
+                        if root_i != root_j:
+                            # 保留较早出现的根，使组的顺序与首次出现顺序一致
+                            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        clusters: Dict[int, KeywordCluster] = {}
+        for index, key in enumerate(keys):
+            cluster = clusters.setdefault(find(index), KeywordCluster())
+            for agent_id, keyword in occurrences[key]:
+                cluster.variants[keyword] += 1
+                if agent_id not in cluster.agents:
+                    cluster.agents.append(agent_id)
+
+        agent_order = {agent_id: index for index, agent_id in enumerate(agent_keywords)}
+        result = [clusters[root] for root in sorted(clusters)]
+        for cluster in result:
+            cluster.agents.sort(key=agent_order.__getitem__)
+        total = sum(len(items) for items in occurrences.values())
+        self.logger.info(f"关键词聚类: {total} 个关键词合并为 {len(result)} 组")
+        return result
+
+    def deduplicate(self, keywords: Sequence[str]) -> List[str]:
+        """
+        合并单个关键词列表中的近似重复项（保持首次出现顺序）
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            去重后的关键词列表
+        """
+        return [cluster.keyword for cluster in self.cluster({"": keywords})]
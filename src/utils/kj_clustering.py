@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+本地KJ法聚类模块 - 不调用大模型，把关键词归纳为两级类别结构
+
+关键词以字符一元、二元组的TF-IDF向量表示，用平均链接的层次聚类先归为二级类别，
+再把二级类别的质心归为一级类别。类别名取组内关键词的最长公共子串，没有时取组内
+最有代表性的关键词（与其他关键词相似度之和最大）。结果与 KJMethod.format_kj_result
+使用的结构一致，且对相同输入是确定的。
+"""
+
+import logging
+import math
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+from src.utils.keywords import normalize_keyword
+
+# 类别名使用的公共子串最短长度
+MIN_COMMON_NAME_LENGTH = 2
+
+SparseVector = Dict[str, float]
+
+
+def _normalize(vector: Dict[str, float]) -> SparseVector:
+    """L2归一化"""
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {term: value / norm for term, value in vector.items()} if norm else {}
+
+
+def _dot(a: SparseVector, b: SparseVector) -> float:
+    """两个稀疏向量的点积（已归一化时即余弦相似度）"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(term, 0.0) for term, value in a.items())
+
+
+class KJClusterer:
+    """本地KJ法聚类器"""
+
+    def __init__(self, keywords_per_group: int = 3, groups_per_category: int = 3):
+        """
+        初始化聚类器
+
+        Args:
+            keywords_per_group: 每个二级类别的平均关键词数
+            groups_per_category: 每个一级类别的平均二级类别数
+        """
+        self.keywords_per_group = max(1, keywords_per_group)
+        self.groups_per_category = max(1, groups_per_category)
+        self.logger = logging.getLogger("kj_clusterer")
+
+    @staticmethod
+    def _terms(key: str) -> List[str]:
+        """字符一元组和二元组"""
+        return list(key) + [key[i:i + 2] for i in range(len(key) - 1)]
+
+    def _vectors(self, keywords: Sequence[str]) -> List[SparseVector]:
+        """
+        计算关键词的TF-IDF向量
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            归一化的稀疏向量列表
+        """
+        term_counts = [Counter(self._terms(normalize_keyword(keyword) or keyword)) for keyword in keywords]
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+        total = len(keywords)
+        return [
+            _normalize({
+                term: count * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+                for term, count in counts.items()
+            })
+            for counts in term_counts
+        ]
+
+    @staticmethod
+    def _agglomerate(vectors: Sequence[SparseVector], target: int) -> List[List[int]]:
+        """
+        平均链接层次聚类，合并到目标组数
+
+        Args:
+            vectors: 归一化的向量
+            target: 目标组数
+
+        Returns:
+            各组成员下标（组按最小成员下标排序，组内成员升序）
+        """
+        clusters: Dict[int, List[int]] = {index: [index] for index in range(len(vectors))}
+        similarity: Dict[int, Dict[int, float]] = {
+            i: {j: _dot(vectors[i], vectors[j]) for j in range(len(vectors)) if j != i}
+            for i in range(len(vectors))
+        }
+
+        while len(clusters) > max(1, target):
+            # 相似度最高的一对；相同时（如都没有共同的字）优先合并较小的组，使各组大小均衡，
+            # 再相同时取下标较小的一对，保证结果确定
+            best = None
+            for i in sorted(clusters):
+                for j, value in similarity[i].items():
+                    if j > i:
+                        key = (round(value, 9), -(len(clusters[i]) + len(clusters[j])))
+                        if best is None or key > best[0]:
+                            best = (key, i, j)
+            _, keep, merged = best
+
+            size_keep, size_merged = len(clusters[keep]), len(clusters[merged])
+            for other in clusters:
+                if other in (keep, merged):
+                    continue
+                value = (
+                    similarity[keep][other] * size_keep + similarity[merged][other] * size_merged
+                ) / (size_keep + size_merged)
+                similarity[keep][other] = value
+                similarity[other][keep] = value
+                del similarity[other][merged]
+
+            clusters[keep] = sorted(clusters[keep] + clusters.pop(merged))
+            del similarity[keep][merged]
+            del similarity[merged]
+
+        return [clusters[key] for key in sorted(clusters)]
+
+    @staticmethod
+    def _name(keywords: Sequence[str], vectors: Sequence[SparseVector]) -> str:
+        """
+        组名：所有关键词的最长公共子串，没有时取与其他关键词相似度之和最大的关键词
+
+        Args:
+            keywords: 组内关键词
+            vectors: 对应的向量
+
+        Returns:
+            组名
+        """
+        if len(keywords) == 1:
+            return keywords[0]
+
+        shortest = min(keywords, key=len)
+        for length in range(len(shortest), MIN_COMMON_NAME_LENGTH - 1, -1):
+            for start in range(len(shortest) - length + 1):
+                candidate = shortest[start:start + length]
+                if all(candidate in keyword for keyword in keywords):
+                    return candidate
+
+        scores = [sum(_dot(vector, other) for other in vectors) for vector in vectors]
+        return keywords[scores.index(max(scores))]
+
+    def categorize(self, keywords: Sequence[str]) -> Dict[str, Any]:
+        """
+        把关键词归纳为两级类别
+
+        Args:
+            keywords: 关键词列表（已去重）
+
+        Returns:
+            分类结果，格式为 {"core_concept": ..., "categories": [{"name": ..., "subcategories":
+            [{"name": ..., "keywords": [...]}, ...]}, ...]}
+        """
+        keywords = [keyword for keyword in dict.fromkeys(k.strip() for k in keywords) if keyword]
+        if not keywords:
+            return {"core_concept": "", "categories": []}
+
+        vectors = self._vectors(keywords)
+        groups = self._agglomerate(vectors, math.ceil(len(keywords) / self.keywords_per_group))
+
+        # 二级类别的质心
+        centroids = []
+        for group in groups:
+            centroid: Dict[str, float] = {}
+            for index in group:
+                for term, value in vectors[index].items():
+                    centroid[term] = centroid.get(term, 0.0) + value
+            centroids.append(_normalize(centroid))
+
+        categories = []
+        for category_groups in self._agglomerate(centroids, math.ceil(len(groups) / self.groups_per_category)):
+            members = [index for group_index in category_groups for index in groups[group_index]]
+            categories.append({
+                "name": self._name([keywords[i] for i in members], [vectors[i] for i in members]),
+                "subcategories": [
+                    {
+                        "name": self._name([keywords[i] for i in groups[g]], [vectors[i] for i in groups[g]]),
+                        "keywords": [keywords[i] for i in groups[g]]
+                    }
+                    for g in category_groups
+                ]
+            })
+
+        self.logger.info(f"本地KJ聚类: {len(keywords)} 个关键词 → {len(groups)} 个二级类别 → {len(categories)} 个一级类别")
+        return {
+            "core_concept": self._name(keywords, vectors),
+            "categories": categories
+        }
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动耗时分析模块 - 统计每个模块的导入耗时（--profile-startup）
+
+需在导入项目其他模块之前调用 start_import_profile()，只依赖标准库。
+"""
+
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+# 导入记录：模块名、自身耗时、累计耗时（秒）、嵌套深度
+_records: List[Dict[str, Any]] = []
+_stack: List[List[float]] = []  # 每层：[开始时间, 子模块累计耗时]
+_start_time: Optional[float] = None
+
+
+class _TimingFinder:
+    """位于 sys.meta_path 最前面的查找器：为找到的模块加上计时"""
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                _wrap_loader(spec.loader)
+                return spec
+        return None
+
+
+def _wrap_loader(loader) -> None:
+    """
+    为加载器实例的 exec_module 加上计时（内置/冻结模块的加载器是类，不处理）
+
+    Args:
+        loader: 模块加载器
+    """
+    if loader is None or isinstance(loader, type) or not hasattr(loader, "__dict__"):
+        return
+    exec_module = getattr(loader, "exec_module", None)
+    if exec_module is None or getattr(exec_module, "_timed", False):
+        return
+
+    def timed_exec_module(module):
+        _stack.append([time.perf_counter(), 0.0])
+        try:
+            exec_module(module)
+        finally:
+            started, children = _stack.pop()
+            elapsed = time.perf_counter() - started
+            if _stack:
+                _stack[-1][1] += elapsed
+            _records.append({
+                "module": module.__name__,
+                "self": elapsed - children,
+                "cumulative": elapsed,
+                "depth": len(_stack)
+            })
+
+    timed_exec_module._timed = True
+    try:
+        loader.exec_module = timed_exec_module
+    except AttributeError:
+        pass
+
+
+def start_import_profile() -> None:
+    """开始统计模块导入耗时"""
+    global _start_time
+    if any(isinstance(finder, _TimingFinder) for finder in sys.meta_path):
+        return
+    _start_time = time.perf_counter()
+    sys.meta_path.insert(0, _TimingFinder())
+
+
+def stop_import_profile() -> None:
+    """停止统计（已有记录保留）"""
+    sys.meta_path[:] = [finder for finder in sys.meta_path if not isinstance(finder, _TimingFinder)]
+
+
+def is_profiling() -> bool:
+    """是否正在统计"""
+    return _start_time is not None
+
+
+def get_import_report(limit: int = 25) -> Dict[str, Any]:
+    """
+    汇总导入耗时
+
+    Args:
+        limit: 输出累计耗时最多的模块数量
+
+    Returns:
+        报告字典（耗时单位：毫秒）
+    """
+    packages: Dict[str, float] = defaultdict(float)
+    for record in _records:
+        packages[record["module"].split(".")[0]] += record["self"]
+
+    top_level = [record for record in _records if record["depth"] == 0]
+    slowest = sorted(_records, key=lambda record: record["cumulative"], reverse=True)[:limit]
+
+    return {
+        "elapsed_ms": round((time.perf_counter() - _start_time) * 1000, 1) if _start_time else None,
+        "import_ms": round(sum(record["cumulative"] for record in top_level) * 1000, 1),
+        "modules": len(_records),
+        "packages": {
+            name: round(seconds * 1000, 1)
+            for name, seconds in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:limit]
+        },
+        "slowest": [
+            {
+                "module": record["module"],
+                "self_ms": round(record["self"] * 1000, 2),
+                "cumulative_ms": round(record["cumulative"] * 1000, 2)
+            }
+            for record in slowest
+        ]
+    }
+
+
+def format_import_report(limit: int = 25) -> str:
+    """
+    生成文本格式的导入耗时报告
+
+    Args:
+        limit: 输出的模块数量
+
+    Returns:
+        报告文本
+    """
+    report = get_import_report(limit)
+    lines = [
+        f"启动耗时: {report['elapsed_ms']} ms，其中模块导入 {report['import_ms']} ms（{report['modules']} 个模块）",
+        "",
+        "按顶层包汇总（自身耗时）:"
+    ]
+    for name, milliseconds in report["packages"].items():
+        lines.append(f"  {milliseconds:>9.1f} ms  {name}")
+
+    lines.extend(["", f"累计耗时最多的 {len(report['slowest'])} 个模块:", f"  {'累计(ms)':>10}  {'自身(ms)':>10}  模块"])
+    for record in report["slowest"]:
+        lines.append(f"  {record['cumulative_ms']:>10.2f}  {record['self_ms']:>10.2f}  {record['module']}")
+    return "\n".join(lines)
@@ -5,21 +5,25 @@
 流式输出处理模块 - 增强版
 """
 
-import sys
+import re
 import time
 import asyncio
-from typing import Callable, Optional
+from collections import deque
+from typing import Any, Callable, Optional
 
 # 导入UI美化组件
 try:
     from ..ui_enhanced import (
         EnhancedColors, Icons, ASCIIArt, Decorations,
-        StatusIndicator, Animations
+        StatusIndicator, Animations, get_status_renderer
     )
     UI_ENHANCED_AVAILABLE = True
 except ImportError:
     UI_ENHANCED_AVAILABLE = False
 
+# 终端颜色控制符
+ANSI_ESCAPE_PATTERN = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
 
 class StreamHandler:
     """增强版流式输出处理类"""
@@ -29,14 +33,22 @@ class StreamHandler:
         初始化流式输出处理器
 
         Args:
-            output_func: 输出函数，默认为 print
+            output_func: 输出函数，默认输出到终端（经状态行渲染器，与加载动画不交错）
             enable_ui_enhancement: 是否启用UI美化
         """
-        self.output_func = output_func or print
+        if output_func is None:
+            output_func = get_status_renderer().print if UI_ENHANCED_AVAILABLE else print
+        self.output_func = output_func
         self.delay = 0.01  # 输出延迟，单位：秒
         self.enable_ui_enhancement = enable_ui_enhancement and UI_ENHANCED_AVAILABLE
         self.current_agent = None  # 当前发言的智能体
 
+    async def _drain(self) -> None:
+        """等待输出函数的消费者取走已写入的内容（输出函数提供drain时）"""
+        drain = getattr(self.output_func, "drain", None)
+        if drain is not None:
+            await drain()
+
     async def stream_output(self, text: str, delay: Optional[float] = None) -> None:
         """
         流式输出文本
@@ -50,6 +62,7 @@ class StreamHandler:
         # 如果延迟为0，直接输出
         if delay <= 0:
             self.output_func(text)
+            await self._drain()
             return
         
         # 流式输出
@@ -59,6 +72,7 @@ class StreamHandler:
         
         # 输出换行
         self.output_func("", flush=True)
+        await self._drain()
 
     async def stream_output_chunk(self, text: str, chunk_size: int = 5, delay: Optional[float] = None) -> None:
         """
@@ -74,6 +88,7 @@ class StreamHandler:
         # 如果延迟为0，直接输出
         if delay <= 0:
             self.output_func(text)
+            await self._drain()
             return
         
         # 分块流式输出
@@ -84,6 +99,7 @@ class StreamHandler:
         
         # 输出换行
         self.output_func("", flush=True)
+        await self._drain()
 
     def set_delay(self, delay: float) -> None:
         """
@@ -202,16 +218,20 @@ class StreamHandler:
             # 默认输出
             await self.stream_output(text, delay)
 
+        await self._drain()
+
     async def _stream_with_typewriter(self, text: str, delay: float) -> None:
         """
         打字机效果的流式输出
         """
+        if delay <= 0:
+            self.output_func(text)
+            return
+
         for char in text:
-            sys.stdout.write(char)
-            sys.stdout.flush()
+            self.output_func(char, end="", flush=True)
             await asyncio.sleep(delay)
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        self.output_func("", flush=True)
 
     async def _show_waiting_animation(self, message: str, duration: float = 2.0) -> None:
         """
@@ -226,12 +246,118 @@ class StreamHandler:
             colored_frame = EnhancedColors.bright_cyan(frame)
             text = f"\r{colored_frame} {message}..."
 
-            sys.stdout.write(text)
-            sys.stdout.flush()
+            self.output_func(text, end="", flush=True)
 
             await asyncio.sleep(0.1)
             frame_index += 1
 
         # 清除加载动画
-        sys.stdout.write('\r' + ' ' * (len(message) + 10) + '\r')
-        sys.stdout.flush()
+        self.output_func('\r' + ' ' * (len(message) + 10) + '\r', end="", flush=True)
+
+
+class BufferedOutput:
+    """
+    会议输出缓冲区 - 可作为StreamHandler的输出函数（与print签名兼容）
+
+    同一进程运行多场会议时，每场会议使用独立的缓冲区，互不干扰。
+    """
+
+    def __init__(self, on_write: Optional[Callable[[str], None]] = None, strip_ansi: bool = False):
+        """
+        初始化输出缓冲区
+
+        Args:
+            on_write: 每次写入时的回调（如推送给Web客户端）
+            strip_ansi: 是否去除终端颜色控制符
+        """
+        self._parts = []
+        self.on_write = on_write
+        self.strip_ansi = strip_ansi
+
+    def __call__(self, *args, sep: str = " ", end: str = "\n", flush: bool = False, **kwargs) -> None:
+        text = sep.join(str(arg) for arg in args) + end
+        if self.strip_ansi:
+            text = ANSI_ESCAPE_PATTERN.sub("", text)
+        self._parts.append(text)
+        if self.on_write:
+            self.on_write(text)
+
+    def getvalue(self) -> str:
+        """
+        获取全部输出
+
+        Returns:
+            输出文本
+        """
+        return "".join(self._parts)
+
+    def clear(self) -> None:
+        """清空缓冲区"""
+        self._parts.clear()
+
+
+class QueueOutput:
+    """
+    有界队列输出 - 可作为StreamHandler的输出函数（与print签名兼容），由消费者异步取走
+
+    队列满时新写入的内容暂存在本地，StreamHandler每段输出后调用drain()等待消费者
+    腾出空间，使会议的生成进度受消费者速度约束（背压）。
+    """
+
+    def __init__(self, maxsize: int = 256, strip_ansi: bool = True):
+        """
+        初始化队列输出
+
+        Args:
+            maxsize: 队列容量
+            strip_ansi: 是否去除终端颜色控制符
+        """
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.strip_ansi = strip_ansi
+        self._pending = deque()
+        self._drain_lock = asyncio.Lock()
+
+    def __call__(self, *args, sep: str = " ", end: str = "\n", flush: bool = False, **kwargs) -> None:
+        text = sep.join(str(arg) for arg in args) + end
+        if self.strip_ansi:
+            text = ANSI_ESCAPE_PATTERN.sub("", text)
+        if text:
+            self.put_nowait(text)
+
+    def put_nowait(self, item: Any) -> None:
+        """
+        写入一项（不阻塞，队列满时暂存，保持写入顺序）
+
+        Args:
+            item: 文本或其他事件对象
+        """
+        if self._pending or self.queue.full():
+            self._pending.append(item)
+        else:
+            self.queue.put_nowait(item)
+
+    async def drain(self) -> None:
+        """等待暂存的内容全部进入队列"""
+        # 并行发言时可能有多个协程同时drain，队首元素入队后才出暂存区，保证顺序
+        async with self._drain_lock:
+            while self._pending:
+                await self.queue.put(self._pending[0])
+                self._pending.popleft()
+
+    async def get(self) -> Any:
+        """
+        取出一项（队列为空时等待）
+
+        Returns:
+            文本或其他事件对象
+        """
+        return await self.queue.get()
+
+    def qsize(self) -> int:
+        """
+        获取尚未被取走的数量
+
+        Returns:
+            队列和暂存区中的总数
+        """
+        return self.queue.qsize() + len(self._pending)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+结构化输出模块 - JSON输出的解析、Schema校验和失败时的短提示修复
+
+模型通过 generate_json 生成（支持的提供商使用JSON模式或工具调用），输出无效时只发送
+包含错误和原输出的短修复提示，不重复原始的长提示词。
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from src.models.errors import ModelOutputError
+
+# 关键词提取的输出格式
+KEYWORD_LIST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "keywords": {
+            "type": "array",
+            "items": {"type": "string", "minLength": 1, "maxLength": 30},
+            "minItems": 1
+        }
+    },
+    "required": ["keywords"],
+    "additionalProperties": False
+}
+
+# 代码块标记（```json ... ```）
+CODE_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None)
+}
+
+logger = logging.getLogger("structured_output")
+
+
+def extract_json(text: str) -> Any:
+    """
+    从模型输出中解析JSON（允许代码块标记和前后说明文字）
+
+    Args:
+        text: 模型输出
+
+    Returns:
+        解析后的数据
+
+    Raises:
+        ValueError: 没有可解析的JSON
+    """
+    if not text or not text.strip():
+        raise ValueError("输出为空")
+
+    fence = CODE_FENCE_PATTERN.search(text)
+    candidate = fence.group(1).strip() if fence else text.strip()
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+
+    # 从第一个 { 或 [ 开始解析一个完整的JSON值
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"[\[{]", candidate):
+        try:
+            value, _ = decoder.raw_decode(candidate, match.start())
+            return value
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("输出中没有有效的JSON")
+
+
+def validate_schema(data: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    按JSON Schema校验数据（支持 type、properties、required、additionalProperties、
+    items、minItems、maxItems、minLength、maxLength、enum）
+
+    Args:
+        data: 待校验的数据
+        schema: JSON Schema
+        path: 当前位置（用于错误信息）
+
+    Returns:
+        错误列表（为空表示有效）
+    """
+    expected = schema.get("type")
+    if expected == "integer":
+        valid_type = isinstance(data, int) and not isinstance(data, bool)
+    elif expected == "number":
+        valid_type = isinstance(data, (int, float)) and not isinstance(data, bool)
+    elif expected in _JSON_TYPES:
+        valid_type = isinstance(data, _JSON_TYPES[expected])
+    else:
+        valid_type = True
+    if not valid_type:
+        return [f"{path} 应为 {expected}，实际为 {type(data).__name__}"]
+
+    errors: List[str] = []
+    if "enum" in schema and data not in schema["enum"]:
+        errors.append(f"{path} 不在允许的取值中")
+
+    if isinstance(data, dict):
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in data:
+                errors.append(f"{path} 缺少字段 {key}")
+        for key, value in data.items():
+            if key in properties:
+                errors.extend(validate_schema(value, properties[key], f"{path}.{key}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path} 包含多余字段 {key}")
+
+    elif isinstance(data, list):
+        if len(data) < schema.get("minItems", 0):
+            errors.append(f"{path} 至少需要 {schema['minItems']} 项")
+        if "maxItems" in schema and len(data) > schema["maxItems"]:
+            errors.append(f"{path} 最多 {schema['maxItems']} 项")
+        if "items" in schema:
+            for index, item in enumerate(data):
+                errors.extend(validate_schema(item, schema["items"], f"{path}[{index}]"))
+
+    elif isinstance(data, str):
+        length = len(data.strip())
+        if length < schema.get("minLength", 0):
+            errors.append(f"{path} 不能为空")
+        if "maxLength" in schema and length > schema["maxLength"]:
+            errors.append(f"{path} 超过 {schema['maxLength']} 个字符")
+
+    return errors
+
+
+def keyword_list_object(data: Any) -> Any:
+    """
+    将关键词输出整理为 KEYWORD_LIST_SCHEMA 的对象形式
+
+    JSON数组形式的关键词列表转换为对象形式；不符合单项要求的关键词（非字符串、为空、过长）
+    逐项丢弃，不让个别无效项使整个列表校验失败。其他数据原样返回。
+
+    Args:
+        data: 解析后的模型输出
+
+    Returns:
+        整理后的数据
+    """
+    if isinstance(data, list):
+        data = {"keywords": data}
+    if not isinstance(data, dict) or not isinstance(data.get("keywords"), list):
+        return data
+
+    item_schema = KEYWORD_LIST_SCHEMA["properties"]["keywords"]["items"]
+    keywords = [keyword for keyword in data["keywords"] if not validate_schema(keyword, item_schema)]
+    dropped = len(data["keywords"]) - len(keywords)
+    if dropped:
+        logger.info(f"丢弃 {dropped} 个不符合要求的关键词")
+    return {**data, "keywords": keywords}
+
+
+async def generate_structured(
+    model: Any,
+    prompt: str,
+    system_prompt: str,
+    schema: Dict[str, Any],
+    coerce: Optional[Callable[[Any], Any]] = None,
+    repair_attempts: int = 1
+) -> Any:
+    """
+    生成并校验结构化输出，无效时发送短修复提示重新生成
+
+    Args:
+        model: AI模型
+        prompt: 提示词
+        system_prompt: 系统提示词
+        schema: 输出需满足的JSON Schema
+        coerce: 校验前对解析结果的转换（如兼容旧的数组格式）
+        repair_attempts: 最多修复次数
+
+    Returns:
+        通过校验的数据
+
+    Raises:
+        ModelOutputError: 修复后仍无效
+    """
+    from src.config.prompts.base_prompts import BasePrompts
+
+    response = await model.generate_json(prompt, system_prompt, schema)
+    for attempt in range(repair_attempts + 1):
+        try:
+            data = extract_json(response)
+            if coerce:
+                data = coerce(data)
+            errors = validate_schema(data, schema)
+        except ValueError as e:
+            errors = [str(e)]
+
+        if not errors:
+            return data
+
+        if attempt == repair_attempts:
+            break
+
+        logger.info(f"结构化输出无效（{'; '.join(errors[:3])}），发送修复提示")
+        repair_prompt = BasePrompts.STRUCTURED_OUTPUT_REPAIR_TEMPLATE.format(
+            errors="\n".join(f"- {error}" for error in errors[:5]),
+            output=(response or "")[:2000],
+            schema=json.dumps(schema, ensure_ascii=False)
+        )
+        response = await model.generate_json(repair_prompt, "", schema)
+
+    raise ModelOutputError(
+        "结构化输出无效: " + "; ".join(errors[:5]),
+        output=response or "",
+        provider=getattr(model, "provider", ""),
+        model_name=getattr(model, "model_name", "")
+    )
@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+抽取式摘要模块 - 本地、确定性的讨论压缩（TextRank + MMR），不调用大模型
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 句子切分：中英文句末标点或换行
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[。！？!?；;])|\n+")
+# 计算相似度时忽略的字符（空白与常见标点）
+NOISE_PATTERN = re.compile(r"[\s，,。！？!?；;：:、“”\"'‘’（）()【】\[\]…\-—~～*#]+")
+
+# 过短的句子（如"嗯..."）不参与摘要
+MIN_SENTENCE_LENGTH = 6
+
+
+class ExtractiveSummarizer:
+    """基于TextRank打分、MMR去冗余的抽取式摘要器"""
+
+    def __init__(
+        self,
+        max_sentences: int = 6,
+        diversity: float = 0.7,
+        damping: float = 0.85,
+        max_iterations: int = 50,
+        tolerance: float = 1e-6,
+        max_sentence_chars: int = 120
+    ):
+        """
+        初始化摘要器
+
+        Args:
+            max_sentences: 每次摘要最多保留的句子数
+            diversity: MMR中相关性的权重（越小越强调去冗余）
+            damping: TextRank阻尼系数
+            max_iterations: TextRank最大迭代次数
+            tolerance: TextRank收敛阈值
+            max_sentence_chars: 单句最大保留字符数
+        """
+        self.max_sentences = max_sentences
+        self.diversity = diversity
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.max_sentence_chars = max_sentence_chars
+        self.logger = logging.getLogger("summarizer")
+
+    def split_sentences(self, text: str) -> List[str]:
+        """
+        切分句子
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            句子列表（已去除过短的句子）
+        """
+        sentences = []
+        for part in SENTENCE_SPLIT_PATTERN.split(text or ""):
+            sentence = part.strip()
+            if len(NOISE_PATTERN.sub("", sentence)) >= MIN_SENTENCE_LENGTH:
+                sentences.append(sentence)
+        return sentences
+
+    @staticmethod
+    def _char_ngrams(sentence: str, n: int = 2) -> Counter:
+        """提取字符n-gram（中文按字、英文按字母处理均可）"""
+        cleaned = NOISE_PATTERN.sub("", sentence.lower())
+        if len(cleaned) < n:
+            return Counter([cleaned]) if cleaned else Counter()
+        return Counter(cleaned[i:i + n] for i in range(len(cleaned) - n + 1))
+
+    @staticmethod
+    def _cosine(a: Counter, b: Counter) -> float:
+        """计算两个n-gram计数向量的余弦相似度"""
+        if not a or not b:
+            return 0.0
+        if len(a) > len(b):
+            a, b = b, a
+        dot = sum(count * b.get(gram, 0) for gram, count in a.items())
+        if dot == 0:
+            return 0.0
+        norm_a = math.sqrt(sum(v * v for v in a.values()))
+        norm_b = math.sqrt(sum(v * v for v in b.values()))
+        return dot / (norm_a * norm_b)
+
+    def _similarity_matrix(self, sentences: Sequence[str]) -> List[List[float]]:
+        """构建句子相似度矩阵"""
+        vectors = [self._char_ngrams(s) for s in sentences]
+        size = len(vectors)
+        matrix = [[0.0] * size for _ in range(size)]
+        for i in range(size):
+            for j in range(i + 1, size):
+                similarity = self._cosine(vectors[i], vectors[j])
+                matrix[i][j] = similarity
+                matrix[j][i] = similarity
+        return matrix
+
+    def rank(self, sentences: Sequence[str], matrix: Optional[List[List[float]]] = None) -> List[float]:
+        """
+        使用TextRank为句子打分
+
+        Args:
+            sentences: 句子列表
+            matrix: 预先计算的相似度矩阵
+
+        Returns:
+            与句子一一对应的得分
+        """
+        size = len(sentences)
+        if size == 0:
+            return []
+        if matrix is None:
+            matrix = self._similarity_matrix(sentences)
+
+        out_weights = [sum(row) for row in matrix]
+        scores = [1.0 / size] * size
+        base = (1.0 - self.damping) / size
+
+        for _ in range(self.max_iterations):
+            new_scores = []
+            for i in range(size):
+                rank_sum = 0.0
+                for j in range(size):
+                    if matrix[j][i] > 0 and out_weights[j] > 0:
+                        rank_sum += matrix[j][i] / out_weights[j] * scores[j]
+                new_scores.append(base + self.damping * rank_sum)
+            delta = sum(abs(n - o) for n, o in zip(new_scores, scores))
+            scores = new_scores
+            if delta < self.tolerance:
+                break
+
+        return scores
+
+    def select(
+        self,
+        sentences: Sequence[str],
+        max_sentences: Optional[int] = None,
+        groups: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        """
+        选出摘要句（TextRank相关性 + MMR去冗余）
+
+        Args:
+            sentences: 句子列表
+            max_sentences: 最多选择的句子数
+            groups: 每个句子的分组（如发言人），每组至少保留一句
+
+        Returns:
+            按原文顺序排列的句子下标
+        """
+        limit = max_sentences or self.max_sentences
+        if len(sentences) <= limit:
+            return list(range(len(sentences)))
+
+        matrix = self._similarity_matrix(sentences)
+        scores = self.rank(sentences, matrix)
+        top_score = max(scores) or 1.0
+        relevance = [s / top_score for s in scores]
+
+        selected: List[int] = []
+
+        # 先保证每个发言人都有代表句
+        if groups is not None:
+            best_by_group: Dict[str, int] = {}
+            for index, group in enumerate(groups):
+                current = best_by_group.get(group)
+                if current is None or relevance[index] > relevance[current]:
+                    best_by_group[group] = index
+            selected.extend(sorted(best_by_group.values(), key=lambda i: -relevance[i])[:limit])
+
+        # 再用MMR补足剩余名额
+        candidates = [i for i in range(len(sentences)) if i not in selected]
+        while len(selected) < limit and candidates:
+            def mmr(index: int) -> float:
+                redundancy = max((matrix[index][j] for j in selected), default=0.0)
+                return self.diversity * relevance[index] - (1.0 - self.diversity) * redundancy
+
+            best = max(candidates, key=lambda i: (mmr(i), -i))
+            selected.append(best)
+            candidates.remove(best)
+
+        return sorted(selected)
+
+    def _clip(self, sentence: str) -> str:
+        """截断过长的句子"""
+        if len(sentence) > self.max_sentence_chars:
+            return sentence[:self.max_sentence_chars] + "..."
+        return sentence
+
+    def summarize_entries(
+        self,
+        entries: Sequence[Tuple[str, str]],
+        max_sentences: Optional[int] = None
+    ) -> str:
+        """
+        摘要多人发言
+
+        Args:
+            entries: [(发言人, 发言内容), ...]，按发言顺序
+            max_sentences: 最多保留的句子数（至少覆盖每位发言人）
+
+        Returns:
+            按发言人分组的摘要文本
+        """
+        sentences: List[str] = []
+        speakers: List[str] = []
+        for speaker, content in entries:
+            for sentence in self.split_sentences(content):
+                sentences.append(sentence)
+                speakers.append(speaker)
+
+        if not sentences:
+            return ""
+
+        speaker_count = len(dict.fromkeys(speakers))
+        limit = max(max_sentences or self.max_sentences, speaker_count)
+        selected = self.select(sentences, limit, groups=speakers)
+
+        # 按发言顺序合并同一发言人的句子
+        lines: List[Tuple[str, List[str]]] = []
+        for index in selected:
+            speaker = speakers[index]
+            if lines and lines[-1][0] == speaker:
+                lines[-1][1].append(self._clip(sentences[index]))
+            else:
+                lines.append((speaker, [self._clip(sentences[index])]))
+
+        return "\n".join(f"{speaker}: {''.join(parts)}" for speaker, parts in lines)
+
+
+class DiscussionDigest:
+    """滚动讨论摘要：每轮讨论结束后压缩一次，之后重复使用"""
+
+    def __init__(self, summarizer: Optional[ExtractiveSummarizer] = None):
+        """
+        初始化滚动摘要
+
+        Args:
+            summarizer: 抽取式摘要器
+        """
+        self.summarizer = summarizer or ExtractiveSummarizer()
+        self._turns: List[Tuple[str, str]] = []  # [(轮次标签, 摘要文本), ...]
+        self.logger = logging.getLogger("discussion_digest")
+
+    def add_turn(self, label: str, entries: Sequence[Tuple[str, str]]) -> str:
+        """
+        压缩并记录一轮已结束的讨论
+
+        Args:
+            label: 轮次标签
+            entries: [(发言人, 发言内容), ...]
+
+        Returns:
+            本轮摘要文本
+        """
+        digest = self.summarizer.summarize_entries(entries)
+        original_length = sum(len(content) for _, content in entries)
+        self.logger.debug(f"{label} 摘要完成: {original_length} → {len(digest)} 字符")
+
+        self._turns = [(l, d) for l, d in self._turns if l != label]
+        self._turns.append((label, digest))
+        return digest
+
+    def get_digest(self, labels: Optional[Sequence[str]] = None, last_n: Optional[int] = None) -> str:
+        """
+        获取摘要文本
+
+        Args:
+            labels: 只包含指定的轮次
+            last_n: 只包含最近n轮
+
+        Returns:
+            摘要文本，无内容时返回空字符串
+        """
+        turns = self._turns
+        if labels is not None:
+            turns = [(l, d) for l, d in turns if l in labels]
+        if last_n is not None:
+            turns = turns[-last_n:] if last_n > 0 else []
+        return "\n\n".join(f"[{label}]\n{digest}" for label, digest in turns if digest)
+
+    def has_turn(self, label: str) -> bool:
+        """是否已记录指定轮次"""
+        return any(l == label for l, _ in self._turns)
+
+    def clear(self) -> None:
+        """清空摘要"""
+        self._turns = []
@@ -3,26 +3,205 @@
 
 """
 投票机制模块
+
+除随机的黑箱投票外，支持按票数（consensus）、按角色权重（weighted）、Borda计分（borda）
+和Condorcet/Schulze（schulze）统计排序投票。VoteTally 在每张选票到达时增量更新得分，
+最后用堆选出前k名（O(n log k)），不对全部关键词排序。
 """
 
+import heapq
 import logging
 import random
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Sequence
+
+# 支持的计票方式
+VOTING_METHODS = ("consensus", "weighted", "borda", "schulze")
+
+# 各计票方式的得分单位（用于显示）
+SCORE_UNITS = {"consensus": "票", "weighted": "票", "borda": "分", "schulze": "胜"}
+
+
+class VoteTally:
+    """
+    增量计票器
+
+    每张选票是一个按重要性从高到低排列的关键词列表，可带权重（如角色权重）。
+    add_ballot 只更新与该选票相关的计数：票数、加权票数、Borda分，以及选票内关键词两两之间
+    的先后关系；Schulze 需要的两两偏好由此推出（排在选票中的关键词优于未入选的关键词）。
+    """
+
+    def __init__(
+        self,
+        method: str = "consensus",
+        threshold: float = 0.0,
+        ballot_size: Optional[int] = None,
+        support: Optional[Dict[str, int]] = None
+    ):
+        """
+        初始化计票器
+
+        Args:
+            method: 计票方式（见 VOTING_METHODS）
+            threshold: 投票阈值，票数低于 选票数*阈值 的关键词不入选
+            ballot_size: 每张选票的投票数（Borda计分时第一名得 ballot_size 分，依次递减；
+                默认为各选票自身的长度）
+            support: 各关键词的提出人数（得分相同时提出人数多的优先）
+
+        Raises:
+            ValueError: 计票方式不支持
+        """
+        if method not in VOTING_METHODS:
+            raise ValueError(f"不支持的计票方式: {method}")
+        self.method = method
+        self.threshold = threshold
+        self.ballot_size = ballot_size
+        self.support = support or {}
+
+        self.ballots = 0
+        self.counts: Dict[str, int] = {}  # 关键词 -> 票数（按首次得票顺序）
+        self.weights: Dict[str, float] = {}  # 关键词 -> 加权票数
+        self.borda: Dict[str, float] = {}  # 关键词 -> 加权Borda分
+        self.above: Dict[str, Dict[str, float]] = {}  # a -> {b: 同一选票中a排在b前面的加权票数}
+
+    @property
+    def unit(self) -> str:
+        """得分单位"""
+        return SCORE_UNITS[self.method]
+
+    def add_ballot(self, ranking: Sequence[str], weight: float = 1.0) -> None:
+        """
+        加入一张选票
+
+        Args:
+            ranking: 按重要性从高到低排列的关键词（重复项只计第一次）
+            weight: 选票权重
+        """
+        ranking = list(dict.fromkeys(ranking))
+        self.ballots += 1
+        size = self.ballot_size or len(ranking)
+        for position, keyword in enumerate(ranking):
+            self.counts[keyword] = self.counts.get(keyword, 0) + 1
+            self.weights[keyword] = self.weights.get(keyword, 0.0) + weight
+            self.borda[keyword] = self.borda.get(keyword, 0.0) + max(size - position, 1) * weight
+            if self.method == "schulze":
+                above = self.above.setdefault(keyword, {})
+                for lower in ranking[position + 1:]:
+                    above[lower] = above.get(lower, 0.0) + weight
+
+    def _schulze_wins(self, keywords: List[str]) -> Dict[str, int]:
+        """
+        Schulze方法：按最强路径计算每个关键词击败的其他关键词数
+
+        Args:
+            keywords: 参与比较的关键词
+
+        Returns:
+            关键词 -> 击败的关键词数
+        """
+        # a优于b的加权票数 = 选了a的票数 - 同时选了两者且b在a前面的票数
+        def prefer(a: str, b: str) -> float:
+            return self.weights[a] - self.above.get(b, {}).get(a, 0.0)
+
+        size = len(keywords)
+        strength = [[0.0] * size for _ in range(size)]
+        for i, a in enumerate(keywords):
+            for j, b in enumerate(keywords):
+                if i != j:
+                    d_ab, d_ba = prefer(a, b), prefer(b, a)
+                    strength[i][j] = d_ab if d_ab > d_ba else 0.0
+
+        for k in range(size):
+            row_k = strength[k]
+            for i in range(size):
+                if i == k or not strength[i][k]:
+                    continue
+                row_i, via = strength[i], strength[i][k]
+                for j in range(size):
+                    if j != i and j != k:
+                        candidate = via if via < row_k[j] else row_k[j]
+                        if candidate > row_i[j]:
+                            row_i[j] = candidate
+
+        return {
+            a: sum(1 for j in range(size) if j != i and strength[i][j] > strength[j][i])
+            for i, a in enumerate(keywords)
+        }
+
+    def top_k(self, k: int) -> List[Tuple[str, Any]]:
+        """
+        选出得分最高的k个关键词
+
+        Args:
+            k: 数量
+
+        Returns:
+            计票结果，格式为 [(关键词, 得分), ...]，按得分从高到低排列
+        """
+        keywords = list(self.counts)
+        if self.threshold > 0:
+            threshold_count = int(self.ballots * self.threshold)
+            keywords = [kw for kw in keywords if self.counts[kw] >= threshold_count]
+
+        order = {kw: index for index, kw in enumerate(self.counts)}
+        support = self.support
+        if self.method == "consensus":
+            scores: Dict[str, Any] = self.counts
+            key = lambda kw: (scores[kw], support.get(kw, 0), -order[kw])
+        elif self.method == "weighted":
+            scores = {kw: round(self.weights[kw], 4) for kw in keywords}
+            key = lambda kw: (scores[kw], self.counts[kw], support.get(kw, 0), -order[kw])
+        elif self.method == "borda":
+            scores = {kw: round(self.borda[kw], 4) for kw in keywords}
+            key = lambda kw: (scores[kw], self.weights[kw], support.get(kw, 0), -order[kw])
+        else:
+            scores = self._schulze_wins(keywords)
+            key = lambda kw: (scores[kw], self.borda[kw], support.get(kw, 0), -order[kw])
+
+        return [(kw, scores[kw]) for kw in heapq.nlargest(k, keywords, key=key)]
 
 
 class VotingSystem:
     """投票系统类"""
 
-    def __init__(self, threshold: float = 0.6):
+    def __init__(self, threshold: float = 0.6, method: str = "consensus", role_weights: Optional[Dict[str, float]] = None):
         """
         初始化投票系统
 
         Args:
             threshold: 投票阈值，默认0.6
+            method: 计票方式（见 VOTING_METHODS）
+            role_weights: 角色 -> 选票权重（未配置的角色为1）
         """
         self.threshold = threshold
+        self.method = method
+        self.role_weights = role_weights or {}
         self.logger = logging.getLogger("voting_system")
 
+    def voter_weight(self, role: str) -> float:
+        """
+        获取角色的选票权重
+
+        Args:
+            role: 角色类型
+
+        Returns:
+            选票权重
+        """
+        return self.role_weights.get(role, 1.0)
+
+    def create_tally(self, ballot_size: Optional[int] = None, support: Optional[Dict[str, int]] = None) -> VoteTally:
+        """
+        创建增量计票器（使用本投票系统的计票方式和阈值）
+
+        Args:
+            ballot_size: 每张选票的投票数
+            support: 各关键词的提出人数
+
+        Returns:
+            计票器
+        """
+        return VoteTally(self.method, self.threshold, ballot_size, support)
+
     def black_box_voting(
         self, 
         keywords: List[str], 
@@ -60,16 +239,14 @@ class VotingSystem:
             for keyword in voted_keywords:
                 votes[keyword] += 1
         
-        # 排序并返回结果
-        sorted_votes = sorted(votes.items(), key=lambda x: x[1], reverse=True)
-        
-        # 如果设置了阈值，只返回票数超过阈值的关键词
+        # 如果设置了阈值，只保留票数超过阈值的关键词
+        items = list(votes.items())
         if self.threshold > 0:
             threshold_count = int(agent_count * self.threshold)
-            sorted_votes = [(kw, votes) for kw, votes in sorted_votes if votes >= threshold_count]
+            items = [(kw, count) for kw, count in items if count >= threshold_count]
         
-        # 限制返回数量
-        return sorted_votes[:max_keywords]
+        # 选出票数最高的关键词
+        return heapq.nlargest(max_keywords, items, key=lambda x: x[1])
 
     def weighted_voting(
         self, 
@@ -99,16 +276,14 @@ class VotingSystem:
         for keyword, weight in keywords:
             votes[keyword] = weight
         
-        # 排序并返回结果
-        sorted_votes = sorted(votes.items(), key=lambda x: x[1], reverse=True)
-        
-        # 限制返回数量
-        return sorted_votes[:max_keywords]
+        # 选出得分最高的关键词
+        return heapq.nlargest(max_keywords, votes.items(), key=lambda x: x[1])
 
     def consensus_voting(
         self, 
         agent_keywords: Dict[str, List[str]], 
-        max_keywords: int = 10
+        max_keywords: int = 10,
+        support: Optional[Dict[str, int]] = None
     ) -> List[Tuple[str, int]]:
         """
         共识投票
@@ -116,32 +291,43 @@ class VotingSystem:
         Args:
             agent_keywords: 智能体关键词，格式为 {智能体ID: [关键词1, 关键词2, ...], ...}
             max_keywords: 最大关键词数量
+            support: 各关键词的提出人数（票数相同时提出人数多的优先）
 
         Returns:
             投票结果，格式为 [(关键词, 票数), ...]
         """
         self.logger.info(f"开始共识投票，智能体数量: {len(agent_keywords)}")
         
-        # 统计每个关键词的出现次数
-        keyword_counts: Dict[str, int] = {}
-        for agent_id, keywords in agent_keywords.items():
-            for keyword in keywords:
-                if keyword in keyword_counts:
-                    keyword_counts[keyword] += 1
-                else:
-                    keyword_counts[keyword] = 1
-        
-        # 排序并返回结果
-        sorted_counts = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # 如果设置了阈值，只返回票数超过阈值的关键词
-        if self.threshold > 0:
-            agent_count = len(agent_keywords)
-            threshold_count = int(agent_count * self.threshold)
-            sorted_counts = [(kw, count) for kw, count in sorted_counts if count >= threshold_count]
-        
-        # 限制返回数量
-        return sorted_counts[:max_keywords]
+        tally = VoteTally("consensus", self.threshold, support=support)
+        for keywords in agent_keywords.values():
+            tally.add_ballot(keywords)
+        return tally.top_k(max_keywords)
+
+    def ranked_voting(
+        self,
+        agent_rankings: Dict[str, List[str]],
+        max_keywords: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+        support: Optional[Dict[str, int]] = None
+    ) -> List[Tuple[str, Any]]:
+        """
+        按本投票系统的计票方式统计排序投票
+
+        Args:
+            agent_rankings: 智能体投票，格式为 {智能体ID: [关键词1, 关键词2, ...], ...}（按重要性从高到低）
+            max_keywords: 最大关键词数量
+            weights: 智能体ID -> 选票权重（默认为1）
+            support: 各关键词的提出人数
+
+        Returns:
+            投票结果，格式为 [(关键词, 得分), ...]
+        """
+        self.logger.info(f"开始{self.method}投票，智能体数量: {len(agent_rankings)}")
+        weights = weights or {}
+        tally = self.create_tally(support=support)
+        for agent_id, ranking in agent_rankings.items():
+            tally.add_ballot(ranking, weights.get(agent_id, 1.0))
+        return tally.top_k(max_keywords)
 
     def get_final_keywords(
         self, 
@@ -163,3 +349,134 @@ class VotingSystem:
         
         # 限制数量
         return keywords[:max_keywords]
+
+    async def batch_vote(
+        self,
+        model: Any,
+        agents: List[Any],
+        candidate_keywords: List[str],
+        discussion_content: str,
+        max_votes: int = 5
+    ) -> Dict[str, List[str]]:
+        """
+        批量投票：一次结构化请求代表所有智能体分别投票
+
+        Args:
+            model: AI模型
+            agents: 参与投票的智能体
+            candidate_keywords: 候选关键词列表
+            discussion_content: 讨论内容
+            max_votes: 每个智能体的投票数量
+
+        Returns:
+            投票结果，格式为 {智能体ID: [关键词1, ...], ...}；请求或解析失败的智能体不在结果中
+        """
+        from src.config.prompts.base_prompts import BasePrompts
+        from src.config.prompts.template_manager import get_prompt_manager
+        from src.models.errors import ModelOutputError
+        from src.models.router import get_stage_model
+        from src.utils.structured_output import extract_json, generate_structured
+
+        self.logger.info(f"开始批量投票，智能体数量: {len(agents)}, 候选关键词数量: {len(candidate_keywords)}")
+        prompt_manager = get_prompt_manager()
+
+        voters = []
+        for agent in agents:
+            persona = prompt_manager.get_role_description(agent.current_role).split("\n\n")[0].replace("\n", "")
+            voters.append(
+                f"- {agent.id}：{agent.name}（角色：{agent.current_role}，{agent.age}岁，"
+                f"{agent.background}，{agent.experience}）{persona}"
+            )
+
+        prompt = prompt_manager.compile_template(
+            "batch_vote",
+            BasePrompts.BATCH_VOTING_TEMPLATE,
+            max_votes=max_votes
+        ).render(
+            voters="\n".join(voters),
+            discussion_content=discussion_content,
+            candidates=", ".join(candidate_keywords)
+        )
+
+        agent_ids = [agent.id for agent in agents]
+        # 结构化输出：支持的提供商使用JSON模式，格式无效时只发送短修复提示
+        try:
+            data = await generate_structured(
+                get_stage_model(model, "intelligent_vote"),
+                prompt,
+                BasePrompts.BATCH_VOTING_SYSTEM_PROMPT,
+                self.batch_vote_schema(agent_ids)
+            )
+        except ModelOutputError as e:
+            # 修复后仍不完全符合格式（如缺少个别智能体）时，保留其中可用的投票
+            self.logger.warning(f"批量投票输出格式无效: {str(e)}")
+            try:
+                data = extract_json(e.output)
+            except ValueError:
+                data = None
+        except Exception as e:
+            self.logger.error(f"批量投票请求失败: {str(e)}")
+            return {}
+
+        return self.parse_batch_votes(data, agent_ids, candidate_keywords, max_votes)
+
+    @staticmethod
+    def batch_vote_schema(agent_ids: List[str]) -> Dict[str, Any]:
+        """
+        批量投票的输出格式：智能体ID -> 关键词数组
+
+        Args:
+            agent_ids: 参与投票的智能体ID
+
+        Returns:
+            JSON Schema
+        """
+        return {
+            "type": "object",
+            "properties": {
+                agent_id: {"type": "array", "items": {"type": "string"}, "minItems": 1}
+                for agent_id in agent_ids
+            },
+            "required": list(agent_ids),
+            "additionalProperties": False
+        }
+
+    def parse_batch_votes(
+        self,
+        data: Any,
+        agent_ids: List[str],
+        candidate_keywords: List[str],
+        max_votes: int = 5
+    ) -> Dict[str, List[str]]:
+        """
+        过滤批量投票结果（只保留候选关键词中的原词，去重并限制数量）
+
+        Args:
+            data: 解析后的投票结果，格式为 {智能体ID: [关键词1, ...], ...}
+            agent_ids: 参与投票的智能体ID
+            candidate_keywords: 候选关键词列表
+            max_votes: 每个智能体的投票数量
+
+        Returns:
+            投票结果，格式为 {智能体ID: [关键词1, ...], ...}；没有有效投票的智能体不在结果中
+        """
+        if not isinstance(data, dict):
+            self.logger.warning("批量投票结果无法解析为JSON对象")
+            return {}
+
+        candidates = set(candidate_keywords)
+        results: Dict[str, List[str]] = {}
+        for agent_id in agent_ids:
+            votes = data.get(agent_id)
+            if not isinstance(votes, list):
+                continue
+            valid = list(dict.fromkeys(
+                vote.strip() for vote in votes if isinstance(vote, str) and vote.strip() in candidates
+            ))[:max_votes]
+            if valid:
+                results[agent_id] = valid
+
+        missing = [agent_id for agent_id in agent_ids if agent_id not in results]
+        if missing:
+            self.logger.warning(f"批量投票结果缺少以下智能体的有效投票: {', '.join(missing)}")
+        return results
@@ -16,7 +16,6 @@ from typing import Dict, List, Optional
 from src.config.settings import Settings
 from src.core.agent import Agent
 from src.core.conversation import ConversationManager
-from src.models.openai import OpenAIModel
 
 # 导入UI美化组件
 from src.ui_enhanced import (
@@ -0,0 +1,589 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Web服务模块 - 通过HTTP接口驱动会议，智能体输出经WebSocket/SSE实时推送
+
+接口:
+    POST   /meetings                    创建会议（可同时传入agent_counts创建智能体）
+    GET    /meetings                    会议列表
+    GET    /meetings/{id}               会议状态
+    DELETE /meetings/{id}               结束会议并清理数据
+    POST   /meetings/{id}/agents        创建智能体 {"agent_counts": {...}}
+    POST   /meetings/{id}/start         开始讨论 {"topic": "...", "image_path": "..."}（图像须位于图片目录下）
+    POST   /meetings/{id}/keywords      提交最终关键词并进行视角转换 {"keywords": [...]}
+    POST   /meetings/{id}/design        提交设计提示词生成图像 {"prompt": "..."}
+    GET    /meetings/{id}/events        SSE事件流
+    GET    /meetings/{id}/ws            WebSocket事件流
+    GET    /health                      服务状态
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from aiohttp import web
+
+from src.core.conversation import ConversationManager
+from src.core.god_view import GodView
+from src.core.runtime import MeetingRuntime, build_agents, can_switch_roles
+from src.utils.stream import QueueOutput
+
+# SSE心跳间隔（秒），防止代理因空闲断开连接
+SSE_HEARTBEAT_INTERVAL = 15.0
+
+# WebSocket协议层心跳间隔（秒）
+WS_HEARTBEAT_INTERVAL = 30.0
+
+logger = logging.getLogger("web_server")
+
+
+def _json_error(status: int, message: str) -> web.Response:
+    """
+    构造JSON错误响应
+
+    Args:
+        status: HTTP状态码
+        message: 错误信息
+
+    Returns:
+        响应对象
+    """
+    return web.json_response({"error": message}, status=status)
+
+
+async def _read_json(request: web.Request) -> Dict[str, Any]:
+    """
+    读取JSON请求体（请求体为空时返回空字典）
+
+    Args:
+        request: 请求对象
+
+    Returns:
+        请求参数
+
+    Raises:
+        web.HTTPBadRequest: 请求体不是JSON对象
+    """
+    if not request.can_read_body:
+        return {}
+    try:
+        data = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise web.HTTPBadRequest(text=json.dumps({"error": "请求体不是合法的JSON"}, ensure_ascii=False), content_type="application/json")
+    if not isinstance(data, dict):
+        raise web.HTTPBadRequest(text=json.dumps({"error": "请求体必须是JSON对象"}, ensure_ascii=False), content_type="application/json")
+    return data
+
+
+class MeetingSession:
+    """
+    一场由Web客户端驱动的会议
+
+    会议输出和阶段事件按产生顺序写入有界的QueueOutput，由推送任务逐条分发给订阅者。
+    每个订阅者也有自己的有界队列：订阅者消费慢时推送任务等待（进而让会议等待），
+    超过client_timeout仍无法写入的订阅者会被断开，避免一个卡住的客户端拖住整场会议。
+    """
+
+    def __init__(
+        self,
+        meeting_id: str,
+        manager: ConversationManager,
+        output: QueueOutput,
+        queue_size: int,
+        client_timeout: float
+    ):
+        """
+        初始化会议
+
+        Args:
+            meeting_id: 会议ID
+            manager: 对话管理器（输出函数为output）
+            output: 会议输出队列
+            queue_size: 订阅者队列容量（也是新订阅者可回放的事件数）
+            client_timeout: 订阅者写入超时（秒）
+        """
+        self.meeting_id = meeting_id
+        self.manager = manager
+        self.output = output
+        self.queue_size = queue_size
+        self.client_timeout = client_timeout
+        self.created_at = time.time()
+
+        # 最近的事件，新订阅者连接时先回放
+        self.history: deque = deque(maxlen=queue_size)
+        self.subscribers: Set[asyncio.Queue] = set()
+
+        self.task: Optional[asyncio.Task] = None  # 正在执行的阶段
+        self.current_stage: Optional[str] = None
+        self.completed_stages = []
+        self.image_paths = None
+        self.error: Optional[str] = None
+        self.dropped_subscribers = 0
+
+        self._sequence = 0
+        self._pump_task = asyncio.create_task(self._pump())
+
+    @property
+    def busy(self) -> bool:
+        """是否有阶段正在执行"""
+        return self.task is not None and not self.task.done()
+
+    def publish(self, event_type: str, **data) -> None:
+        """
+        发布事件（与会议输出共用一个队列，保证先后顺序）
+
+        Args:
+            event_type: 事件类型
+            **data: 事件内容
+        """
+        self.output.put_nowait({"type": event_type, **data})
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        订阅会议事件（先回放最近的事件）
+
+        Returns:
+            订阅者队列，取到None表示订阅已结束
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size + 1)
+        for event in self.history:
+            queue.put_nowait(event)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """
+        取消订阅
+
+        Args:
+            queue: 订阅者队列
+        """
+        self.subscribers.discard(queue)
+
+    def start_stage(self, stage: str, coro_func: Callable[[], Awaitable[Any]]) -> None:
+        """
+        在后台执行会议阶段
+
+        Args:
+            stage: 阶段名称
+            coro_func: 执行阶段的协程函数
+
+        Raises:
+            web.HTTPConflict: 已有阶段正在执行
+        """
+        if self.busy:
+            raise web.HTTPConflict(
+                text=json.dumps({"error": f"阶段 {self.current_stage} 正在执行"}, ensure_ascii=False),
+                content_type="application/json"
+            )
+
+        async def run_stage() -> None:
+            self.publish("stage", stage=stage, status="started")
+            try:
+                result = await coro_func()
+                if stage == "design":
+                    self.image_paths = result
+                self.completed_stages.append(stage)
+                self.publish("stage", stage=stage, status="completed", state={**self.get_state(), "busy": False})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"会议 {self.meeting_id} 阶段 {stage} 失败: {str(e)}", exc_info=True)
+                self.error = str(e)
+                self.publish("stage", stage=stage, status="failed", error=str(e))
+            finally:
+                await self.output.drain()
+
+        self.current_stage = stage
+        self.error = None
+        self.task = asyncio.create_task(run_stage())
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        获取会议状态
+
+        Returns:
+            状态字典
+        """
+        manager = self.manager
+        return {
+            "meeting_id": self.meeting_id,
+            "session_id": manager.session_id,
+            "topic": manager.topic,
+            "stage": manager.stage,
+            "busy": self.busy,
+            "current_stage": self.current_stage,
+            "completed_stages": list(self.completed_stages),
+            "agents": [
+                {"id": agent.id, "name": agent.name, "type": agent.type}
+                for agent in manager.agents.values()
+            ],
+            "voted_keywords": manager.voted_keywords,
+            "final_keywords": manager.final_keywords,
+            "image_paths": self.image_paths,
+            "error": self.error,
+            "subscribers": len(self.subscribers),
+            "pending_events": self.output.qsize(),
+            "created_at": self.created_at
+        }
+
+    async def _pump(self) -> None:
+        """把会议输出逐条分发给订阅者"""
+        while True:
+            item = await self.output.get()
+            event = item if isinstance(item, dict) else {"type": "output", "text": item}
+            self._sequence += 1
+            event["seq"] = self._sequence
+            self.history.append(event)
+
+            subscribers = list(self.subscribers)
+            if subscribers:
+                await asyncio.gather(*(self._deliver(queue, event) for queue in subscribers))
+
+            if event["type"] == "closed":
+                # 会议结束：所有事件已送达，通知订阅者结束
+                await asyncio.gather(*(self._deliver(queue, None) for queue in list(self.subscribers)))
+                self.subscribers.clear()
+                return
+
+    async def _deliver(self, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        """
+        向一个订阅者写入事件，超时则断开该订阅者
+
+        Args:
+            queue: 订阅者队列
+            event: 事件
+        """
+        try:
+            await asyncio.wait_for(queue.put(event), self.client_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"会议 {self.meeting_id} 的订阅者 {self.client_timeout} 秒内未消费事件，已断开")
+            self.dropped_subscribers += 1
+            self._close_subscriber(queue)
+
+    def _close_subscriber(self, queue: asyncio.Queue) -> None:
+        """
+        结束一个订阅（清空其队列并放入结束标记）
+
+        Args:
+            queue: 订阅者队列
+        """
+        self.subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def close(self) -> None:
+        """取消正在执行的阶段，推送剩余事件后结束全部订阅，并清理会议数据"""
+        if self.busy:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        # 推送任务把closed之前的事件全部送达后自行结束
+        self.publish("closed")
+        try:
+            await self.output.drain()
+            await asyncio.wait_for(self._pump_task, self.client_timeout * 2)
+        except asyncio.TimeoutError:
+            logger.warning(f"会议 {self.meeting_id} 的剩余事件未能在超时内推送完")
+        except asyncio.CancelledError:
+            pass
+
+        for queue in list(self.subscribers):
+            self._close_subscriber(queue)
+
+        await self.manager.cleanup_session()
+
+
+class MeetingServer:
+    """会议Web服务：管理多场会议，共享MeetingRuntime的Redis/HTTP连接池和模型实例"""
+
+    def __init__(
+        self,
+        settings,
+        model_factory: Optional[Callable[[Any], Any]] = None,
+        queue_size: Optional[int] = None,
+        client_timeout: Optional[float] = None
+    ):
+        """
+        初始化会议Web服务
+
+        Args:
+            settings: 全局设置
+            model_factory: 模型工厂函数，None时使用settings.get_model_instance
+            queue_size: 会议输出队列和订阅者队列的容量，None时使用设置中的值
+            client_timeout: 订阅者写入超时（秒），None时使用设置中的值
+        """
+        self.settings = settings
+        self.runtime = MeetingRuntime(settings, model_factory=model_factory)
+        self.queue_size = queue_size or getattr(settings, 'server_queue_size', 256)
+        self.client_timeout = client_timeout or getattr(settings, 'server_client_timeout', 10.0)
+        self.max_meetings = self.runtime.max_concurrent_meetings
+        self.sessions: Dict[str, MeetingSession] = {}
+        # 只允许读取图片目录下的图像，防止客户端让服务读取任意文件并发送给模型提供商
+        self.image_dir = os.path.realpath(getattr(settings, 'IMAGE_DIR', 'data/images'))
+
+    def create_app(self) -> web.Application:
+        """
+        创建aiohttp应用
+
+        Returns:
+            应用对象
+        """
+        app = web.Application()
+        app.add_routes([
+            web.get("/health", self.handle_health),
+            web.post("/meetings", self.handle_create_meeting),
+            web.get("/meetings", self.handle_list_meetings),
+            web.get("/meetings/{meeting_id}", self.handle_get_meeting),
+            web.delete("/meetings/{meeting_id}", self.handle_delete_meeting),
+            web.post("/meetings/{meeting_id}/agents", self.handle_add_agents),
+            web.post("/meetings/{meeting_id}/start", self.handle_start),
+            web.post("/meetings/{meeting_id}/keywords", self.handle_keywords),
+            web.post("/meetings/{meeting_id}/design", self.handle_design),
+            web.get("/meetings/{meeting_id}/events", self.handle_sse),
+            web.get("/meetings/{meeting_id}/ws", self.handle_websocket),
+        ])
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def _on_startup(self, app: web.Application) -> None:
+        await self.runtime.start()
+        logger.info(f"会议Web服务已启动，最大会议数: {self.max_meetings}，队列容量: {self.queue_size}")
+
+    async def _on_cleanup(self, app: web.Application) -> None:
+        for meeting_id in list(self.sessions):
+            await self.sessions.pop(meeting_id).close()
+        await self.runtime.close()
+
+    def _get_session(self, request: web.Request) -> MeetingSession:
+        meeting_id = request.match_info["meeting_id"]
+        session = self.sessions.get(meeting_id)
+        if session is None:
+            raise web.HTTPNotFound(
+                text=json.dumps({"error": f"会议不存在: {meeting_id}"}, ensure_ascii=False),
+                content_type="application/json"
+            )
+        return session
+
+    def _resolve_image_path(self, image_path: Any) -> Optional[str]:
+        """
+        把客户端传入的图像路径解析为图片目录下的真实路径
+
+        Args:
+            image_path: 图像路径（相对路径以图片目录为基准）
+
+        Returns:
+            解析后的路径；不在图片目录下或不是文件时返回None
+        """
+        if not isinstance(image_path, str) or not image_path.strip():
+            return None
+        path = os.path.realpath(os.path.join(self.image_dir, image_path.strip()))
+        if os.path.commonpath([path, self.image_dir]) != self.image_dir or not os.path.isfile(path):
+            return None
+        return path
+
+    async def _add_agents(self, session: MeetingSession, agent_counts: Optional[Dict[str, int]]) -> None:
+        manager = session.manager
+        for agent in build_agents(self.settings, self.runtime.model, agent_counts, manager.key_namespace):
+            await manager.add_agent(agent)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        runtime_stats = self.runtime.get_stats()
+        return web.json_response({
+            "status": "ok",
+            "meetings": len(self.sessions),
+            "max_meetings": self.max_meetings,
+            "busy_meetings": sum(1 for session in self.sessions.values() if session.busy),
+            "model_usage": runtime_stats["model_usage"],
+            "write_queue": runtime_stats["write_queue"]
+        })
+
+    async def handle_create_meeting(self, request: web.Request) -> web.Response:
+        data = await _read_json(request)
+        if len(self.sessions) >= self.max_meetings:
+            return _json_error(429, f"会议数量已达上限 {self.max_meetings}")
+
+        meeting_id = str(data.get("id") or uuid.uuid4().hex[:12])
+        if meeting_id in self.sessions:
+            return _json_error(409, f"会议已存在: {meeting_id}")
+
+        output = QueueOutput(self.queue_size)
+        manager = ConversationManager(
+            GodView(self.settings),
+            self.settings,
+            clean_redis_on_start=False,
+            output_func=output,
+            key_namespace=f"ns:{meeting_id}"
+        )
+        manager.stream_handler.set_delay(0)
+        session = MeetingSession(meeting_id, manager, output, self.queue_size, self.client_timeout)
+        self.sessions[meeting_id] = session
+
+        if data.get("agent_counts"):
+            await self._add_agents(session, data["agent_counts"])
+
+        logger.info(f"创建会议: {meeting_id}")
+        return web.json_response(session.get_state(), status=201)
+
+    async def handle_list_meetings(self, request: web.Request) -> web.Response:
+        return web.json_response([session.get_state() for session in self.sessions.values()])
+
+    async def handle_get_meeting(self, request: web.Request) -> web.Response:
+        return web.json_response(self._get_session(request).get_state())
+
+    async def handle_delete_meeting(self, request: web.Request) -> web.Response:
+        session = self._get_session(request)
+        self.sessions.pop(session.meeting_id, None)
+        await session.close()
+        logger.info(f"结束会议: {session.meeting_id}")
+        return web.json_response({"meeting_id": session.meeting_id, "closed": True})
+
+    async def handle_add_agents(self, request: web.Request) -> web.Response:
+        session = self._get_session(request)
+        data = await _read_json(request)
+        if session.manager.agents:
+            return _json_error(409, "会议已创建智能体")
+        if session.busy:
+            return _json_error(409, f"阶段 {session.current_stage} 正在执行")
+
+        await self._add_agents(session, data.get("agent_counts"))
+        return web.json_response(session.get_state())
+
+    async def handle_start(self, request: web.Request) -> web.Response:
+        session = self._get_session(request)
+        data = await _read_json(request)
+        topic = str(data.get("topic", "")).strip()
+        if not topic:
+            return _json_error(400, "缺少会议主题(topic)")
+        if not session.manager.agents:
+            return _json_error(409, "会议还没有智能体")
+        if "discussion" in session.completed_stages:
+            return _json_error(409, "讨论已完成")
+
+        image_path = None
+        if data.get("image_path") is not None:
+            image_path = self._resolve_image_path(data["image_path"])
+            if image_path is None:
+                return _json_error(400, "图像路径无效，只能使用图片目录下的文件")
+        session.start_stage("discussion", lambda: session.manager.start_conversation(topic, image_path))
+        return web.json_response(session.get_state(), status=202)
+
+    async def handle_keywords(self, request: web.Request) -> web.Response:
+        session = self._get_session(request)
+        data = await _read_json(request)
+        if "discussion" not in session.completed_stages:
+            return _json_error(409, "讨论尚未完成")
+        if "role_switch" in session.completed_stages:
+            return _json_error(409, "视角转换已完成")
+        if not can_switch_roles(session.manager.agents.values()):
+            return _json_error(409, "智能体类型无法两两交换视角")
+
+        keywords = [str(keyword).strip() for keyword in data.get("keywords") or [] if str(keyword).strip()]
+        final_keywords = keywords or session.manager.voted_keywords
+        session.start_stage("role_switch", lambda: session.manager.start_role_switch(final_keywords))
+        return web.json_response(session.get_state(), status=202)
+
+    async def handle_design(self, request: web.Request) -> web.Response:
+        session = self._get_session(request)
+        data = await _read_json(request)
+        prompt = str(data.get("prompt", "")).strip()
+        if not prompt:
+            return _json_error(400, "缺少设计提示词(prompt)")
+        if session.manager.stage != "waiting_for_user_input":
+            return _json_error(409, "会议当前不接受设计提示词")
+
+        session.start_stage("design", lambda: session.manager.process_user_input(prompt))
+        return web.json_response(session.get_state(), status=202)
+
+    async def handle_sse(self, request: web.Request) -> web.StreamResponse:
+        session = self._get_session(request)
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        })
+        await response.prepare(request)
+
+        queue = session.subscribe()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    await response.write(b": ping\n\n")
+                    continue
+                if event is None:
+                    break
+                payload = json.dumps(event, ensure_ascii=False, default=str)
+                await response.write(f"id: {event['seq']}\nevent: {event['type']}\ndata: {payload}\n\n".encode("utf-8"))
+        except ConnectionResetError:
+            pass
+        finally:
+            session.unsubscribe(queue)
+
+        return response
+
+    async def handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        session = self._get_session(request)
+        ws = web.WebSocketResponse(heartbeat=WS_HEARTBEAT_INTERVAL)
+        await ws.prepare(request)
+
+        queue = session.subscribe()
+
+        async def send_events() -> None:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                await ws.send_str(json.dumps(event, ensure_ascii=False, default=str))
+            await ws.close()
+
+        sender = asyncio.create_task(send_events())
+        try:
+            # 客户端只需接收事件，收到的消息忽略；连接关闭时循环结束
+            async for _ in ws:
+                pass
+        finally:
+            sender.cancel()
+            session.unsubscribe(queue)
+
+        return ws
+
+
+async def serve(
+    settings,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    model_factory: Optional[Callable[[Any], Any]] = None
+) -> None:
+    """
+    启动会议Web服务并一直运行（任务被取消时关闭）
+
+    Args:
+        settings: 全局设置
+        host: 监听地址，None时使用API_HOST
+        port: 监听端口，None时使用API_PORT
+        model_factory: 模型工厂函数，None时使用settings.get_model_instance
+    """
+    host = host or settings.api_host
+    port = port or settings.api_port
+
+    runner = web.AppRunner(MeetingServer(settings, model_factory).create_app())
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"会议Web服务监听 http://{host}:{port}")
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()